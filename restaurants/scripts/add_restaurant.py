@@ -8,7 +8,6 @@ Modes:
 """
 
 import argparse
-import csv
 import json
 import os
 import sys
@@ -17,6 +16,9 @@ from datetime import datetime
 import requests
 from dotenv import load_dotenv
 
+from rate_limiter import default_limiter
+from restaurant_store import RestaurantStore, list_filename
+
 
 def load_resy_credentials():
     """Load Resy credentials from environment variables"""
@@ -65,7 +67,7 @@ def search_venues(query: str, api_key: str, auth_token: str) -> list:
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = default_limiter.request(requests, 'POST', url, headers=headers, json=payload)
         response.raise_for_status()
         data = response.json()
 
@@ -102,16 +104,28 @@ def search_venues(query: str, api_key: str, auth_token: str) -> list:
 
 def add_restaurant(name: str, location: str, cuisine: str,
                    list_type: str, category: str, venue_id: int = None,
-                   notes: str = '', restaurants_dir: str = None) -> bool:
-    """Add a restaurant to the appropriate CSV file"""
+                   notes: str = '', restaurants_dir: str = None,
+                   store: RestaurantStore = None) -> bool:
+    """
+    Add a restaurant to the appropriate CSV file.
+
+    Duplicates are checked across every list with one indexed lookup. Adding
+    a venue that is already in the target list, or a name that only differs
+    in case or spacing from one there, fails; if it is only in other lists,
+    those are reported and the add goes ahead. Text fields are stored with
+    whitespace collapsed. Pass a shared `store` when adding many restaurants
+    in a row.
+    """
+    name, location, cuisine = (
+        ' '.join((value or '').split()) for value in (name, location, cuisine)
+    )
     if restaurants_dir is None:
         # Default to data/ directory relative to this script
         script_dir = os.path.dirname(os.path.abspath(__file__))
         restaurants_dir = os.path.join(script_dir, '..', 'data')
 
     # Build filename
-    list_prefix = 'places_to_try' if list_type == 'try' else 'places_we_love'
-    filename = f"{list_prefix}_{category}.csv"
+    filename = list_filename(list_type, category)
     filepath = os.path.join(restaurants_dir, filename)
 
     # Check if file exists
@@ -119,22 +133,31 @@ def add_restaurant(name: str, location: str, cuisine: str,
         print(f"Error: File not found: {filepath}", file=sys.stderr)
         return False
 
-    # Check for duplicates
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # If we have a venue_id, match on that; otherwise match on name
-            if venue_id and str(row.get('venue_id')) == str(venue_id):
-                print(f"Already exists: {name} (ID: {venue_id}) in {filename}")
-                return False
-            elif not venue_id and row.get('name', '').lower() == name.lower():
-                print(f"Already exists: {name} in {filename}")
-                return False
+    if store is None:
+        store = RestaurantStore(restaurants_dir)
+
+    # Check for duplicates - if we have a venue_id, match on that; otherwise match on name
+    existing = store.find(venue_id=venue_id, name=name)
+    same_list = store.find(name=name, list_type=list_type, category=category) if venue_id else []
+    if same_list or any(r['list_type'] == list_type and r['category'] == category for r in existing):
+        if venue_id:
+            print(f"Already exists: {name} (ID: {venue_id}) in {filename}")
+        else:
+            print(f"Already exists: {name} in {filename}")
+        return False
+
+    other_lists = sorted({list_filename(r['list_type'], r['category']) for r in existing})
+    if other_lists:
+        print(f"Note: {name} is already in {', '.join(other_lists)}")
 
     # Append to CSV
-    with open(filepath, 'a', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow([name, venue_id or '', location, cuisine, notes])
+    store.add(list_type, category, {
+        'name': name,
+        'venue_id': venue_id,
+        'location': location,
+        'cuisine': cuisine,
+        'notes': notes
+    })
 
     print(f"Added {name} to {filename}")
     return True
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Archive of every availability check, for answering "when is it
+realistic to book X" without fresh API calls.
+
+Each freshly fetched /4/find result is appended as one observation
+(venue, date, party size, when it was seen, slot count) plus one row per
+slot, in an indexed SQLite database. Aggregates run as SQL over the
+indexes:
+
+  rates    share of checks with a slot, by the date's weekday and slot hour
+  sellout  how many days before the date a venue goes from open to full
+
+Usage:
+  python3 availability_archive.py stats
+  python3 availability_archive.py rates --venue-id 59569
+  python3 availability_archive.py sellout --venue-id 59569 --party-size 2
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import threading
+from datetime import datetime
+
+DEFAULT_ARCHIVE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'availability_archive.sqlite'
+)
+
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+class AvailabilityArchive:
+    def __init__(self, path: str = None):
+        self.path = path or DEFAULT_ARCHIVE_PATH
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS observations ('
+                ' id INTEGER PRIMARY KEY,'
+                ' venue_id TEXT NOT NULL,'
+                ' date TEXT NOT NULL,'
+                ' party_size INTEGER NOT NULL,'
+                ' weekday INTEGER NOT NULL,'
+                ' observed_at TEXT NOT NULL,'
+                ' lead_days INTEGER NOT NULL,'
+                ' slot_count INTEGER NOT NULL)'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS slots ('
+                ' observation_id INTEGER NOT NULL REFERENCES observations(id),'
+                ' hour INTEGER NOT NULL,'
+                ' time TEXT NOT NULL,'
+                ' type TEXT NOT NULL)'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_observations_venue'
+                ' ON observations (venue_id, party_size, date, observed_at)'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_slots_observation ON slots (observation_id, hour)'
+            )
+
+    def record(self, venue_id: str, date: str, party_size: int, result: dict,
+               observed_at: datetime = None):
+        """Append one parsed availability result (failed checks are not recorded)"""
+        if result.get('status') == 'error':
+            return
+        observed_at = observed_at or datetime.now()
+        day = datetime.strptime(date, '%Y-%m-%d')
+        slots = result.get('slots', []) if result.get('available') else []
+
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT INTO observations (venue_id, date, party_size, weekday, observed_at,'
+                ' lead_days, slot_count) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (str(venue_id), date, int(party_size), day.weekday(),
+                 observed_at.isoformat(timespec='seconds'),
+                 (day.date() - observed_at.date()).days, len(slots))
+            )
+            self._conn.executemany(
+                'INSERT INTO slots (observation_id, hour, time, type) VALUES (?, ?, ?, ?)',
+                [(cursor.lastrowid, _slot_hour(slot['time']), slot['time'], slot['type'])
+                 for slot in slots]
+            )
+
+    def rates(self, venue_id: str, party_size: int = None) -> list:
+        """
+        Share of observations with at least one slot in each hour, by the
+        date's weekday.
+
+        Returns [{"weekday", "hour", "rate", "observations"}, ...] sorted by
+        weekday and hour; hours never seen open are omitted.
+        """
+        where, params = _venue_filter(venue_id, party_size)
+        with self._lock:
+            totals = dict(self._conn.execute(
+                f'SELECT weekday, COUNT(*) FROM observations {where} GROUP BY weekday',
+                params
+            ).fetchall())
+            rows = self._conn.execute(
+                'SELECT o.weekday, s.hour, COUNT(DISTINCT o.id)'
+                f' FROM observations o JOIN slots s ON s.observation_id = o.id {where}'
+                ' GROUP BY o.weekday, s.hour ORDER BY o.weekday, s.hour',
+                params
+            ).fetchall()
+        return [
+            {'weekday': weekday, 'hour': hour, 'rate': hits / totals[weekday],
+             'observations': totals[weekday]}
+            for weekday, hour, hits in rows
+        ]
+
+    def sellout_lead_times(self, venue_id: str, party_size: int = None) -> list:
+        """
+        Days before the date that a venue was first seen full after having
+        been open, one value per (date, party size) that sold out.
+        """
+        where, params = _venue_filter(venue_id, party_size)
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT date, party_size, observed_at, slot_count FROM observations'
+                f' {where} ORDER BY date, party_size, observed_at',
+                params
+            ).fetchall()
+
+        leads = []
+        current, was_open, sold_out = None, False, False
+        for date, size, observed_at, slot_count in rows:
+            if (date, size) != current:
+                current, was_open, sold_out = (date, size), False, False
+            if slot_count:
+                was_open = True
+            elif was_open and not sold_out:
+                sold_out = True
+                seen = datetime.fromisoformat(observed_at)
+                leads.append(round(
+                    (datetime.strptime(date, '%Y-%m-%d') - seen).total_seconds() / 86400, 1
+                ))
+        return leads
+
+    def hit_rates(self) -> dict:
+        """
+        {venue_id: smoothed share of observations that found a table}
+
+        Laplace smoothing keeps a venue seen once from ranking as always or
+        never available; venues never observed are absent (callers default
+        them to 0.5).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT venue_id, COUNT(*), SUM(slot_count > 0) FROM observations GROUP BY venue_id'
+            ).fetchall()
+        return {venue_id: (hits + 1) / (checks + 2) for venue_id, checks, hits in rows}
+
+    def summary(self) -> list:
+        """Per-venue observation count, share with a slot, and date range"""
+        with self._lock:
+            return [
+                {'venue_id': venue_id, 'observations': count, 'rate': hits / count,
+                 'first_date': first_date, 'last_date': last_date}
+                for venue_id, count, hits, first_date, last_date in self._conn.execute(
+                    'SELECT venue_id, COUNT(*), SUM(slot_count > 0), MIN(date), MAX(date)'
+                    ' FROM observations GROUP BY venue_id ORDER BY venue_id'
+                )
+            ]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _slot_hour(time_str: str) -> int:
+    try:
+        return int(time_str.split(':')[0])
+    except ValueError:
+        return -1
+
+
+def _venue_filter(venue_id, party_size):
+    clauses, params = ['venue_id = ?'], [str(venue_id)]
+    if party_size is not None:
+        clauses.append('party_size = ?')
+        params.append(int(party_size))
+    return f"WHERE {' AND '.join(clauses)}", params
+
+
+def print_rates(rates: list):
+    """Weekday x hour grid of availability rates"""
+    if not rates:
+        print("No slots observed yet")
+        return
+    hours = sorted({row['hour'] for row in rates})
+    cells = {(row['weekday'], row['hour']): row['rate'] for row in rates}
+    observations = {row['weekday']: row['observations'] for row in rates}
+
+    print('     ' + ''.join(f"{hour:>5}" for hour in hours) + '   checks')
+    for weekday, name in enumerate(WEEKDAYS):
+        if weekday not in observations:
+            continue
+        row = ''.join(
+            f"{cells[(weekday, hour)]:>5.0%}" if (weekday, hour) in cells else f"{'-':>5}"
+            for hour in hours
+        )
+        print(f"{name:<5}{row}   {observations[weekday]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Query the local archive of availability checks',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('command', choices=['stats', 'rates', 'sellout'])
+    parser.add_argument('--venue-id', help='Venue to query (rates, sellout)')
+    parser.add_argument('--party-size', type=int, default=None,
+                        help='Only count checks for this party size')
+    parser.add_argument('--path', default=DEFAULT_ARCHIVE_PATH, help='Archive database')
+    args = parser.parse_args()
+
+    if args.command != 'stats' and not args.venue_id:
+        parser.error(f'{args.command} needs --venue-id')
+
+    archive = AvailabilityArchive(args.path)
+
+    if args.command == 'stats':
+        for row in archive.summary():
+            print(f"{row['venue_id']}: {row['observations']} checks, "
+                  f"{row['rate']:.0%} with slots ({row['first_date']} to {row['last_date']})")
+    elif args.command == 'rates':
+        print_rates(archive.rates(args.venue_id, args.party_size))
+    else:
+        leads = archive.sellout_lead_times(args.venue_id, args.party_size)
+        if not leads:
+            print("No sell-outs observed yet")
+        else:
+            print(f"Sold out {statistics.median(leads):.1f} days ahead (median of {len(leads)}; "
+                  f"range {min(leads):.1f} to {max(leads):.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,18 +6,69 @@ Supports natural language dates and filters results by time.
 
 import argparse
 import csv
+import json
 import os
 import re
 import sys
-from datetime import datetime
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
 from resy_client import (
     ResyChecker,
+    STATUS_AVAILABLE,
+    STATUS_ERROR,
+    STATUS_UNAVAILABLE,
     parse_date_query,
     load_resy_credentials
 )
+from availability_archive import AvailabilityArchive
+from response_cache import ResponseCache
+from restaurant_store import LIST_PREFIXES, RestaurantStore, parse_list_filename
+from maps_client import get_home_address, load_maps_credentials
+from spatial_index import SpatialIndex, resolve_location
+from travel_estimate import calibrate, prefilter, refine
+from travel_matrix import HOME_ORIGIN, MODES, TravelMatrix
+from venue_priority import prioritize
+
+# Default reuse window for cached /4/find responses, in seconds
+DEFAULT_CACHE_MAX_AGE = 300
+# How long cached /4/find responses are retained for any reader
+FIND_CACHE_TTL = 3600
+# Default search radius for --near, in km
+DEFAULT_NEAR_RADIUS_KM = 2.0
+# Bulk mode groups venues into grid cells this many degrees wide (~2 km)
+AREA_CELL_DEGREES = 0.02
+
+def restaurant_entry(record):
+    """Restaurant dict used throughout availability checks"""
+    return {
+        'name': record['name'],
+        'venue_id': record['venue_id'],
+        'location': record['location'],
+        'cuisine': record['cuisine'],
+        'notes': record.get('notes') or '',
+        'travel_time_minutes': record['travel_time_minutes'],
+        'latitude': record['latitude'],
+        'longitude': record['longitude']
+    }
 
 def parse_restaurant_csv(file_path):
-    """Parse CSV file to extract restaurant data"""
+    """
+    Load restaurants with venue IDs from a list CSV.
+
+    Standard places_*_*.csv lists are served from the indexed restaurant
+    store (which re-imports the file if it changed); any other CSV is
+    parsed directly.
+    """
+    parsed = parse_list_filename(file_path)
+    if parsed:
+        store = RestaurantStore(os.path.dirname(os.path.abspath(file_path)))
+        return [
+            restaurant_entry(record)
+            for record in store.select(*parsed, with_venue_id=True)
+        ]
+
     restaurants = []
 
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -39,12 +90,45 @@ def parse_restaurant_csv(file_path):
                     'cuisine': row['cuisine'],
                     'notes': row.get('notes', ''),
                     'travel_time_minutes': travel_time,
-                    'latitude': row.get('latitude'),
-                    'longitude': row.get('longitude')
+                    'latitude': float(row['latitude']) if row.get('latitude') else None,
+                    'longitude': float(row['longitude']) if row.get('longitude') else None
                 })
 
     return restaurants
 
+def list_label(list_type, category):
+    """Short label for a list, e.g. "try/dinner" """
+    return f"{list_type}/{category}"
+
+def merge_restaurants(records):
+    """
+    Merge store records from several lists into one entry per venue.
+
+    Each entry's "lists" holds every list the venue appears in, so a venue
+    on several lists is checked once and its result attributed to all of
+    them. Entries keep the order of each venue's first appearance.
+    """
+    merged = {}
+    for record in records:
+        entry = merged.get(record['venue_id'])
+        if entry is None:
+            entry = merged[record['venue_id']] = {**restaurant_entry(record), 'lists': []}
+        # Fill gaps from the venue's other lists
+        for key in ('travel_time_minutes', 'latitude', 'longitude'):
+            if entry[key] is None:
+                entry[key] = record[key]
+        label = list_label(record['list_type'], record['category'])
+        if label not in entry['lists']:
+            entry['lists'].append(label)
+    return list(merged.values())
+
+def load_cross_list(data_dir, list_type=None, category=None):
+    """Restaurants with venue IDs across every matching list, one entry per venue"""
+    store = RestaurantStore(data_dir)
+    return merge_restaurants(
+        store.select(list_type, category, with_venue_id=True)
+    )
+
 def filter_time_slots(slots, max_time_str="20:30"):
     """Filter out time slots after specified time (default 8:30pm)"""
     filtered = []
@@ -59,11 +143,392 @@ def filter_time_slots(slots, max_time_str="20:30"):
             filtered.append(slot)
     return filtered
 
+def run_checks(checker, jobs, concurrency=1, ordered=True, counts=None):
+    """
+    Run availability checks for (restaurant, date, party_size) jobs.
+
+    With concurrency > 1 the checks run on a bounded thread pool sharing the
+    checker's session; jobs are fed in lazily, so at most `concurrency`
+    checks are ever in flight. Results are yielded as (job, result) pairs in
+    the same order as the input jobs regardless of completion order, or as
+    soon as each check finishes when ordered is False. Closing the generator
+    early starts no further checks. If given, counts["started"] tracks how
+    many checks were actually sent.
+    """
+    counts = counts if counts is not None else {}
+    counts['started'] = 0
+    lock = threading.Lock()
+
+    def check(job):
+        with lock:
+            counts['started'] += 1
+        restaurant, date, party_size = job
+        return checker.check_availability(
+            venue_id=restaurant['venue_id'],
+            date=date,
+            party_size=party_size
+        )
+
+    if concurrency <= 1:
+        for job in jobs:
+            yield job, check(job)
+        return
+
+    jobs = iter(jobs)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        in_flight = deque()
+
+        def submit_next():
+            job = next(jobs, None)
+            if job is not None:
+                in_flight.append((executor.submit(check, job), job))
+
+        for _ in range(concurrency):
+            submit_next()
+        try:
+            while in_flight:
+                if ordered:
+                    future, job = in_flight.popleft()
+                    result = future.result()
+                else:
+                    done, _ = wait([f for f, _ in in_flight], return_when=FIRST_COMPLETED)
+                    future, job = next(pair for pair in in_flight if pair[0] in done)
+                    in_flight.remove((future, job))
+                    result = future.result()
+                submit_next()
+                yield job, result
+        finally:
+            # A caller that stops early shouldn't wait on checks it won't read
+            for future, _ in in_flight:
+                future.cancel()
+
+def check_restaurants(checker, restaurants, date, party_size, concurrency=1, counts=None):
+    """Check each restaurant for one date/party size, yielding (restaurant, result) in order"""
+    jobs = [(restaurant, date, party_size) for restaurant in restaurants]
+    for (restaurant, _, _), result in run_checks(checker, jobs, concurrency, counts=counts):
+        yield restaurant, result
+
+def filter_near(restaurants, lat, lng, radius_km):
+    """
+    Restaurants within radius_km of a point, nearest first, each with its
+    "distance_km". Restaurants without coordinates are dropped.
+    """
+    index = SpatialIndex.from_records(restaurants)
+    return [
+        {**restaurant, 'distance_km': round(distance, 2)}
+        for distance, restaurant in index.within(lat, lng, radius_km)
+    ]
+
+def apply_travel_matrix(restaurants, origin, mode):
+    """
+    Set each restaurant's travel_time_minutes from the travel matrix for
+    origin (a registered name, or an address used for this run only) and
+    mode. Raises ValueError for an unknown name.
+
+    Cells not yet known are filled with one batched Distance Matrix query
+    when a Maps key is configured; otherwise those times stay unknown.
+    Returns (restaurants, origin_address).
+    """
+    matrix = TravelMatrix()
+    matrix.use_origin(origin)
+
+    located = [r for r in restaurants if r['latitude'] is not None and r['longitude'] is not None]
+    matrix.add_venues(r['venue_id'] for r in located)
+    if matrix.missing(origin, [r['venue_id'] for r in located], mode):
+        try:
+            queried = matrix.fill(origin, located, mode, load_maps_credentials())
+            matrix.save()
+            print(f"Note: fetched {queried} {mode} times from {origin}", file=sys.stderr)
+        except Exception as e:
+            print(f"Note: couldn't fetch missing travel times ({e})", file=sys.stderr)
+
+    return [
+        {**r, 'travel_time_minutes': matrix.get(origin, r['venue_id'], mode)}
+        for r in restaurants
+    ], matrix.origins[origin]
+
+def filter_travel_time(restaurants, max_minutes, refine_borderline=False,
+                       origin_address=None, mode='transit'):
+    """Split restaurants into (within, too_far), estimating missing travel times from distance"""
+    origin = None
+    if any(r['travel_time_minutes'] is None for r in restaurants):
+        try:
+            home = origin_address or get_home_address()
+            origin = resolve_location(home)
+        except Exception as e:
+            print(f"Note: can't estimate missing travel times ({e})", file=sys.stderr)
+
+    if origin is None:
+        within = [r for r in restaurants
+                  if r['travel_time_minutes'] is None or r['travel_time_minutes'] <= max_minutes]
+        too_far = [r for r in restaurants if r not in within]
+        return within, too_far
+
+    model = calibrate(origin, restaurants, mode)
+    within, too_far, borderline = prefilter(origin, restaurants, max_minutes, model)
+    # Borderline estimates are kept unless one batched Distance Matrix call settles them
+    if borderline and refine_borderline:
+        try:
+            kept, dropped = refine(home, borderline, max_minutes, load_maps_credentials(), mode)
+            within += kept
+            too_far += dropped
+            borderline = []
+        except Exception as e:
+            print(f"Note: couldn't refine borderline travel times ({e})", file=sys.stderr)
+    within += borderline
+
+    # Keep the list's own order
+    order = {r['venue_id']: index for index, r in enumerate(restaurants)}
+    within.sort(key=lambda r: order[r['venue_id']])
+    return within, too_far
+
+def group_by_area(restaurants, cell_degrees=AREA_CELL_DEGREES):
+    """
+    Group restaurants with coordinates into grid cells.
+
+    Returns ([(center_lat, center_lng, [restaurant, ...]), ...], ungrouped)
+    where each center is the mean position of the cell's restaurants.
+    """
+    cells = {}
+    ungrouped = []
+    for restaurant in restaurants:
+        lat, lng = restaurant.get('latitude'), restaurant.get('longitude')
+        if lat is None or lng is None:
+            ungrouped.append(restaurant)
+            continue
+        cell = (int(lat // cell_degrees), int(lng // cell_degrees))
+        cells.setdefault(cell, []).append(restaurant)
+
+    areas = []
+    for members in cells.values():
+        center_lat = sum(r['latitude'] for r in members) / len(members)
+        center_lng = sum(r['longitude'] for r in members) / len(members)
+        areas.append((center_lat, center_lng, members))
+    return areas, ungrouped
+
+def prefetch_area_results(checker, restaurants, dates, party_sizes, concurrency=1):
+    """
+    Check venues in bulk with one paged area search per neighborhood,
+    date and party size.
+
+    Every area response is matched against all requested venues, so a venue
+    near a cell border (or alone in its cell) is covered by whichever search
+    reaches it. Returns ({(venue_id, date, party_size): result},
+    area_requests); the rest are left for per-venue checks.
+    """
+    areas, _ = group_by_area(restaurants)
+    # A lone venue is cheaper to check directly than to page an area for
+    jobs = [
+        (area, date, size)
+        for area in areas if len(area[2]) > 1
+        for date in dates
+        for size in party_sizes
+    ]
+
+    def search(job):
+        (lat, lng, _), date, size = job
+        return checker.find_area(lat, lng, date, size)
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        found = list(executor.map(search, jobs))
+
+    venue_ids = {str(r['venue_id']): r['venue_id'] for r in restaurants if r.get('venue_id')}
+    results = {}
+    for (_, date, size), area_results in zip(jobs, found):
+        for key, result in area_results.items():
+            venue_id = venue_ids.get(str(key))
+            if venue_id is not None:
+                results.setdefault((venue_id, date, size), result)
+    return results, len(jobs)
+
+class PrefetchedChecker:
+    """Serve checks from bulk area results, falling back to per-venue calls"""
+
+    def __init__(self, checker, results):
+        self.checker = checker
+        self.results = results
+
+    def check_availability(self, venue_id, date, party_size=2):
+        result = self.results.get((venue_id, date, party_size))
+        if result is not None:
+            return result
+        return self.checker.check_availability(venue_id, date, party_size)
+
+def parse_date_range(range_str):
+    """
+    Parse "START:END" (natural language or YYYY-MM-DD on either side)
+    into a list of YYYY-MM-DD dates, inclusive.
+    """
+    if ':' not in range_str:
+        raise ValueError('expected START:END')
+    start_str, end_str = range_str.split(':', 1)
+    start = datetime.strptime(parse_date_query(start_str), '%Y-%m-%d')
+    end = datetime.strptime(parse_date_query(end_str), '%Y-%m-%d')
+    if end < start:
+        raise ValueError('end date is before start date')
+    days = (end - start).days + 1
+    return [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(days)]
+
+def build_date_list(start_date, days):
+    """Build a list of `days` consecutive YYYY-MM-DD dates starting at start_date"""
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    return [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(days)]
+
+def parse_party_sizes(sizes_str):
+    """Parse a comma-separated party size list like "2,4" """
+    sizes = [int(size) for size in sizes_str.split(',') if size.strip()]
+    if not sizes or any(size < 1 for size in sizes):
+        raise ValueError('party sizes must be positive integers')
+    return sorted(set(sizes))
+
+def print_sweep_grid(restaurants, dates, party_sizes, grid, max_time):
+    """
+    Print a compact venue x date grid of slot counts.
+
+    grid maps (venue_id, date, party_size) to a result dict with filtered
+    slots. Each cell shows the number of slots before max_time per party
+    size, "-" for none and "!" for a failed check.
+    """
+    def cell(venue_id, date):
+        parts = []
+        for size in party_sizes:
+            result = grid[(venue_id, date, size)]
+            if result.get('status') == STATUS_ERROR:
+                value = '!'
+            elif result['slots']:
+                value = str(len(result['slots']))
+            else:
+                value = '-'
+            parts.append(value if len(party_sizes) == 1 else f"{size}p:{value}")
+        return ' '.join(parts)
+
+    headers = [datetime.strptime(d, '%Y-%m-%d').strftime('%a %m-%d') for d in dates]
+    name_width = max(len('Venue'), *(len(r['name']) for r in restaurants))
+    cells = {
+        (r['venue_id'], d): cell(r['venue_id'], d)
+        for r in restaurants for d in dates
+    }
+    col_width = max(len(headers[0]), *(len(c) for c in cells.values()))
+
+    print(f"{'Venue':<{name_width}}  " + '  '.join(f"{h:<{col_width}}" for h in headers))
+    print('-' * (name_width + (col_width + 2) * len(dates)))
+    for r in restaurants:
+        row = '  '.join(f"{cells[(r['venue_id'], d)]:<{col_width}}" for d in dates)
+        print(f"{r['name']:<{name_width}}  {row}")
+
+    print()
+    print(f"Cells show slots before {max_time}"
+          + (" per party size" if len(party_sizes) > 1 else "")
+          + ' ("-" none, "!" check failed)')
+
+def run_sweep(checker, restaurants, dates, party_sizes, max_time, concurrency=1):
+    """Check every venue x date x party size in one batch and print a grid summary"""
+    jobs = [
+        (restaurant, date, size)
+        for restaurant in restaurants
+        for date in dates
+        for size in party_sizes
+    ]
+
+    grid = {}
+    for (restaurant, date, size), result in run_checks(checker, jobs, concurrency):
+        if result['available']:
+            slots = filter_time_slots(result['slots'], max_time)
+        else:
+            slots = []
+        grid[(restaurant['venue_id'], date, size)] = {**result, 'slots': slots}
+
+    print_sweep_grid(restaurants, dates, party_sizes, grid, max_time)
+
+    open_cells = sum(1 for result in grid.values() if result['slots'])
+    failed_cells = sum(1 for result in grid.values() if result.get('status') == STATUS_ERROR)
+    print("=" * 60)
+    summary = f"Summary: {open_cells}/{len(grid)} venue/date/party-size combinations available"
+    if failed_cells:
+        summary += f" ({failed_cells} checks failed)"
+    print(summary)
+
+def booking_url(venue_id, date, party_size):
+    """Resy booking page for a venue, date and party size"""
+    return f"https://resy.com/cities/ny/venues/{venue_id}?date={date}&seats={party_size}"
+
+def build_record(restaurant, date, party_size, result, max_time):
+    """Machine-readable record for one venue/date/party-size check"""
+    status = result.get('status', STATUS_AVAILABLE if result['available'] else STATUS_UNAVAILABLE)
+    slots = filter_time_slots(result['slots'], max_time) if result['available'] else []
+    message = result.get('error', result.get('message', ''))
+    if result['available'] and not slots:
+        status = STATUS_UNAVAILABLE
+        message = f'No availability before {max_time}'
+
+    return {
+        'venue_id': restaurant['venue_id'],
+        'name': restaurant['name'],
+        'location': restaurant['location'],
+        'cuisine': restaurant['cuisine'],
+        'travel_time_minutes': restaurant['travel_time_minutes'],
+        **({'distance_km': restaurant['distance_km']} if 'distance_km' in restaurant else {}),
+        'date': date,
+        'party_size': party_size,
+        'status': status,
+        'slots': slots,
+        'message': message,
+        'book_url': booking_url(restaurant['venue_id'], date, party_size),
+        **({'lists': restaurant['lists']} if 'lists' in restaurant else {})
+    }
+
+def stream_records(checker, jobs, output_format, max_time, concurrency=1, out=None,
+                   first=None):
+    """
+    Emit one record per check as soon as it finishes.
+
+    "ndjson" writes one JSON object per line; "json" writes a single array
+    whose elements are flushed one at a time, so it can be parsed
+    incrementally. With first, jobs are taken in the given (priority) order
+    and the scan stops once that many available records were emitted.
+    """
+    out = out or sys.stdout
+    if output_format == 'json':
+        out.write('[')
+
+    found = 0
+    results = run_checks(checker, jobs, concurrency, ordered=first is not None)
+    for index, ((restaurant, date, party_size), result) in enumerate(results):
+        record = build_record(restaurant, date, party_size, result, max_time)
+        line = json.dumps(record)
+        if output_format == 'json':
+            out.write(('\n' if index == 0 else ',\n') + line)
+        else:
+            out.write(line + '\n')
+        out.flush()
+
+        found += record['status'] == STATUS_AVAILABLE
+        if first is not None and found >= first:
+            results.close()
+            break
+
+    if output_format == 'json':
+        out.write('\n]\n')
+        out.flush()
+
 def build_restaurant_file_path(base_dir, list_type, category):
     """Build path to restaurant CSV file"""
     filename = f"{list_type}_{category}.csv"
     return os.path.join(base_dir, filename)
 
+def print_list_breakdown(checked_restaurants, available_restaurants):
+    """Attribute results back to each list a checked venue belongs to"""
+    checked, available = {}, {}
+    for resto in checked_restaurants:
+        for label in resto['lists']:
+            checked[label] = checked.get(label, 0) + 1
+    for resto in available_restaurants:
+        for label in resto['lists']:
+            available[label] = available.get(label, 0) + 1
+    print("By list:")
+    for label in sorted(checked):
+        print(f"   {label}: {available.get(label, 0)}/{checked[label]} available")
+
 def main():
     parser = argparse.ArgumentParser(
         description='Check restaurant availability on Resy',
@@ -73,28 +538,41 @@ Examples:
   %(prog)s --date "next tuesday" --list try --category dinner
   %(prog)s --date tomorrow --list love --category brunch --party-size 4
   %(prog)s --date 2025-12-20 --list try --category dinner --max-time 19:00
+  %(prog)s --date tomorrow --list try --category dinner --concurrency 8
+  %(prog)s --date tomorrow --days 7 --party-sizes 2,4 --list try --category dinner
+  %(prog)s --date-range 2025-12-20:2025-12-26 --list love --category dinner
+  %(prog)s --date tomorrow --list try --category dinner --bulk
+  %(prog)s --date tomorrow --list all --category all
+  %(prog)s --date tomorrow --list all --category dinner --first 3
+  %(prog)s --date tomorrow --list all --category all --near 40.7265,-73.9815 --radius 1
+  %(prog)s --date tomorrow --list try --category dinner --from office --mode walking --max-travel-time 20
         """
     )
 
     # Required arguments
-    parser.add_argument(
+    date_group = parser.add_mutually_exclusive_group(required=True)
+    date_group.add_argument(
         '--date',
-        required=True,
         help='Date in natural language (tomorrow, next tuesday) or YYYY-MM-DD'
     )
 
+    date_group.add_argument(
+        '--date-range',
+        help='Sweep an inclusive date range, START:END (e.g. 2025-12-20:2025-12-26)'
+    )
+
     parser.add_argument(
         '--list',
         required=True,
-        choices=['try', 'love'],
-        help='Restaurant list: "try" (places_to_try) or "love" (places_we_love)'
+        choices=['try', 'love', 'all'],
+        help='Restaurant list: "try" (places_to_try), "love" (places_we_love) or "all"'
     )
 
     parser.add_argument(
         '--category',
         required=True,
-        choices=['dinner', 'brunch', 'lunch', 'drinks'],
-        help='Meal category'
+        choices=['dinner', 'brunch', 'lunch', 'drinks', 'all'],
+        help='Meal category, or "all"'
     )
 
     # Optional arguments
@@ -105,6 +583,19 @@ Examples:
         help='Number of people (default: 2)'
     )
 
+    parser.add_argument(
+        '--party-sizes',
+        default=None,
+        help='Sweep several party sizes, comma-separated (e.g. 2,4)'
+    )
+
+    parser.add_argument(
+        '--days',
+        type=int,
+        default=1,
+        help='Sweep this many consecutive days starting at --date (default: 1)'
+    )
+
     parser.add_argument(
         '--max-time',
         default='20:30',
@@ -134,8 +625,91 @@ Examples:
         help='Filter restaurants by max travel time in minutes (e.g., 30)'
     )
 
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Number of venues to check in parallel (default: 1)'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always query Resy instead of reusing cached responses'
+    )
+
+    parser.add_argument(
+        '--max-age',
+        type=float,
+        default=DEFAULT_CACHE_MAX_AGE,
+        help=f'Reuse cached responses up to this many seconds old (default: {DEFAULT_CACHE_MAX_AGE})'
+    )
+
+    parser.add_argument(
+        '--format',
+        choices=['text', 'ndjson', 'json'],
+        default='text',
+        help='Output format; ndjson/json stream one record per check as it finishes (default: text)'
+    )
+
+    parser.add_argument(
+        '--bulk',
+        action='store_true',
+        help='Check venues by neighborhood with area searches, one request per '
+             'area instead of per venue (venues not covered are checked individually)'
+    )
+
+    parser.add_argument(
+        '--first',
+        type=int,
+        default=None,
+        metavar='N',
+        help='Stop once N venues with slots are found, checking the most '
+             'promising venues (close, often available, loved) first'
+    )
+
+    parser.add_argument(
+        '--near',
+        default=None,
+        help='Only check restaurants near "lat,lng" or an address (no Maps '
+             'calls for coordinates or previously geocoded addresses)'
+    )
+
+    parser.add_argument(
+        '--radius',
+        type=float,
+        default=DEFAULT_NEAR_RADIUS_KM,
+        help=f'Radius for --near, in km (default: {DEFAULT_NEAR_RADIUS_KM})'
+    )
+
+    parser.add_argument(
+        '--refine-travel',
+        action='store_true',
+        help='With --max-travel-time, settle borderline estimated travel times '
+             'with one batched Maps Distance Matrix call'
+    )
+
+    parser.add_argument(
+        '--from',
+        dest='origin',
+        default=None,
+        help='Travel times from this origin: a name registered with '
+             'travel_matrix.py add-origin, or an address or "lat,lng" '
+             'used for this run only (default: home)'
+    )
+
+    parser.add_argument(
+        '--mode',
+        choices=MODES,
+        default='transit',
+        help='Travel mode for travel times (default: transit)'
+    )
+
     args = parser.parse_args()
 
+    if args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
+
     # Load credentials from .env
     try:
         api_key, auth_token = load_resy_credentials()
@@ -143,55 +717,158 @@ Examples:
         print(f"Error: {e}")
         sys.exit(1)
 
-    # Parse date
+    if args.days < 1:
+        parser.error('--days must be at least 1')
+
+    # Parse dates
     try:
-        target_date = parse_date_query(args.date)
+        if args.date_range:
+            dates = parse_date_range(args.date_range)
+        else:
+            dates = build_date_list(parse_date_query(args.date), args.days)
     except Exception as e:
-        print(f"Error parsing date '{args.date}': {e}")
+        print(f"Error parsing date '{args.date_range or args.date}': {e}")
         sys.exit(1)
+    target_date = dates[0]
 
-    # Build file path
-    list_type = 'places_to_try' if args.list == 'try' else 'places_we_love'
-    file_path = build_restaurant_file_path(
-        args.restaurants_dir,
-        list_type,
-        args.category
-    )
+    # Parse party sizes
+    if args.party_sizes:
+        try:
+            party_sizes = parse_party_sizes(args.party_sizes)
+        except ValueError as e:
+            print(f"Error parsing party sizes '{args.party_sizes}': {e}")
+            sys.exit(1)
+    else:
+        party_sizes = [args.party_size]
+    sweep = len(dates) > 1 or len(party_sizes) > 1
+    if args.first is not None and (args.first < 1 or sweep):
+        parser.error('--first needs N >= 1 and a single date and party size')
+
+    cross_list = args.list == 'all' or args.category == 'all'
+    if cross_list:
+        # Merge every matching list, checking each venue once
+        list_type = 'all lists' if args.list == 'all' else LIST_PREFIXES[args.list]
+        restaurants = load_cross_list(
+            args.restaurants_dir,
+            None if args.list == 'all' else args.list,
+            None if args.category == 'all' else args.category
+        )
+        if not restaurants:
+            print(f"No restaurants with venue IDs found in {args.restaurants_dir}")
+            sys.exit(1)
+    else:
+        # Build file path
+        list_type = LIST_PREFIXES[args.list]
+        file_path = build_restaurant_file_path(
+            args.restaurants_dir,
+            list_type,
+            args.category
+        )
 
-    # Check if file exists
-    if not os.path.exists(file_path):
-        print(f"Error: Restaurant file not found: {file_path}")
-        sys.exit(1)
+        # Check if file exists
+        if not os.path.exists(file_path):
+            print(f"Error: Restaurant file not found: {file_path}")
+            sys.exit(1)
 
-    # Parse restaurants from file
-    restaurants = parse_restaurant_csv(file_path)
+        # Parse restaurants from file
+        restaurants = parse_restaurant_csv(file_path)
 
-    if not restaurants:
-        print(f"No restaurants with venue IDs found in {file_path}")
-        sys.exit(1)
+        if not restaurants:
+            print(f"No restaurants with venue IDs found in {file_path}")
+            sys.exit(1)
+
+    skipped_for_distance = 0
+    if args.near:
+        try:
+            near_lat, near_lng = resolve_location(args.near)
+        except Exception as e:
+            print(f"Error locating '{args.near}': {e}")
+            sys.exit(1)
+        nearby = filter_near(restaurants, near_lat, near_lng, args.radius)
+        skipped_for_distance = len(restaurants) - len(nearby)
+        restaurants = nearby
+        if not restaurants:
+            print(f"No restaurants within {args.radius} km of {args.near}")
+            sys.exit(1)
+
+    # Stored travel times are transit from home; anything else comes from the matrix
+    origin_address = None
+    if args.origin or args.mode != 'transit':
+        try:
+            restaurants, origin_address = apply_travel_matrix(
+                restaurants, args.origin or HOME_ORIGIN, args.mode
+            )
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
 
     # Filter by travel time if specified
     skipped_for_travel_time = []
+
     if args.max_travel_time:
-        filtered_restaurants = []
-        for r in restaurants:
-            if r['travel_time_minutes'] is None:
-                # Include restaurants without travel time data
-                filtered_restaurants.append(r)
-            elif r['travel_time_minutes'] <= args.max_travel_time:
-                filtered_restaurants.append(r)
-            else:
-                skipped_for_travel_time.append(r)
-        restaurants = filtered_restaurants
+        restaurants, skipped_for_travel_time = filter_travel_time(
+            restaurants, args.max_travel_time, args.refine_travel,
+            origin_address=origin_address, mode=args.mode
+        )
+
+    # Check availability
+    cache = None if args.no_cache else ResponseCache(
+        table='resy_find',
+        ttl=max(FIND_CACHE_TTL, args.max_age)
+    )
+    archive = AvailabilityArchive()
+    checker = ResyChecker(
+        api_key,
+        auth_token,
+        pool_size=args.concurrency,
+        cache=cache,
+        max_age=args.max_age,
+        archive=archive
+    )
+
+    # The archive only records fresh fetches, so cache hits aren't counted twice
+    if args.first:
+        restaurants = prioritize(restaurants, archive.hit_rates())
+
+    area_requests = 0
+    if args.bulk:
+        prefetched, area_requests = prefetch_area_results(
+            checker, restaurants, dates, party_sizes, args.concurrency
+        )
+        checker = PrefetchedChecker(checker, prefetched)
+
+    if args.format != 'text':
+        jobs = [
+            (restaurant, date, size)
+            for restaurant in restaurants
+            for date in dates
+            for size in party_sizes
+        ]
+        stream_records(checker, jobs, args.format, args.max_time, args.concurrency,
+                       first=args.first)
+        return
 
     # Print header
     print(f"🍽️  Checking {args.category} availability")
-    print(f"📅  Date: {target_date}")
-    print(f"👥  Party size: {args.party_size}")
+    if len(dates) > 1:
+        print(f"📅  Dates: {dates[0]} to {dates[-1]} ({len(dates)} days)")
+    else:
+        print(f"📅  Date: {target_date}")
+    print(f"👥  Party size: {', '.join(str(size) for size in party_sizes)}")
     print(f"🕐  Max time: {args.max_time}")
+    if args.first:
+        print(f"🎯  Stopping after the first {args.first} available, best candidates first")
     if args.max_travel_time:
         print(f"🚇  Max travel: {args.max_travel_time} min")
-    print(f"📋  List: {list_type}")
+    if origin_address:
+        print(f"🧭  Travel: {args.mode} from {args.origin or HOME_ORIGIN}")
+    if args.near:
+        print(f"📌  Within {args.radius} km of {args.near} ({skipped_for_distance} farther away skipped)")
+    print(f"📋  List: {list_type}" + (f", category: {args.category}" if cross_list else ''))
+    if args.bulk:
+        covered = len(checker.results)
+        total = len(restaurants) * len(dates) * len(party_sizes)
+        print(f"📡  Area searches: {area_requests} covered {covered}/{total} checks")
     if skipped_for_travel_time:
         print(f"🔍  Checking {len(restaurants)} restaurants (skipped {len(skipped_for_travel_time)} too far)...")
     else:
@@ -199,21 +876,34 @@ Examples:
     print("=" * 60)
     print()
 
-    # Check availability
-    checker = ResyChecker(api_key, auth_token)
+    if sweep:
+        run_sweep(
+            checker,
+            restaurants,
+            dates,
+            party_sizes,
+            args.max_time,
+            concurrency=args.concurrency
+        )
+        return
+
     available_restaurants = []
     unavailable_restaurants = []
+    failed_restaurants = []
+
+    counts = {}
+    results = check_restaurants(
+        checker,
+        restaurants,
+        target_date,
+        party_sizes[0],
+        concurrency=args.concurrency,
+        counts=counts
+    )
 
-    for restaurant in restaurants:
+    for restaurant, result in results:
         if not args.concise:
             print(f"Checking {restaurant['name']}...")
-
-        result = checker.check_availability(
-            venue_id=restaurant['venue_id'],
-            date=target_date,
-            party_size=args.party_size
-        )
-
         if result['available']:
             # Filter by max time
             filtered_slots = filter_time_slots(
@@ -231,12 +921,24 @@ Examples:
                     **restaurant,
                     'message': f'No availability before {args.max_time}'
                 })
+        elif result.get('status') == STATUS_ERROR:
+            failed_restaurants.append({
+                **restaurant,
+                'message': result.get('error', 'Check failed')
+            })
         else:
             unavailable_restaurants.append({
                 **restaurant,
                 'message': result.get('error', result.get('message', 'No availability'))
             })
 
+        if args.first and len(available_restaurants) >= args.first:
+            # Stop early; checks not yet started are cancelled
+            results.close()
+            break
+
+    checked = len(available_restaurants) + len(unavailable_restaurants) + len(failed_restaurants)
+
     # Display results
     print()
     print("=" * 60)
@@ -251,7 +953,12 @@ Examples:
             print(f"   Location: {resto['location']}")
             print(f"   Cuisine: {resto['cuisine']}")
             if resto.get('travel_time_minutes'):
-                print(f"   Travel: {resto['travel_time_minutes']} min")
+                estimated = ' (estimated)' if resto.get('travel_time_estimated') else ''
+                print(f"   Travel: {resto['travel_time_minutes']} min{estimated}")
+            if 'distance_km' in resto:
+                print(f"   Distance: {resto['distance_km']} km")
+            if cross_list:
+                print(f"   Lists: {', '.join(resto['lists'])}")
 
             if args.concise:
                 # Show time range instead of all slots
@@ -271,7 +978,7 @@ Examples:
                 for slot in resto['slots']:
                     print(f"      🕐 {slot['time']} - {slot['type']}")
 
-            print(f"   Book: https://resy.com/cities/ny/venues/{resto['venue_id']}?date={target_date}&seats={args.party_size}")
+            print(f"   Book: {booking_url(resto['venue_id'], target_date, party_sizes[0])}")
             print()
     else:
         print(f"❌ No restaurants available before {args.max_time}")
@@ -284,8 +991,27 @@ Examples:
             print(f"   {resto['name']}: {resto['message']}")
         print()
 
+    if failed_restaurants:
+        print(f"⚠️  CHECK FAILED ({len(failed_restaurants)}):")
+        print()
+        for resto in failed_restaurants:
+            print(f"   {resto['name']}: {resto['message']}")
+        print()
+
     print("=" * 60)
-    print(f"Summary: {len(available_restaurants)}/{len(restaurants)} restaurants available")
+    summary = f"Summary: {len(available_restaurants)}/{checked} restaurants available"
+    if checked < len(restaurants):
+        summary += f" (stopped early, {len(restaurants) - counts['started']} not checked)"
+    if failed_restaurants:
+        summary += f" ({len(failed_restaurants)} checks failed)"
+    print(summary)
+
+    if cross_list:
+        # Only venues actually checked; --first may have stopped early
+        print_list_breakdown(
+            available_restaurants + unavailable_restaurants + failed_restaurants,
+            available_restaurants
+        )
 
 if __name__ == "__main__":
     main()
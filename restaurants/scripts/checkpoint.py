@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Append-only progress log for long-running, resumable jobs.
+
+Each completed unit of work is appended as one JSON line and fsync'd
+before the job moves on, so an interrupted run loses nothing it already
+paid for. Loading the log merges all lines for a key, last write wins.
+Small state files are replaced atomically with atomic_write_json or
+atomic_write_bytes.
+"""
+
+import json
+import os
+import stat
+import tempfile
+
+
+def _target_mode(path: str) -> int:
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write_bytes(path: str, data: bytes):
+    """Write bytes via a temp file and rename, so readers never see a partial file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600; keep the replaced file's mode (or the
+        # usual umask default for a new file)
+        os.chmod(tmp_path, _target_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def atomic_write_json(path: str, data):
+    """Write compact JSON atomically (see atomic_write_bytes)"""
+    atomic_write_bytes(path, json.dumps(data, separators=(',', ':')).encode('utf-8'))
+
+
+class Checkpoint:
+    def __init__(self, path: str):
+        self.path = path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> dict:
+        """Return {key: merged fields} for every recorded key"""
+        entries = {}
+        if not self.exists():
+            return entries
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A crash mid-write can leave a torn last line
+                    continue
+                key = record.pop('key', None)
+                if key is not None:
+                    entries.setdefault(key, {}).update(record)
+        return entries
+
+    def record(self, key: str, **fields):
+        """Durably append the result for one key"""
+        line = json.dumps({'key': key, **fields}, separators=(',', ':'))
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear(self):
+        """Remove the log once the job has completed"""
+        if self.exists():
+            os.remove(self.path)
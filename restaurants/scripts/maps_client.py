@@ -4,20 +4,61 @@ Google Maps client for geocoding and travel time calculations.
 
 Usage:
   python3 maps_client.py geocode "123 Main St, NYC"
+  python3 maps_client.py invalidate-geocode "123 Main St, NYC"
   python3 maps_client.py travel-time "123 Main St, NYC"
   python3 maps_client.py update-restaurants --list try --category dinner
+  python3 maps_client.py update-restaurants --list try --category dinner --resume
+  python3 maps_client.py generate-map --list all --category all --compress
 """
 
 import argparse
-import csv
+import gzip
 import json
 import os
+import re
 import sys
-import time
 
 import requests
 from dotenv import load_dotenv
 
+from checkpoint import Checkpoint, atomic_write_bytes
+from rate_limiter import default_limiter
+from response_cache import ResponseCache
+from restaurant_store import LIST_PREFIXES, RestaurantStore, list_filename, normalize_name
+
+# Distance Matrix limits: 25 origins or destinations, 100 elements per request
+MAX_MATRIX_SIDE = 25
+MAX_MATRIX_ELEMENTS = 100
+
+# Places rarely move, so geocode results are kept for about six months
+GEOCODE_CACHE_TTL = 180 * 24 * 3600
+GEOCODE_CACHE_MAX_ENTRIES = 50000
+
+_geocode_cache = None
+
+# Geocoding statuses that will not change on retry (unlike OVER_QUERY_LIMIT,
+# UNKNOWN_ERROR, timeouts and HTTP errors)
+PERMANENT_GEOCODE_STATUSES = {'ZERO_RESULTS', 'INVALID_REQUEST'}
+
+# Rewrite the CSV after this many updated rows during update-restaurants
+CHECKPOINT_EXPORT_EVERY = 25
+
+# Layered map data: one positional row per venue; 5 decimals is about 1 m
+MAP_FIELDS = ['name', 'location', 'cuisine', 'lat', 'lng', 'travel_time', 'venue_id']
+MAP_COORD_DECIMALS = 5
+
+
+class GeocodeError(ValueError):
+    """Geocoding API returned a non-OK status"""
+
+    def __init__(self, status: str, message: str = ''):
+        super().__init__(f"Geocoding failed: {status} - {message}")
+        self.status = status
+
+    @property
+    def permanent(self) -> bool:
+        return self.status in PERMANENT_GEOCODE_STATUSES
+
 
 def load_maps_credentials():
     """Load Google Maps API key from environment"""
@@ -37,32 +78,67 @@ def get_home_address():
     return address
 
 
-def geocode(address: str, api_key: str) -> dict:
+def get_geocode_cache() -> ResponseCache:
+    """Return the shared on-disk geocode cache"""
+    global _geocode_cache
+    if _geocode_cache is None:
+        _geocode_cache = ResponseCache(
+            table='geocode',
+            ttl=GEOCODE_CACHE_TTL,
+            max_entries=GEOCODE_CACHE_MAX_ENTRIES
+        )
+    return _geocode_cache
+
+
+def normalize_geocode_query(address: str) -> str:
+    """
+    Normalize a geocode query for cache lookups.
+
+    Case, repeated whitespace and spacing around commas are ignored, so
+    "Mono Mono,  Bowery, New York, NY" and "mono mono, bowery, new york, ny"
+    share one entry.
+    """
+    query = re.sub(r'\s+', ' ', address.strip().lower())
+    query = re.sub(r'\s*,\s*', ', ', query)
+    return query.strip(' ,.')
+
+
+def geocode(address: str, api_key: str, use_cache: bool = True) -> dict:
     """
     Convert address to lat/lng coordinates.
+    Checks the local geocode cache before calling the API.
     Returns: {"lat": float, "lng": float, "formatted_address": str}
     """
+    cache_key = normalize_geocode_query(address)
+    if use_cache:
+        cached = get_geocode_cache().get(cache_key)
+        if cached is not None:
+            return cached
+
     url = "https://maps.googleapis.com/maps/api/geocode/json"
     params = {
         "address": address,
         "key": api_key
     }
 
-    response = requests.get(url, params=params)
+    response = default_limiter.request(requests, 'GET', url, params=params)
     response.raise_for_status()
     data = response.json()
 
     if data["status"] != "OK":
-        raise ValueError(f"Geocoding failed: {data['status']} - {data.get('error_message', '')}")
+        raise GeocodeError(data["status"], data.get('error_message', ''))
 
     result = data["results"][0]
     location = result["geometry"]["location"]
 
-    return {
+    geo_result = {
         "lat": location["lat"],
         "lng": location["lng"],
         "formatted_address": result["formatted_address"]
     }
+    if use_cache:
+        get_geocode_cache().set(cache_key, geo_result)
+    return geo_result
 
 
 def get_travel_time(origin: str, destination: str, api_key: str, mode: str = "transit") -> dict:
@@ -85,7 +161,7 @@ def get_travel_time(origin: str, destination: str, api_key: str, mode: str = "tr
         "key": api_key
     }
 
-    response = requests.get(url, params=params)
+    response = default_limiter.request(requests, 'GET', url, params=params)
     response.raise_for_status()
     data = response.json()
 
@@ -104,27 +180,94 @@ def get_travel_time(origin: str, destination: str, api_key: str, mode: str = "tr
     }
 
 
-def update_restaurant_csv(list_type: str, category: str, api_key: str, home_address: str):
+def _parse_matrix_element(element: dict):
+    """Convert a Distance Matrix element to our result dict, or None if no route"""
+    if element.get("status") != "OK":
+        return None
+    return {
+        "duration_minutes": element["duration"]["value"] // 60,
+        "duration_text": element["duration"]["text"],
+        "distance_km": element["distance"]["value"] / 1000
+    }
+
+
+def get_travel_time_matrix(origins: list, destinations: list, api_key: str,
+                           mode: str = "transit") -> list:
     """
-    Update a restaurant CSV file with lat/lng and travel time.
+    Calculate travel times from every origin to every destination.
+
+    Requests are batched up to the Distance Matrix per-request limits, so N
+    destinations from one origin cost ceil(N / 25) calls.
+
+    Returns: matrix[i][j] for origins[i] -> destinations[j], each a dict like
+    get_travel_time's result, or None when no route was found.
+    """
+    url = "https://maps.googleapis.com/maps/api/distancematrix/json"
+    matrix = [[None] * len(destinations) for _ in origins]
+
+    origin_step = min(len(origins), MAX_MATRIX_SIDE) or 1
+    dest_step = min(MAX_MATRIX_SIDE, MAX_MATRIX_ELEMENTS // origin_step)
+
+    for oi in range(0, len(origins), origin_step):
+        origin_chunk = origins[oi:oi + origin_step]
+        for di in range(0, len(destinations), dest_step):
+            dest_chunk = destinations[di:di + dest_step]
+            params = {
+                "origins": "|".join(origin_chunk),
+                "destinations": "|".join(dest_chunk),
+                "mode": mode,
+                "key": api_key
+            }
+
+            response = default_limiter.request(requests, 'GET', url, params=params)
+            response.raise_for_status()
+            data = response.json()
+
+            if data["status"] != "OK":
+                raise ValueError(f"Distance Matrix failed: {data['status']}")
+
+            for i, row in enumerate(data["rows"]):
+                for j, element in enumerate(row["elements"]):
+                    matrix[oi + i][di + j] = _parse_matrix_element(element)
+
+    return matrix
+
+
+def get_travel_times(origin: str, destinations: list, api_key: str,
+                     mode: str = "transit") -> list:
+    """Batched get_travel_time for one origin; returns one result (or None) per destination"""
+    if not destinations:
+        return []
+    return get_travel_time_matrix([origin], destinations, api_key, mode)[0]
+
+
+def _checkpoint_key(row: dict) -> str:
+    """Stable identity for a row across re-imports of its CSV"""
+    return f"{row['venue_id'] or ''}|{normalize_name(row['name'])}"
+
+
+def update_restaurant_csv(list_type: str, category: str, api_key: str, home_address: str,
+                          resume: bool = False):
     """
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(script_dir, '..', 'data')
+    Update a restaurant CSV file with lat/lng and travel time.
 
-    list_prefix = 'places_to_try' if list_type == 'try' else 'places_we_love'
-    filename = f"{list_prefix}_{category}.csv"
-    filepath = os.path.join(data_dir, filename)
+    Every API result (or failure) is appended to a checkpoint log as soon as
+    it arrives, and the CSV is rewritten atomically every few updates, with
+    the store following only once the CSV is written. With resume=True the
+    log of an interrupted run is replayed first, so no row is looked up
+    twice; otherwise a leftover log is discarded.
+    """
+    store = RestaurantStore()
+    filename = list_filename(list_type, category)
+    filepath = store.csv_path(list_type, category)
 
     if not os.path.exists(filepath):
         print(f"Error: File not found: {filepath}", file=sys.stderr)
         return False
 
     # Read existing data
-    rows = []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        rows = list(reader)
+    rows = store.select(list_type, category)
+    fieldnames = store.fieldnames(list_type, category)
 
     # Ensure we have the new columns
     new_fields = ['latitude', 'longitude', 'travel_time_minutes']
@@ -132,14 +275,67 @@ def update_restaurant_csv(list_type: str, category: str, api_key: str, home_addr
         if field not in fieldnames:
             fieldnames.append(field)
 
-    # Update each restaurant
-    updated_count = 0
+    def has_coords(row):
+        return row['latitude'] is not None and row['longitude'] is not None
+
+    updated = set()
+    # Results wait here (and in the checkpoint) until the next CSV export,
+    # so the store never gets ahead of the CSV
+    unsaved = {}
+
+    def save_progress(row):
+        unsaved[row['id']] = {
+            'latitude': row['latitude'],
+            'longitude': row['longitude'],
+            'travel_time_minutes': row['travel_time_minutes'],
+        }
+        updated.add(row['id'])
+        if len(unsaved) >= CHECKPOINT_EXPORT_EVERY:
+            export()
+
+    def export():
+        store.update_locations(list_type, category, unsaved, fieldnames)
+        unsaved.clear()
+
+    # Replay or discard the log of an interrupted run
+    checkpoint = Checkpoint(os.path.join(
+        store.data_dir, f".update_{list_type}_{category}.checkpoint.jsonl"
+    ))
+    done = {}
+    if checkpoint.exists() and not resume:
+        print("Discarding checkpoint from a previous run (use --resume to continue it)")
+        checkpoint.clear()
+    elif checkpoint.exists():
+        done = checkpoint.load()
+        origin = done.pop('__origin__', {}).get('home_address')
+        print(f"Resuming from checkpoint ({len(done)} restaurants already processed)")
+        for row in rows:
+            entry = done.get(_checkpoint_key(row))
+            if not entry:
+                continue
+            changed = False
+            if not has_coords(row) and entry.get('latitude') is not None:
+                row['latitude'], row['longitude'] = entry['latitude'], entry['longitude']
+                changed = True
+            # Travel times are only valid for the origin they were computed from
+            if (row['travel_time_minutes'] is None and origin == home_address
+                    and entry.get('travel_time_minutes') is not None):
+                row['travel_time_minutes'] = entry['travel_time_minutes']
+                changed = True
+            if changed:
+                save_progress(row)
+    checkpoint.record('__origin__', home_address=home_address)
+
+    # Geocode restaurants missing coordinates
     for row in rows:
         # Skip if already has coordinates and travel time
-        if row.get('latitude') and row.get('longitude') and row.get('travel_time_minutes'):
+        if has_coords(row) and row['travel_time_minutes'] is not None:
             print(f"Skipping {row['name']} (already has data)")
             continue
 
+        if has_coords(row):
+            continue
+
         location = row.get('location', '')
         name = row.get('name', '')
 
@@ -147,42 +343,67 @@ def update_restaurant_csv(list_type: str, category: str, api_key: str, home_addr
             print(f"Skipping {name} (no location)")
             continue
 
+        key = _checkpoint_key(row)
+        if done.get(key, {}).get('geocode_error'):
+            print(f"Skipping {name} (failed in previous run: {done[key]['geocode_error']})")
+            continue
+
         # Build search query - add NYC context
         search_query = f"{name}, {location}, New York, NY"
 
         try:
-            # Geocode
             print(f"Geocoding {name} ({location})...")
             geo_result = geocode(search_query, api_key)
-            row['latitude'] = geo_result['lat']
-            row['longitude'] = geo_result['lng']
+        except Exception as e:
+            print(f"  Error: {e}", file=sys.stderr)
+            # Only failures a retry can't fix are remembered; transient
+            # ones (timeouts, 429, 5xx) are tried again on --resume
+            if isinstance(e, GeocodeError) and e.permanent:
+                checkpoint.record(key, geocode_error=str(e))
+            continue
 
-            # Get travel time
-            print(f"  Getting travel time...")
-            travel_result = get_travel_time(
+        row['latitude'] = geo_result['lat']
+        row['longitude'] = geo_result['lng']
+        checkpoint.record(key, latitude=row['latitude'], longitude=row['longitude'])
+        save_progress(row)
+
+    # Get travel times for every geocoded restaurant in batched requests
+    pending = [
+        row for row in rows
+        if has_coords(row) and row['travel_time_minutes'] is None
+        and not done.get(_checkpoint_key(row), {}).get('route_error')
+    ]
+    if pending:
+        print(f"Getting travel times for {len(pending)} restaurants...")
+
+    for start in range(0, len(pending), MAX_MATRIX_SIDE):
+        batch = pending[start:start + MAX_MATRIX_SIDE]
+        try:
+            travel_results = get_travel_times(
                 home_address,
-                f"{geo_result['lat']},{geo_result['lng']}",
+                [f"{row['latitude']},{row['longitude']}" for row in batch],
                 api_key
             )
-            row['travel_time_minutes'] = travel_result['duration_minutes']
-            print(f"  -> {travel_result['duration_text']} ({travel_result['duration_minutes']} min)")
-
-            updated_count += 1
-
-            # Rate limiting - be nice to the API
-            time.sleep(0.2)
-
         except Exception as e:
             print(f"  Error: {e}", file=sys.stderr)
             continue
 
+        for row, travel_result in zip(batch, travel_results):
+            key = _checkpoint_key(row)
+            if travel_result is None:
+                print(f"  {row['name']}: no route found", file=sys.stderr)
+                checkpoint.record(key, route_error='no route found')
+                continue
+            row['travel_time_minutes'] = travel_result['duration_minutes']
+            checkpoint.record(key, travel_time_minutes=row['travel_time_minutes'])
+            save_progress(row)
+            print(f"  {row['name']} -> {travel_result['duration_text']} ({travel_result['duration_minutes']} min)")
+
     # Write back
-    with open(filepath, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    export()
+    checkpoint.clear()
 
-    print(f"\nUpdated {updated_count} restaurants in {filename}")
+    print(f"\nUpdated {len(updated)} restaurants in {filename}")
     return True
 
 
@@ -190,32 +411,27 @@ def generate_map_html(list_type: str, category: str, output_path: str, home_coor
     """
     Generate an interactive HTML map of restaurants using Leaflet.
     """
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(script_dir, '..', 'data')
-
-    list_prefix = 'places_to_try' if list_type == 'try' else 'places_we_love'
-    filename = f"{list_prefix}_{category}.csv"
-    filepath = os.path.join(data_dir, filename)
+    store = RestaurantStore()
+    list_prefix = LIST_PREFIXES[list_type]
+    filepath = store.csv_path(list_type, category)
 
     if not os.path.exists(filepath):
         print(f"Error: File not found: {filepath}", file=sys.stderr)
         return False
 
     # Read restaurant data
-    restaurants = []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row.get('latitude') and row.get('longitude'):
-                restaurants.append({
-                    'name': row['name'],
-                    'location': row.get('location', ''),
-                    'cuisine': row.get('cuisine', ''),
-                    'lat': float(row['latitude']),
-                    'lng': float(row['longitude']),
-                    'travel_time': row.get('travel_time_minutes', ''),
-                    'venue_id': row.get('venue_id', '')
-                })
+    restaurants = [
+        {
+            'name': row['name'],
+            'location': row['location'],
+            'cuisine': row['cuisine'],
+            'lat': row['latitude'],
+            'lng': row['longitude'],
+            'travel_time': '' if row['travel_time_minutes'] is None else row['travel_time_minutes'],
+            'venue_id': row['venue_id'] or ''
+        }
+        for row in store.select(list_type, category, with_coords=True)
+    ]
 
     if not restaurants:
         print("No restaurants with coordinates found", file=sys.stderr)
@@ -310,6 +526,179 @@ def generate_map_html(list_type: str, category: str, output_path: str, home_coor
     return True
 
 
+def build_map_data(list_type: str = None, category: str = None, data_dir: str = None) -> dict:
+    """
+    Compact marker data for every list and category (or just the given ones).
+
+    Venues are stored once as positional rows (field names listed once in
+    "fields"), and each "list/category" layer is a list of row indices, so a
+    venue on several lists costs one row.
+    """
+    store = RestaurantStore(data_dir)
+    venues, layers, index_of = [], {}, {}
+    for row in store.select(list_type, category, with_coords=True):
+        key = row['venue_id'] or normalize_name(row['name'])
+        if key not in index_of:
+            index_of[key] = len(venues)
+            venues.append([
+                row['name'], row['location'], row['cuisine'],
+                round(row['latitude'], MAP_COORD_DECIMALS), round(row['longitude'], MAP_COORD_DECIMALS),
+                row['travel_time_minutes'], row['venue_id'] or None,
+            ])
+        layer = layers.setdefault(f"{row['list_type']}/{row['category']}", [])
+        if index_of[key] not in layer:
+            layer.append(index_of[key])
+    return {'fields': MAP_FIELDS, 'venues': venues, 'layers': layers}
+
+
+def generate_map_layers(output_path: str, home_coords: dict = None, list_type: str = None,
+                        category: str = None, compress: bool = False):
+    """
+    Generate a clustered HTML map with one toggleable layer per list/category.
+
+    Marker data goes to a separate file next to the page (<name>.data.json,
+    or gzipped <name>.data.json.gz with compress), which the page fetches
+    and clusters in chunks, so it stays light with thousands of venues. The
+    page must be served over HTTP for the fetch to work.
+    """
+    data = build_map_data(list_type, category)
+    if not data['venues']:
+        print("No restaurants with coordinates found", file=sys.stderr)
+        return False
+
+    stem = os.path.splitext(output_path)[0]
+    data_path = f"{stem}.data.json{'.gz' if compress else ''}"
+    payload = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    if compress:
+        payload = gzip.compress(payload, compresslevel=9, mtime=0)
+    atomic_write_bytes(data_path, payload)
+
+    title = ' + '.join(
+        [LIST_PREFIXES[list_type]] if list_type else LIST_PREFIXES.values()
+    ) + (f" {category}" if category else '')
+    avg_lat = sum(v[3] for v in data['venues']) / len(data['venues'])
+    avg_lng = sum(v[4] for v in data['venues']) / len(data['venues'])
+    data_url = json.dumps(os.path.basename(data_path))
+    home_json = json.dumps(home_coords) if home_coords else 'null'
+
+    html_content = f'''<!DOCTYPE html>
+<html>
+<head>
+    <title>Restaurant Map - {title}</title>
+    <meta charset="utf-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
+    <link rel="stylesheet" href="https://unpkg.com/leaflet.markercluster@1.5.3/dist/MarkerCluster.css" />
+    <link rel="stylesheet" href="https://unpkg.com/leaflet.markercluster@1.5.3/dist/MarkerCluster.Default.css" />
+    <style>
+        body {{ margin: 0; padding: 0; }}
+        #map {{ width: 100%; height: 100vh; }}
+        #status {{ position: absolute; top: 10px; left: 60px; z-index: 1000; background: white;
+                   padding: 4px 8px; border-radius: 4px; font: 13px sans-serif; }}
+        .restaurant-popup {{ min-width: 200px; }}
+        .restaurant-popup h3 {{ margin: 0 0 8px 0; color: #333; }}
+        .restaurant-popup p {{ margin: 4px 0; color: #666; font-size: 14px; }}
+        .restaurant-popup a {{ color: #e74c3c; text-decoration: none; }}
+        .restaurant-popup a:hover {{ text-decoration: underline; }}
+    </style>
+</head>
+<body>
+    <div id="map"></div>
+    <div id="status">Loading restaurants…</div>
+    <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
+    <script src="https://unpkg.com/leaflet.markercluster@1.5.3/dist/leaflet.markercluster.js"></script>
+    <script>
+        const dataUrl = {data_url};
+        const home = {home_json};
+        const statusBox = document.getElementById('status');
+
+        const map = L.map('map').setView([{avg_lat}, {avg_lng}], 12);
+        L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{
+            attribution: '© OpenStreetMap contributors'
+        }}).addTo(map);
+
+        if (home) {{
+            const homeIcon = L.divIcon({{
+                html: '<div style="background:#3498db;color:white;border-radius:50%;width:30px;height:30px;display:flex;align-items:center;justify-content:center;font-size:16px;border:2px solid white;box-shadow:0 2px 5px rgba(0,0,0,0.3);">🏠</div>',
+                className: '',
+                iconSize: [30, 30],
+                iconAnchor: [15, 15]
+            }});
+            L.marker([home.lat, home.lng], {{icon: homeIcon}})
+                .addTo(map)
+                .bindPopup('<b>Home</b>');
+        }}
+
+        // The data file may be gzipped; decompress it here unless the
+        // server already did (gzip files start with 0x1f 0x8b)
+        async function loadData(url) {{
+            const response = await fetch(url);
+            if (!response.ok) throw new Error(`${{url}}: HTTP ${{response.status}}`);
+            const bytes = new Uint8Array(await response.arrayBuffer());
+            if (bytes[0] === 0x1f && bytes[1] === 0x8b) {{
+                const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+                return JSON.parse(await new Response(stream).text());
+            }}
+            return JSON.parse(new TextDecoder().decode(bytes));
+        }}
+
+        const escapeHtml = text => String(text ?? '').replace(/[&<>"']/g, c => (
+            {{'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}}[c]
+        ));
+
+        // Popups are only built when opened
+        function popupContent(v) {{
+            const travelInfo = v.travel_time != null ? `<p>🚇 ${{v.travel_time}} min from home</p>` : '';
+            const bookLink = v.venue_id ? `<p><a href="https://resy.com/cities/ny/venues/${{encodeURIComponent(v.venue_id)}}" target="_blank">Book on Resy →</a></p>` : '';
+            return `
+                <div class="restaurant-popup">
+                    <h3>${{escapeHtml(v.name)}}</h3>
+                    <p>📍 ${{escapeHtml(v.location)}}</p>
+                    <p>🍽️ ${{escapeHtml(v.cuisine)}}</p>
+                    ${{travelInfo}}
+                    ${{bookLink}}
+                </div>
+            `;
+        }}
+
+        loadData(dataUrl).then(data => {{
+            const venues = data.venues.map(row => Object.fromEntries(
+                data.fields.map((field, i) => [field, row[i]])
+            ));
+            const overlays = {{}};
+            for (const [label, indices] of Object.entries(data.layers)) {{
+                const cluster = L.markerClusterGroup({{ chunkedLoading: true }});
+                cluster.addLayers(indices.map(i => {{
+                    const v = venues[i];
+                    return L.marker([v.lat, v.lng], {{ title: v.name }}).bindPopup(() => popupContent(v));
+                }}));
+                cluster.addTo(map);
+                overlays[`${{label}} (${{indices.length}})`] = cluster;
+            }}
+            L.control.layers(null, overlays, {{ collapsed: false }}).addTo(map);
+
+            const bounds = L.latLngBounds(venues.map(v => [v.lat, v.lng]));
+            if (home) bounds.extend([home.lat, home.lng]);
+            map.fitBounds(bounds, {{ padding: [50, 50] }});
+            statusBox.remove();
+        }}).catch(error => {{
+            statusBox.textContent = `Could not load restaurants: ${{error.message}}`;
+        }});
+    </script>
+</body>
+</html>'''
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+
+    print(f"Map generated: {output_path}")
+    print(f"Marker data: {data_path} ({len(payload) / 1024:.1f} KB)")
+    print(f"Restaurants mapped: {len(data['venues'])} in {len(data['layers'])} layers")
+    print(f"Serve the folder over HTTP to view it, e.g. "
+          f"python3 -m http.server -d {os.path.dirname(os.path.abspath(output_path))}")
+    return True
+
+
 def main():
     parser = argparse.ArgumentParser(description='Google Maps utilities')
     subparsers = parser.add_subparsers(dest='command', help='Command')
@@ -317,6 +706,16 @@ def main():
     # Geocode command
     geo_parser = subparsers.add_parser('geocode', help='Geocode an address')
     geo_parser.add_argument('address', help='Address to geocode')
+    geo_parser.add_argument('--no-cache', action='store_true',
+                            help='Skip the local geocode cache')
+
+    # Invalidate geocode cache command
+    invalidate_parser = subparsers.add_parser('invalidate-geocode',
+                                              help='Remove cached geocode results')
+    invalidate_parser.add_argument('query', nargs='?', default=None,
+                                   help='Query to forget (e.g. "Mono Mono, Bowery, New York, NY")')
+    invalidate_parser.add_argument('--all', action='store_true',
+                                   help='Clear the whole geocode cache')
 
     # Travel time command
     travel_parser = subparsers.add_parser('travel-time', help='Get travel time from home')
@@ -332,20 +731,36 @@ def main():
     update_parser.add_argument('--category',
                                choices=['dinner', 'brunch', 'lunch', 'drinks'],
                                required=True)
+    update_parser.add_argument('--resume', action='store_true',
+                               help='Continue an interrupted update from its checkpoint')
 
     # Generate map command
     map_parser = subparsers.add_parser('generate-map',
                                        help='Generate interactive HTML map of restaurants')
-    map_parser.add_argument('--list', choices=['try', 'love'], required=True,
-                            dest='list_type')
+    map_parser.add_argument('--list', choices=['try', 'love', 'all'], required=True,
+                            dest='list_type',
+                            help='"all" maps every list as toggleable, clustered layers')
     map_parser.add_argument('--category',
-                            choices=['dinner', 'brunch', 'lunch', 'drinks'],
+                            choices=['dinner', 'brunch', 'lunch', 'drinks', 'all'],
                             required=True)
     map_parser.add_argument('--output', '-o', default=None,
                             help='Output HTML file path (default: restaurants_map.html)')
+    map_parser.add_argument('--layers', action='store_true',
+                            help='Clustered layered map with a separate data file (implied by "all")')
+    map_parser.add_argument('--compress', action='store_true',
+                            help='Gzip the layered map\'s data file')
 
     args = parser.parse_args()
 
+    # Cache maintenance needs no API key
+    if args.command == 'invalidate-geocode':
+        if not args.query and not args.all:
+            invalidate_parser.error('give a query or --all')
+        key = None if args.all else normalize_geocode_query(args.query)
+        removed = get_geocode_cache().invalidate(key)
+        print(f"Removed {removed} cached geocode result(s)")
+        return
+
     try:
         api_key = load_maps_credentials()
     except ValueError as e:
@@ -353,7 +768,7 @@ def main():
         sys.exit(1)
 
     if args.command == 'geocode':
-        result = geocode(args.address, api_key)
+        result = geocode(args.address, api_key, use_cache=not args.no_cache)
         print(json.dumps(result, indent=2))
 
     elif args.command == 'travel-time':
@@ -363,7 +778,8 @@ def main():
 
     elif args.command == 'update-restaurants':
         home = get_home_address()
-        update_restaurant_csv(args.list_type, args.category, api_key, home)
+        update_restaurant_csv(args.list_type, args.category, api_key, home,
+                              resume=args.resume)
 
     elif args.command == 'generate-map':
         # Get home coordinates for the map
@@ -376,7 +792,15 @@ def main():
             script_dir = os.path.dirname(os.path.abspath(__file__))
             output_path = os.path.join(script_dir, '..', 'restaurants_map.html')
 
-        generate_map_html(args.list_type, args.category, output_path, home_coords)
+        if args.layers or args.compress or 'all' in (args.list_type, args.category):
+            generate_map_layers(
+                output_path, home_coords,
+                None if args.list_type == 'all' else args.list_type,
+                None if args.category == 'all' else args.category,
+                compress=args.compress
+            )
+        else:
+            generate_map_html(args.list_type, args.category, output_path, home_coords)
 
     else:
         parser.print_help()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Find the best place for a group to meet: the venues with a slot that
+minimize the worst (or total) travel time from everyone's starting point.
+
+Venues are visited best-first by a geometric lower bound: no trip can be
+faster than a small fixed overhead plus the straight-line distance at the
+mode's top speed. Each batch is checked for availability, and only venues
+with a slot get real travel times from the travel matrix (Distance Matrix
+calls covering every origin at once, for cells not yet known). The search
+stops as soon as the next venue's lower bound can't beat the current top
+results, so most of a large list costs no API calls at all.
+
+Usage:
+  python3 meeting_point.py --origin home --origin office --origin "Astoria, NY" --date friday
+  python3 meeting_point.py --origin home --origin "40.75,-73.99" --objective sum --top 3
+"""
+
+import argparse
+import sys
+
+from check_availability import filter_time_slots, load_cross_list, run_checks
+from maps_client import load_maps_credentials
+from resy_client import ResyChecker, STATUS_ERROR, load_resy_credentials, parse_date_query
+from spatial_index import resolve_location
+from travel_estimate import TravelModel, haversine_many
+from travel_matrix import MODES, TravelMatrix
+
+# Fastest plausible door-to-door speed per mode (km/h) and the least fixed
+# overhead of any trip (minutes: walking to a station, parking); both keep
+# the bound admissible
+TOP_SPEED_KMH = {'transit': 40, 'driving': 60, 'walking': 7, 'bicycling': 25}
+MIN_OVERHEAD_MINUTES = {'transit': 5, 'driving': 3, 'walking': 0, 'bicycling': 1}
+OBJECTIVES = ('minimax', 'sum')
+
+
+def combine(times: list, objective: str) -> float:
+    return max(times) if objective == 'minimax' else sum(times)
+
+
+def lower_bounds(origins: list, restaurants: list, mode: str, objective: str) -> list:
+    """Objective lower bound per restaurant, from straight-line distances"""
+    minutes_per_km = 60 / TOP_SPEED_KMH[mode]
+    overhead = MIN_OVERHEAD_MINUTES[mode]
+    lats = [r['latitude'] for r in restaurants]
+    lngs = [r['longitude'] for r in restaurants]
+    per_origin = [
+        [overhead + km * minutes_per_km for km in haversine_many(lat, lng, lats, lngs)]
+        for lat, lng in origins
+    ]
+    return [combine(list(times), objective) for times in zip(*per_origin)]
+
+
+class MeetingPointSearch:
+    def __init__(self, checker, matrix: TravelMatrix, origin_names: list, origin_coords: list,
+                 mode: str = 'transit', objective: str = 'minimax', maps_api_key: str = None,
+                 concurrency: int = 1):
+        """
+        Args:
+            checker: ResyChecker for availability
+            matrix: TravelMatrix with every origin registered
+            origin_names / origin_coords: Matrix origin names and their (lat, lng)
+            maps_api_key: Fills unknown matrix cells; without it, travel times
+                are estimated from distance
+        """
+        self.checker = checker
+        self.matrix = matrix
+        self.origin_names = origin_names
+        self.origin_coords = origin_coords
+        self.mode = mode
+        self.objective = objective
+        self.maps_api_key = maps_api_key
+        self.concurrency = concurrency
+        self.estimator = TravelModel.default(mode)
+        self.stats = {'considered': 0, 'checked': 0, 'pruned': 0}
+
+    def _travel_times(self, restaurants: list) -> list:
+        """Per-restaurant list of minutes from each origin (estimated if unknown)"""
+        if self.maps_api_key:
+            try:
+                self.matrix.fill_origins(self.origin_names, restaurants, self.mode, self.maps_api_key)
+            except Exception as e:
+                print(f"Note: travel times unavailable ({e})", file=sys.stderr)
+            self.matrix.save()
+
+        times = []
+        for restaurant in restaurants:
+            row, estimated = [], False
+            for name, (lat, lng) in zip(self.origin_names, self.origin_coords):
+                minutes = self.matrix.get(name, restaurant['venue_id'], self.mode)
+                if minutes is None:
+                    km = haversine_many(lat, lng, [restaurant['latitude']], [restaurant['longitude']])[0]
+                    minutes, estimated = self.estimator.minutes(km), True
+                row.append(minutes)
+            times.append((row, estimated))
+        return times
+
+    def search(self, restaurants: list, date: str, party_size: int, max_time: str,
+               top: int = 5, batch_size: int = 10) -> list:
+        """
+        Best `top` venues with a slot before max_time, best first:
+        [{"restaurant", "score", "times", "estimated", "slots"}, ...]
+        """
+        candidates = [
+            r for r in restaurants
+            if r.get('latitude') is not None and r.get('longitude') is not None
+        ]
+        bounds = lower_bounds(self.origin_coords, candidates, self.mode, self.objective)
+        order = sorted(zip(bounds, range(len(candidates))))
+        self.stats['considered'] = len(candidates)
+
+        best = []
+        position = 0
+        while position < len(order):
+            # Nothing left can beat the current top results
+            if len(best) >= top and order[position][0] >= best[top - 1]['score']:
+                break
+            batch = [candidates[index] for _, index in order[position:position + batch_size]]
+            position += len(batch)
+
+            jobs = [(restaurant, date, party_size) for restaurant in batch]
+            open_venues = []
+            for (restaurant, _, _), result in run_checks(self.checker, jobs, self.concurrency):
+                self.stats['checked'] += 1
+                if result.get('status') == STATUS_ERROR or not result['available']:
+                    continue
+                slots = filter_time_slots(result['slots'], max_time)
+                if slots:
+                    open_venues.append((restaurant, slots))
+
+            travel = self._travel_times([restaurant for restaurant, _ in open_venues])
+            for (restaurant, slots), (times, estimated) in zip(open_venues, travel):
+                best.append({
+                    'restaurant': restaurant,
+                    'score': combine(times, self.objective),
+                    'times': times,
+                    'estimated': estimated,
+                    'slots': slots,
+                })
+            best.sort(key=lambda entry: entry['score'])
+            del best[top:]
+
+        self.stats['pruned'] = len(order) - position
+        return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Rank venues with a slot by travel time for a whole group',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--origin', action='append', required=True,
+                        help='Starting point: matrix origin name, address or "lat,lng" (repeat per person)')
+    parser.add_argument('--date', default='tomorrow',
+                        help='Date in natural language (tomorrow, next tuesday) or YYYY-MM-DD')
+    parser.add_argument('--party-size', type=int, default=None,
+                        help='Party size (default: number of origins)')
+    parser.add_argument('--list', choices=['try', 'love', 'all'], default='all')
+    parser.add_argument('--category', choices=['dinner', 'brunch', 'lunch', 'drinks', 'all'],
+                        default='dinner')
+    parser.add_argument('--mode', choices=MODES, default='transit')
+    parser.add_argument('--objective', choices=OBJECTIVES, default='minimax',
+                        help='minimax: shortest longest trip; sum: least total travel (default: minimax)')
+    parser.add_argument('--top', type=int, default=5, help='Number of venues to show (default: 5)')
+    parser.add_argument('--max-time', default='20:30',
+                        help='Ignore slots after this (HH:MM, default: 20:30)')
+    parser.add_argument('--restaurants-dir', default=None)
+    parser.add_argument('--concurrency', type=int, default=4)
+    args = parser.parse_args()
+
+    if len(args.origin) < 2:
+        parser.error('give at least two --origin values')
+    if args.top < 1 or args.concurrency < 1:
+        parser.error('--top and --concurrency must be at least 1')
+
+    try:
+        api_key, auth_token = load_resy_credentials()
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    try:
+        maps_api_key = load_maps_credentials()
+    except ValueError:
+        maps_api_key = None
+        print("Note: no GOOGLE_MAPS_API_KEY; ranking on estimated travel times", file=sys.stderr)
+
+    matrix = TravelMatrix()
+    origin_coords = []
+    for origin in args.origin:
+        try:
+            matrix.use_origin(origin)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        try:
+            origin_coords.append(resolve_location(matrix.origins[origin]))
+        except Exception as e:
+            print(f"Error locating '{origin}': {e}")
+            sys.exit(1)
+
+    restaurants = load_cross_list(
+        args.restaurants_dir,
+        None if args.list == 'all' else args.list,
+        None if args.category == 'all' else args.category
+    )
+    date = parse_date_query(args.date)
+    party_size = args.party_size or len(args.origin)
+
+    checker = ResyChecker(api_key, auth_token, pool_size=args.concurrency)
+    search = MeetingPointSearch(
+        checker, matrix, args.origin, origin_coords, mode=args.mode,
+        objective=args.objective, maps_api_key=maps_api_key, concurrency=args.concurrency
+    )
+    best = search.search(restaurants, date, party_size, args.max_time, top=args.top)
+
+    print(f"📍 Meeting points for {party_size} on {date} ({args.mode}, {args.objective})")
+    print("=" * 60)
+    if not best:
+        print("❌ No venue with a slot found")
+    for rank, entry in enumerate(best, 1):
+        restaurant = entry['restaurant']
+        approx = '~' if entry['estimated'] else ''
+        legs = ', '.join(f"{name} {approx}{minutes}m" for name, minutes in zip(args.origin, entry['times']))
+        print(f"{rank}. {restaurant['name']} ({restaurant['location']}) - "
+              f"{args.objective} {approx}{entry['score']} min")
+        print(f"   {legs}")
+        print(f"   Times: {', '.join(slot['time'] for slot in entry['slots'])}")
+    print("=" * 60)
+    stats = search.stats
+    print(f"Checked {stats['checked']}/{stats['considered']} venues "
+          f"({stats['pruned']} ruled out by distance alone)")
+
+
+if __name__ == "__main__":
+    main()
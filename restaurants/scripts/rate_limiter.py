@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Shared per-host rate limiting for outgoing API calls.
+
+Each host gets a token bucket whose refill rate adapts to the responses
+it sees: a 429 or 5xx halves the rate and pauses the host (for the
+Retry-After interval when the server sends one), and a run of healthy
+responses ramps the rate back up towards its ceiling. All Resy and
+Google Maps calls go through `default_limiter`, so every script shares
+one budget per host.
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Per-host budgets: starting rate, floor and ceiling in requests/second,
+# plus burst size
+DEFAULT_HOST_BUDGETS = {
+    'api.resy.com': {'rate': 5.0, 'min_rate': 0.5, 'max_rate': 10.0, 'burst': 5},
+    'maps.googleapis.com': {'rate': 20.0, 'min_rate': 1.0, 'max_rate': 40.0, 'burst': 20},
+}
+
+# Healthy responses needed before the rate is nudged back up
+RECOVER_AFTER = 10
+# Pause applied on a 429 without a Retry-After header, in seconds
+DEFAULT_THROTTLE_PAUSE = 1.0
+# Longest Retry-After we are willing to honor, in seconds
+MAX_RETRY_AFTER = 120.0
+
+
+def parse_retry_after(value) -> float:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds, or None"""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def is_throttle_status(status_code: int) -> bool:
+    """True for responses that mean the host wants us to slow down"""
+    return status_code == 429 or status_code >= 500
+
+
+class TokenBucket:
+    def __init__(self, rate: float, min_rate: float, max_rate: float, burst: int):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._healthy_streak = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token if one is free; otherwise return how long to wait before retrying"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            wait = self.reserve()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait on the event loop until a request may be sent"""
+        while True:
+            wait = self.reserve()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def record(self, status_code: int, retry_after: float = None):
+        """Adapt the rate to a response status"""
+        with self._lock:
+            if is_throttle_status(status_code):
+                self._healthy_streak = 0
+                self.rate = max(self.min_rate, self.rate / 2)
+                pause = retry_after
+                if pause is None and status_code == 429:
+                    pause = DEFAULT_THROTTLE_PAUSE
+                if pause:
+                    self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+                    self.tokens = 0.0
+            else:
+                self._healthy_streak += 1
+                if self._healthy_streak >= RECOVER_AFTER:
+                    self._healthy_streak = 0
+                    self.rate = min(self.max_rate, self.rate * 1.25)
+
+
+class RateLimiter:
+    def __init__(self, host_budgets: dict = None):
+        self.host_budgets = DEFAULT_HOST_BUDGETS if host_budgets is None else host_budgets
+        self._buckets = {
+            host: TokenBucket(**budget) for host, budget in self.host_budgets.items()
+        }
+
+    def bucket_for(self, url: str):
+        """Token bucket for the URL's host, or None if the host is not limited"""
+        return self._buckets.get(urlparse(url).hostname)
+
+    def acquire(self, url: str):
+        bucket = self.bucket_for(url)
+        if bucket is not None:
+            bucket.acquire()
+
+    async def acquire_async(self, url: str):
+        bucket = self.bucket_for(url)
+        if bucket is not None:
+            await bucket.acquire_async()
+
+    def record(self, url: str, status_code: int, headers=None):
+        """Feed a response back into the host's budget"""
+        bucket = self.bucket_for(url)
+        if bucket is not None:
+            retry_after = parse_retry_after((headers or {}).get('Retry-After'))
+            bucket.record(status_code, retry_after)
+
+    def request(self, session, method: str, url: str, max_throttle_retries: int = 2, **kwargs):
+        """
+        Send a request through the host's budget.
+
+        `session` is a requests.Session or the requests module itself. A 429
+        was not processed by the server, so it is retried (after the pause
+        it triggered) up to max_throttle_retries times. Callers with their
+        own retry loop pass max_throttle_retries=0 so 429s are only retried
+        in one place.
+        """
+        for attempt in range(max_throttle_retries + 1):
+            self.acquire(url)
+            response = session.request(method, url, **kwargs)
+            self.record(url, response.status_code, response.headers)
+            if response.status_code != 429:
+                break
+        return response
+
+    async def request_async(self, client, method: str, url: str,
+                            max_throttle_retries: int = 2, **kwargs):
+        """Async counterpart of request() for an httpx.AsyncClient"""
+        for attempt in range(max_throttle_retries + 1):
+            await self.acquire_async(url)
+            response = await client.request(method, url, **kwargs)
+            self.record(url, response.status_code, response.headers)
+            if response.status_code != 429:
+                break
+        return response
+
+
+default_limiter = RateLimiter()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Learn when venues release new inventory and time polling around it.
+
+Many venues drop a whole day's slots at a fixed time of day, N days
+ahead. Every slot the watcher sees open is recorded with the time it
+was first seen; per venue, the days' biggest bursts of new slots reveal
+the release time and lead. Once a venue's cadence is consistent, the
+scheduler polls it rapidly in a short window around the predicted drop
+and backs off to the slowest interval the rest of the time.
+
+Usage:
+  python3 release_schedule.py show
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+DEFAULT_SCHEDULE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'release_schedule.sqlite'
+)
+
+# Release times are matched to this resolution, in minutes
+BUCKET_MINUTES = 5
+# A burst needs at least this many new slots in one bucket to count as a release
+MIN_BURST_SLOTS = 3
+# Days with a burst needed before predicting, and how many must agree
+MIN_RELEASE_DAYS = 2
+MIN_CONFIDENCE = 0.6
+# Poll window around a predicted release, in seconds
+WINDOW_BEFORE = 60
+WINDOW_AFTER = 180
+# Poll interval inside that window, in seconds; deliberately below the
+# watcher's normal minimum, since the drop is the one moment speed matters
+FAST_INTERVAL = 5
+
+
+class ReleaseSchedule:
+    def __init__(self, path: str = None):
+        self.path = path or DEFAULT_SCHEDULE_PATH
+        self._lock = threading.Lock()
+        self._predictions = {}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS sightings ('
+                ' venue_id TEXT NOT NULL,'
+                ' date TEXT NOT NULL,'
+                ' party_size INTEGER NOT NULL,'
+                ' slot TEXT NOT NULL,'
+                ' first_seen TEXT NOT NULL,'
+                ' PRIMARY KEY (venue_id, date, party_size, slot))'
+            )
+
+    def record_opened(self, venue_id: str, date: str, party_size: int, slot: str,
+                      seen_at: datetime = None):
+        """Record the first time a slot was seen open (later sightings are ignored)"""
+        seen_at = seen_at or datetime.now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR IGNORE INTO sightings (venue_id, date, party_size, slot, first_seen)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                (venue_id, date, party_size, slot, seen_at.isoformat(timespec='seconds'))
+            )
+        self._predictions.pop(venue_id, None)
+
+    def infer(self, venue_id: str):
+        """
+        Infer a venue's release cadence.
+
+        Returns {"release_time": "HH:MM", "lead_days": int, "confidence": float,
+        "days": int} or None if there is not enough consistent evidence.
+        """
+        if venue_id in self._predictions:
+            return self._predictions[venue_id]
+
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT date, first_seen FROM sightings WHERE venue_id = ?', (venue_id,)
+            ).fetchall()
+
+        # For each day we saw new slots, find the bucket with the biggest burst
+        by_day = defaultdict(list)
+        for date, first_seen in rows:
+            seen = datetime.fromisoformat(first_seen)
+            by_day[seen.date()].append((seen, datetime.strptime(date, '%Y-%m-%d').date()))
+
+        bursts = []
+        for day, sightings in by_day.items():
+            buckets = defaultdict(list)
+            for seen, slot_date in sightings:
+                minute = seen.hour * 60 + seen.minute
+                buckets[minute - minute % BUCKET_MINUTES].append((seen, slot_date))
+            bucket, members = max(buckets.items(), key=lambda item: len(item[1]))
+            if len(members) >= MIN_BURST_SLOTS:
+                leads = Counter((slot_date - day).days for _, slot_date in members)
+                bursts.append((bucket, leads.most_common(1)[0][0]))
+
+        prediction = None
+        if len(bursts) >= MIN_RELEASE_DAYS:
+            (bucket, lead_days), count = Counter(bursts).most_common(1)[0]
+            confidence = count / len(bursts)
+            if count >= MIN_RELEASE_DAYS and confidence >= MIN_CONFIDENCE:
+                prediction = {
+                    'release_time': f"{bucket // 60:02d}:{bucket % 60:02d}",
+                    'lead_days': lead_days,
+                    'confidence': round(confidence, 2),
+                    'days': len(bursts),
+                }
+
+        self._predictions[venue_id] = prediction
+        return prediction
+
+    def next_release(self, venue_id: str, now: datetime = None):
+        """Start of the next predicted release window's bucket, or None"""
+        prediction = self.infer(venue_id)
+        if prediction is None:
+            return None
+        now = now or datetime.now()
+        hour, minute = map(int, prediction['release_time'].split(':'))
+        release = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        # Still inside today's window counts as "next"
+        if release + timedelta(minutes=BUCKET_MINUTES, seconds=WINDOW_AFTER) < now:
+            release += timedelta(days=1)
+        return release
+
+    def interval_for(self, venue_id: str, max_interval: float,
+                     fast_interval: float = FAST_INTERVAL, now: datetime = None):
+        """
+        Poll interval for a venue with a learned cadence, or None to fall back
+        to the caller's own schedule.
+
+        Inside the window around the predicted drop this is fast_interval,
+        which may be below the caller's usual minimum; elsewhere it is
+        max_interval, shortened so the next poll lands at the start of the
+        window.
+        """
+        now = now or datetime.now()
+        release = self.next_release(venue_id, now)
+        if release is None:
+            return None
+
+        window_start = release - timedelta(seconds=WINDOW_BEFORE)
+        window_end = release + timedelta(minutes=BUCKET_MINUTES, seconds=WINDOW_AFTER)
+        if window_start <= now <= window_end:
+            return fast_interval
+        until_window = (window_start - now).total_seconds()
+        return max(fast_interval, min(max_interval, until_window))
+
+    def venues(self) -> list:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                'SELECT DISTINCT venue_id FROM sightings ORDER BY venue_id'
+            )]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect learned slot release schedules')
+    parser.add_argument('command', choices=['show'])
+    parser.add_argument('--path', default=DEFAULT_SCHEDULE_PATH,
+                        help='Release schedule database')
+    args = parser.parse_args()
+
+    schedule = ReleaseSchedule(args.path)
+    for venue_id in schedule.venues():
+        prediction = schedule.infer(venue_id)
+        if prediction:
+            print(f"{venue_id}: releases ~{prediction['release_time']}, "
+                  f"{prediction['lead_days']} days out "
+                  f"(confidence {prediction['confidence']:.0%} over {prediction['days']} days)")
+        else:
+            print(f"{venue_id}: no consistent release pattern yet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache for API responses, backed by SQLite.
+
+Entries are JSON values keyed by a string and stamped with the time they
+were stored. Reads ignore entries older than the allowed age, and the
+table is trimmed to a maximum number of entries (oldest first) so the
+file stays bounded. The database is shared safely between threads and
+between concurrently running scripts.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'cache.sqlite'
+)
+
+# How many writes between eviction passes
+EVICT_EVERY = 100
+
+
+class ResponseCache:
+    def __init__(self, path: str = None, table: str = 'responses',
+                 ttl: float = 300, max_entries: int = 10000):
+        """
+        Args:
+            path: SQLite file (default: restaurants/.cache/cache.sqlite)
+            table: Table name, so several caches can share one file
+            ttl: Maximum age of a usable entry, in seconds; get() may ask for
+                less but never more, since eviction drops anything older
+            max_entries: Entries kept after eviction (oldest dropped first)
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table}")
+
+        self.path = path or DEFAULT_CACHE_PATH
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} ('
+                ' key TEXT PRIMARY KEY,'
+                ' value TEXT NOT NULL,'
+                ' stored_at REAL NOT NULL)'
+            )
+            self._conn.execute(
+                f'CREATE INDEX IF NOT EXISTS {table}_stored_at ON {table} (stored_at)'
+            )
+
+    def get(self, key: str, max_age: float = None) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or older than max_age (capped at ttl)"""
+        max_age = self.ttl if max_age is None else min(max_age, self.ttl)
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT value, stored_at FROM {self.table} WHERE key = ?', (key,)
+            ).fetchone()
+
+        if row is None or time.time() - row[1] > max_age:
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value under key"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, stored_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value, separators=(',', ':')), time.time())
+            )
+            self._writes += 1
+            if self._writes % EVICT_EVERY == 0:
+                self._evict()
+
+    def invalidate(self, key: str = None) -> int:
+        """Drop one entry, or every entry when key is None. Returns rows removed."""
+        with self._lock, self._conn:
+            if key is None:
+                cursor = self._conn.execute(f'DELETE FROM {self.table}')
+            else:
+                cursor = self._conn.execute(
+                    f'DELETE FROM {self.table} WHERE key = ?', (key,)
+                )
+            return cursor.rowcount
+
+    def evict(self):
+        """Remove expired entries and trim the table to max_entries"""
+        with self._lock, self._conn:
+            self._evict()
+
+    def _evict(self):
+        self._conn.execute(
+            f'DELETE FROM {self.table} WHERE stored_at < ?', (time.time() - self.ttl,)
+        )
+        self._conn.execute(
+            f'DELETE FROM {self.table} WHERE key IN ('
+            f' SELECT key FROM {self.table} ORDER BY stored_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Indexed SQLite store over the places_*_*.csv restaurant lists.
+
+The CSV files stay the source of truth: each file is imported into one
+table (indexed on venue_id, name, list, category and coordinates) and
+re-imported automatically whenever its size or modification time
+changes. Writes go to both the table and the CSV, so the lists keep
+working with any tool that reads them directly.
+
+Usage:
+  python3 restaurant_store.py import            # (re)build the store from CSVs
+  python3 restaurant_store.py export            # rewrite CSVs from the store
+  python3 restaurant_store.py stats
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+
+from checkpoint import atomic_write_bytes
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+STORE_FILENAME = '.restaurants.sqlite'
+
+LIST_PREFIXES = {'try': 'places_to_try', 'love': 'places_we_love'}
+CATEGORIES = ['dinner', 'brunch', 'lunch', 'drinks']
+
+BASE_FIELDS = ['name', 'venue_id', 'location', 'cuisine', 'notes']
+LOCATION_FIELDS = ['latitude', 'longitude', 'travel_time_minutes']
+
+CSV_PATTERN = re.compile(r'^(places_to_try|places_we_love)_(\w+)\.csv$')
+
+
+def list_filename(list_type: str, category: str) -> str:
+    """CSV filename for a list ('try'/'love') and category"""
+    return f"{LIST_PREFIXES[list_type]}_{category}.csv"
+
+
+def parse_list_filename(filename: str):
+    """Map a CSV filename back to (list_type, category), or None"""
+    match = CSV_PATTERN.match(os.path.basename(filename))
+    if not match:
+        return None
+    prefix, category = match.groups()
+    list_type = next(key for key, value in LIST_PREFIXES.items() if value == prefix)
+    return list_type, category
+
+
+def normalize_name(name: str) -> str:
+    """Case- and whitespace-insensitive key for matching restaurant names"""
+    return re.sub(r'\s+', ' ', (name or '').strip().lower())
+
+
+def _to_float(value):
+    try:
+        return float(value) if value not in (None, '') else None
+    except ValueError:
+        return None
+
+
+def _to_int(value):
+    try:
+        return int(value) if value not in (None, '') else None
+    except ValueError:
+        return None
+
+
+def _format_number(value):
+    return '' if value is None else str(value)
+
+
+def detect_lineterminator(filepath: str) -> str:
+    """Line ending used by an existing file ('\\r\\n' or '\\n'), defaulting to csv's '\\r\\n'"""
+    try:
+        with open(filepath, 'rb') as f:
+            first_line = f.readline()
+    except FileNotFoundError:
+        return '\r\n'
+    return '\n' if first_line.endswith(b'\n') and not first_line.endswith(b'\r\n') else '\r\n'
+
+
+def atomic_write_csv(filepath: str, fieldnames: list, rows: list, lineterminator: str = None):
+    """Write a CSV atomically (see checkpoint.atomic_write_bytes)"""
+    lineterminator = lineterminator or detect_lineterminator(filepath)
+    buffer = io.StringIO(newline='')
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction='ignore',
+                            lineterminator=lineterminator)
+    writer.writeheader()
+    writer.writerows(rows)
+    atomic_write_bytes(filepath, buffer.getvalue().encode('utf-8'))
+
+
+class RestaurantStore:
+    def __init__(self, data_dir: str = None, path: str = None):
+        self.data_dir = os.path.abspath(data_dir or DEFAULT_DATA_DIR)
+        self.path = path or os.path.join(self.data_dir, STORE_FILENAME)
+        self._lock = threading.RLock()
+
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript('''
+                CREATE TABLE IF NOT EXISTS sources (
+                    filename TEXT PRIMARY KEY,
+                    list_type TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    fieldnames TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS restaurants (
+                    id INTEGER PRIMARY KEY,
+                    list_type TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    name_key TEXT NOT NULL,
+                    venue_id TEXT,
+                    location TEXT,
+                    cuisine TEXT,
+                    notes TEXT,
+                    latitude REAL,
+                    longitude REAL,
+                    travel_time_minutes INTEGER,
+                    extra TEXT
+                );
+                CREATE INDEX IF NOT EXISTS restaurants_list
+                    ON restaurants (list_type, category, position);
+                CREATE INDEX IF NOT EXISTS restaurants_category ON restaurants (category);
+                CREATE INDEX IF NOT EXISTS restaurants_venue_id ON restaurants (venue_id);
+                CREATE INDEX IF NOT EXISTS restaurants_name_key ON restaurants (name_key);
+                CREATE INDEX IF NOT EXISTS restaurants_coords
+                    ON restaurants (latitude, longitude);
+            ''')
+        self.refresh()
+
+    # -- CSV sync ---------------------------------------------------------
+
+    def csv_path(self, list_type: str, category: str) -> str:
+        return os.path.join(self.data_dir, list_filename(list_type, category))
+
+    def refresh(self):
+        """Re-import any CSV that changed on disk since it was last imported"""
+        with self._lock:
+            known = {
+                row['filename']: (row['mtime_ns'], row['size'])
+                for row in self._conn.execute('SELECT filename, mtime_ns, size FROM sources')
+            }
+            present = set()
+            for filename in sorted(os.listdir(self.data_dir)):
+                parsed = parse_list_filename(filename)
+                if not parsed:
+                    continue
+                present.add(filename)
+                stat = os.stat(os.path.join(self.data_dir, filename))
+                if known.get(filename) != (stat.st_mtime_ns, stat.st_size):
+                    self._import_file(*parsed)
+
+            with self._conn:
+                for filename in set(known) - present:
+                    list_type, category = parse_list_filename(filename)
+                    self._conn.execute(
+                        'DELETE FROM restaurants WHERE list_type = ? AND category = ?',
+                        (list_type, category)
+                    )
+                    self._conn.execute('DELETE FROM sources WHERE filename = ?', (filename,))
+
+    def import_csvs(self):
+        """Re-import every CSV list, regardless of modification time"""
+        with self._lock:
+            for filename in sorted(os.listdir(self.data_dir)):
+                parsed = parse_list_filename(filename)
+                if parsed:
+                    self._import_file(*parsed)
+
+    def _import_file(self, list_type: str, category: str):
+        filepath = self.csv_path(list_type, category)
+        with open(filepath, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            fieldnames = reader.fieldnames or list(BASE_FIELDS)
+            rows = list(reader)
+
+        with self._conn:
+            self._conn.execute(
+                'DELETE FROM restaurants WHERE list_type = ? AND category = ?',
+                (list_type, category)
+            )
+            self._conn.executemany(
+                'INSERT INTO restaurants (list_type, category, position, name, name_key,'
+                ' venue_id, location, cuisine, notes, latitude, longitude,'
+                ' travel_time_minutes, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [self._row_values(list_type, category, position, row)
+                 for position, row in enumerate(rows)]
+            )
+            self._record_source(list_type, category, fieldnames)
+
+    def _row_values(self, list_type, category, position, row):
+        extra = {
+            key: value for key, value in row.items()
+            if key not in BASE_FIELDS and key not in LOCATION_FIELDS and key is not None
+        }
+        return (
+            list_type, category, position,
+            row.get('name') or '',
+            normalize_name(row.get('name')),
+            row.get('venue_id') or None,
+            row.get('location') or '',
+            row.get('cuisine') or '',
+            row.get('notes') or '',
+            _to_float(row.get('latitude')),
+            _to_float(row.get('longitude')),
+            _to_int(row.get('travel_time_minutes')),
+            json.dumps(extra) if extra else None
+        )
+
+    def _record_source(self, list_type, category, fieldnames):
+        filename = list_filename(list_type, category)
+        stat = os.stat(os.path.join(self.data_dir, filename))
+        self._conn.execute(
+            'INSERT OR REPLACE INTO sources (filename, list_type, category, mtime_ns, size,'
+            ' fieldnames) VALUES (?, ?, ?, ?, ?, ?)',
+            (filename, list_type, category, stat.st_mtime_ns, stat.st_size,
+             json.dumps(fieldnames))
+        )
+
+    def fieldnames(self, list_type: str, category: str) -> list:
+        """CSV columns for a list, as last imported or exported"""
+        row = self._conn.execute(
+            'SELECT fieldnames FROM sources WHERE filename = ?',
+            (list_filename(list_type, category),)
+        ).fetchone()
+        return json.loads(row['fieldnames']) if row else list(BASE_FIELDS)
+
+    def export_csv(self, list_type: str, category: str, fieldnames: list = None):
+        """Rewrite one list's CSV from the store (atomically)"""
+        with self._lock:
+            fieldnames = list(fieldnames or self.fieldnames(list_type, category))
+            rows = [
+                self._csv_row(record)
+                for record in self.select(list_type, category, refresh=False)
+            ]
+            atomic_write_csv(self.csv_path(list_type, category), fieldnames, rows)
+            with self._conn:
+                self._record_source(list_type, category, fieldnames)
+
+    def export_csvs(self):
+        """Rewrite every CSV list from the store"""
+        with self._lock:
+            for row in self._conn.execute('SELECT list_type, category FROM sources').fetchall():
+                self.export_csv(row['list_type'], row['category'])
+
+    @staticmethod
+    def _csv_row(record: dict) -> dict:
+        row = {key: value for key, value in record.items() if key not in ('id', 'list_type', 'category')}
+        row['venue_id'] = record['venue_id'] or ''
+        for field in LOCATION_FIELDS:
+            row[field] = _format_number(record[field])
+        return row
+
+    # -- Queries ----------------------------------------------------------
+
+    @staticmethod
+    def _record(row) -> dict:
+        record = {
+            'id': row['id'],
+            'list_type': row['list_type'],
+            'category': row['category'],
+            'name': row['name'],
+            'venue_id': row['venue_id'],
+            'location': row['location'],
+            'cuisine': row['cuisine'],
+            'notes': row['notes'],
+            'latitude': row['latitude'],
+            'longitude': row['longitude'],
+            'travel_time_minutes': row['travel_time_minutes'],
+        }
+        if row['extra']:
+            record.update(json.loads(row['extra']))
+        return record
+
+    def select(self, list_type: str = None, category: str = None,
+               with_venue_id: bool = False, with_coords: bool = False,
+               refresh: bool = True) -> list:
+        """
+        Restaurants matching the filters, in list/category/file order.
+
+        list_type and category may be None to select across every list.
+        """
+        if refresh:
+            self.refresh()
+
+        clauses, params = [], []
+        if list_type:
+            clauses.append('list_type = ?')
+            params.append(list_type)
+        if category:
+            clauses.append('category = ?')
+            params.append(category)
+        if with_venue_id:
+            clauses.append("venue_id IS NOT NULL AND venue_id != ''")
+        if with_coords:
+            clauses.append('latitude IS NOT NULL AND longitude IS NOT NULL')
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT * FROM restaurants {where} ORDER BY list_type, category, position',
+                params
+            ).fetchall()
+        return [self._record(row) for row in rows]
+
+    def find(self, venue_id=None, name: str = None, list_type: str = None,
+             category: str = None) -> list:
+        """
+        Restaurants that are the same venue, across every list unless narrowed.
+
+        Rows match on venue_id; a name match (case/whitespace-insensitive)
+        also counts when either side has no venue_id. Both columns are
+        indexed, so this is a single indexed lookup.
+        """
+        self.refresh()
+
+        venue_id = str(venue_id) if venue_id else None
+        name_key = normalize_name(name) if name else None
+        if venue_id and name_key:
+            clauses = ["(venue_id = ? OR (name_key = ? AND (venue_id IS NULL OR venue_id = '')))"]
+            params = [venue_id, name_key]
+        elif venue_id:
+            clauses, params = ['venue_id = ?'], [venue_id]
+        elif name_key:
+            clauses, params = ['name_key = ?'], [name_key]
+        else:
+            return []
+        if list_type:
+            clauses.append('list_type = ?')
+            params.append(list_type)
+        if category:
+            clauses.append('category = ?')
+            params.append(category)
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM restaurants WHERE {' AND '.join(clauses)}"
+                ' ORDER BY list_type, category, position',
+                params
+            ).fetchall()
+        return [self._record(row) for row in rows]
+
+    # -- Writes -----------------------------------------------------------
+
+    def add(self, list_type: str, category: str, record: dict):
+        """Append a restaurant to a list (store and CSV)"""
+        self.refresh()
+        with self._lock:
+            filepath = self.csv_path(list_type, category)
+            fieldnames = self.fieldnames(list_type, category)
+            position = self._conn.execute(
+                'SELECT COALESCE(MAX(position) + 1, 0) FROM restaurants'
+                ' WHERE list_type = ? AND category = ?',
+                (list_type, category)
+            ).fetchone()[0]
+            row = {field: '' for field in fieldnames}
+            row.update({key: '' if value is None else str(value) for key, value in record.items()})
+
+            lineterminator = detect_lineterminator(filepath)
+            with open(filepath, 'rb') as f:
+                needs_newline = False
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    needs_newline = f.read(1) != b'\n'
+
+            with open(filepath, 'a', encoding='utf-8', newline='') as f:
+                if needs_newline:
+                    f.write(lineterminator)
+                writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore',
+                                        lineterminator=lineterminator)
+                writer.writerow(row)
+
+            with self._conn:
+                self._conn.execute(
+                    'INSERT INTO restaurants (list_type, category, position, name, name_key,'
+                    ' venue_id, location, cuisine, notes, latitude, longitude,'
+                    ' travel_time_minutes, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    self._row_values(list_type, category, position,
+                                     {key: row.get(key) for key in fieldnames})
+                )
+                self._record_source(list_type, category, fieldnames)
+
+    def update_location(self, restaurant_id: int, latitude=None, longitude=None,
+                        travel_time_minutes=None):
+        """Set coordinates and/or travel time for one restaurant (call export_csv to persist)"""
+        with self._lock, self._conn:
+            self._set_location(restaurant_id, latitude, longitude, travel_time_minutes)
+
+    def update_locations(self, list_type: str, category: str, updates: dict, fieldnames: list = None):
+        """
+        Apply {restaurant_id: {latitude, longitude, travel_time_minutes}} to
+        one list and rewrite its CSV. The store only keeps the updates once
+        the CSV is written, so it never holds data the CSV lacks.
+        """
+        with self._lock:
+            try:
+                for restaurant_id, location in updates.items():
+                    self._set_location(restaurant_id, **location)
+                self.export_csv(list_type, category, fieldnames)
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+    def _set_location(self, restaurant_id: int, latitude=None, longitude=None,
+                      travel_time_minutes=None):
+        updates = {
+            'latitude': _to_float(latitude),
+            'longitude': _to_float(longitude),
+            'travel_time_minutes': _to_int(travel_time_minutes),
+        }
+        updates = {key: value for key, value in updates.items() if value is not None}
+        if updates:
+            self._conn.execute(
+                f"UPDATE restaurants SET {', '.join(f'{key} = ?' for key in updates)} WHERE id = ?",
+                (*updates.values(), restaurant_id)
+            )
+
+    def stats(self) -> list:
+        """(list_type, category, count) for every list"""
+        self.refresh()
+        with self._lock:
+            return [
+                tuple(row) for row in self._conn.execute(
+                    'SELECT list_type, category, COUNT(*) FROM restaurants'
+                    ' GROUP BY list_type, category ORDER BY list_type, category'
+                )
+            ]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Restaurant store utilities')
+    parser.add_argument('command', choices=['import', 'export', 'stats'])
+    parser.add_argument('--restaurants-dir', default=DEFAULT_DATA_DIR,
+                        help='Directory containing restaurant CSV files')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.restaurants_dir):
+        print(f"Error: Directory not found: {args.restaurants_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    store = RestaurantStore(args.restaurants_dir)
+
+    if args.command == 'import':
+        store.import_csvs()
+        print(f"Imported lists into {store.path}")
+    elif args.command == 'export':
+        store.export_csvs()
+        print(f"Exported lists to {store.data_dir}")
+
+    for list_type, category, count in store.stats():
+        print(f"{list_filename(list_type, category)}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Low-latency Resy booking from a slot token.
+
+A slot's config token (from ResyChecker._parse_availability) is turned
+into a reservation in two calls: /3/details exchanges it for a book
+token, and /3/book commits it with the account's payment method. All
+the slow parts are done ahead of time by prepare(): the payment method
+id is fetched (and only that id is cached on disk), the request headers
+are built, and the keep-alive connection is opened, so a booking costs just
+those two round trips. Each stage is timed.
+
+Usage:
+  python3 resy_booking.py --venue-id 59569 --date tomorrow --party-size 2 --time 19:00
+  python3 resy_booking.py --venue-id 59569 --date tomorrow --time 19:00 --dry-run
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from resy_client import (
+    RESY_API_BASE,
+    ResyChecker,
+    build_resy_headers,
+    load_resy_credentials,
+    parse_date_query
+)
+from response_cache import ResponseCache
+
+# The payment method rarely changes; refetch daily
+PROFILE_CACHE_TTL = 24 * 3600
+BOOK_SOURCE_ID = 'resy.com-venue-details'
+
+STATUS_BOOKED = 'booked'
+STATUS_FAILED = 'failed'
+
+
+class ResyBooker:
+    def __init__(self, api_key: str, auth_token: str, base_url: str = RESY_API_BASE,
+                 timeout=(3.05, 10), cache: ResponseCache = None):
+        """
+        Args:
+            base_url: Resy API root (override to point at a local stand-in)
+            timeout: (connect, read) timeout per request, in seconds
+            cache: ResponseCache for the payment method id (default: shared cache file)
+        """
+        self.auth_token = auth_token
+        self.base_url = base_url
+        self.timeout = timeout
+        self.cache = cache if cache is not None else ResponseCache(
+            table='resy_profile', ttl=PROFILE_CACHE_TTL, max_entries=10
+        )
+        self.payment_method_id = None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update(build_resy_headers(api_key, auth_token))
+        self.session.headers['Origin'] = 'https://resy.com'
+
+    def prepare(self) -> Dict:
+        """
+        Do everything a booking needs except the booking itself: load the
+        payment method (from cache or /2/user) and open the connection.
+        Returns stage timings in milliseconds.
+        """
+        timings = {}
+        start = time.perf_counter()
+
+        account = self.auth_token[-16:]
+        cache_key = f"payment|{account}"
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            response = self.session.get(f"{self.base_url}/2/user", timeout=self.timeout)
+            response.raise_for_status()
+            cached = {'payment_method_id': _default_payment_method(response.json())}
+            if cached['payment_method_id'] is not None:
+                self.cache.set(cache_key, cached)
+        timings['profile_ms'] = _elapsed_ms(start)
+
+        self.payment_method_id = cached['payment_method_id']
+        if self.payment_method_id is None:
+            raise ValueError("No payment method on the Resy account")
+
+        # Make sure a warm connection is sitting in the pool
+        warm_start = time.perf_counter()
+        self.warm()
+        timings['warm_ms'] = _elapsed_ms(warm_start)
+        return timings
+
+    def warm(self):
+        """Open (or refresh) the keep-alive connection to the API host"""
+        try:
+            self.session.head(self.base_url, timeout=self.timeout)
+        except requests.RequestException:
+            # Warming is best effort; the booking will connect if needed
+            pass
+
+    def book(self, slot_token: str, date: str, party_size: int) -> Dict:
+        """
+        Book a slot from its config token.
+
+        Not retried: /3/book is not idempotent. Calls bypass the shared rate
+        limiter so a booking never queues behind availability polls.
+
+        Returns {"status": "booked"|"failed", "reservation_id", "resy_token",
+        "error", "timings": {"details_ms", "book_ms", "total_ms"}}
+        """
+        if self.payment_method_id is None:
+            self.prepare()
+
+        timings = {}
+        start = time.perf_counter()
+        result = {'status': STATUS_FAILED, 'timings': timings}
+
+        try:
+            response = self.session.post(
+                f"{self.base_url}/3/details",
+                json={'commit': 1, 'config_id': slot_token, 'day': date,
+                      'party_size': int(party_size)},
+                timeout=self.timeout
+            )
+            timings['details_ms'] = _elapsed_ms(start)
+            if response.status_code != 200:
+                result['error'] = f"details: HTTP {response.status_code}"
+                return result
+            book_token = response.json().get('book_token', {}).get('value')
+            if not book_token:
+                result['error'] = "details: no book token (slot gone?)"
+                return result
+
+            book_start = time.perf_counter()
+            response = self.session.post(
+                f"{self.base_url}/3/book",
+                data={
+                    'book_token': book_token,
+                    'struct_payment_method': json.dumps({'id': self.payment_method_id}),
+                    'source_id': BOOK_SOURCE_ID,
+                },
+                timeout=self.timeout
+            )
+            timings['book_ms'] = _elapsed_ms(book_start)
+            if response.status_code not in (200, 201):
+                result['error'] = f"book: HTTP {response.status_code}"
+                return result
+
+            data = response.json()
+            result.update({
+                'status': STATUS_BOOKED,
+                'reservation_id': data.get('reservation_id'),
+                'resy_token': data.get('resy_token'),
+            })
+            return result
+        except (requests.RequestException, ValueError) as e:
+            result['error'] = str(e)
+            return result
+        finally:
+            timings['total_ms'] = _elapsed_ms(start)
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def _default_payment_method(profile: Dict) -> Optional[int]:
+    methods = profile.get('payment_methods') or []
+    for method in methods:
+        if method.get('is_default'):
+            return method.get('id')
+    return methods[0].get('id') if methods else None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Book a Resy slot with minimal latency',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--venue-id', required=True)
+    parser.add_argument('--date', required=True,
+                        help='Date in natural language (tomorrow, next tuesday) or YYYY-MM-DD')
+    parser.add_argument('--party-size', type=int, default=2)
+    parser.add_argument('--time', required=True, help='Slot start time (HH:MM)')
+    parser.add_argument('--type', default=None, help='Seating type to require (e.g. "Dining Room")')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Find the slot and prepare, but do not book')
+    args = parser.parse_args()
+
+    try:
+        api_key, auth_token = load_resy_credentials()
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    date = parse_date_query(args.date)
+    booker = ResyBooker(api_key, auth_token)
+    try:
+        timings = booker.prepare()
+    except (requests.RequestException, ValueError) as e:
+        print(f"Error preparing booking: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Prepared in {timings}")
+
+    checker = ResyChecker(api_key, auth_token)
+    result = checker.check_availability(args.venue_id, date, args.party_size)
+    slot = next((
+        slot for slot in result.get('slots', [])
+        if slot['time'] == args.time and (args.type is None or slot['type'] == args.type)
+    ), None)
+    if slot is None:
+        print(f"No {args.time} slot available on {date}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.dry_run:
+        print(f"Found {slot['time']} ({slot['type']}); dry run, not booking")
+        return
+
+    booking = booker.book(slot['token'], date, args.party_size)
+    print(json.dumps(booking, indent=2))
+    sys.exit(0 if booking['status'] == STATUS_BOOKED else 1)
+
+
+if __name__ == "__main__":
+    main()
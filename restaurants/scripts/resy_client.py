@@ -1,11 +1,39 @@
 #!/usr/bin/env python3
+import asyncio
+import time
 import requests
+from requests.adapters import HTTPAdapter
 import os
 import re
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
 
+from rate_limiter import default_limiter
+from resilience import CircuitBreaker, backoff_delay
+from single_flight import AsyncSingleFlight, SingleFlight
+
+try:
+    import httpx
+except ImportError:  # Only needed for AsyncResyChecker
+    httpx = None
+
+RESY_API_BASE = "https://api.resy.com"
+RESY_FIND_URL = f"{RESY_API_BASE}/4/find"
+
+# (connect, read) timeouts for Resy calls, in seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+DEFAULT_MAX_RETRIES = 3
+
+# Venues per page, and most pages to fetch, for area searches
+AREA_PAGE_SIZE = 50
+AREA_MAX_PAGES = 5
+
+# Result statuses: a failed check is distinct from a venue that is full
+STATUS_AVAILABLE = "available"
+STATUS_UNAVAILABLE = "unavailable"
+STATUS_ERROR = "error"
+
 def load_resy_credentials():
     """Load Resy credentials from environment variables"""
     load_dotenv()
@@ -28,54 +56,137 @@ restaurants = [
     {"name": "Lilia", "location": "Williamsburg", "cuisine": "Italian", "venue_id": None},
 ]
 
-class ResyChecker:
-    def __init__(self, api_key: str = None, auth_token: str = None):
+def build_resy_headers(api_key: str, auth_token: str) -> Dict:
+    """Build the request headers Resy expects for authenticated calls"""
+    return {
+        'Authorization': f'ResyAPI api_key="{api_key}"',
+        'x-resy-auth-token': auth_token,
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+        'Accept': 'application/json, text/javascript, */*; q=0.01',
+        'Referer': 'https://resy.com/'
+    }
+
+def find_cache_key(venue_id: str, date: str, party_size: int) -> str:
+    """Cache key for a /4/find response"""
+    return f"{venue_id}|{date}|{party_size}"
+
+def error_result(message: str) -> Dict:
+    """Result for a check that could not be completed"""
+    return {"available": False, "status": STATUS_ERROR, "error": message}
+
+def is_retryable_status(status_code: int) -> bool:
+    """Transient HTTP failures worth retrying"""
+    return status_code == 429 or status_code >= 500
+
+def build_find_params(venue_id: str, date: str, party_size: int = 2) -> Dict:
+    """Build /4/find query parameters for a single venue"""
+    return {
+        "lat": "0",
+        "long": "0",
+        "day": date,
+        "party_size": str(party_size),
+        "venue_id": venue_id
+    }
+
+def build_area_params(lat: float, lng: float, date: str, party_size: int = 2,
+                      page: int = 1, per_page: int = AREA_PAGE_SIZE) -> Dict:
+    """Build /4/find query parameters for every venue around a point"""
+    return {
+        "lat": f"{lat:.5f}",
+        "long": f"{lng:.5f}",
+        "day": date,
+        "party_size": str(party_size),
+        "page": str(page),
+        "per_page": str(per_page)
+    }
+
+def area_cache_key(lat: float, lng: float, date: str, party_size: int, page: int) -> str:
+    """Cache key for one page of an area /4/find response"""
+    return f"area|{lat:.5f},{lng:.5f}|{date}|{party_size}|{page}"
+
+def venue_id_of(venue: Dict) -> Optional[str]:
+    """Resy venue id of a /4/find venue entry"""
+    venue_id = venue.get("venue", {}).get("id", {}).get("resy")
+    return str(venue_id) if venue_id is not None else None
+
+class _FindClient:
+    """
+    The /4/find flow shared by ResyChecker and AsyncResyChecker: caching,
+    circuit breaking, response handling, parsing and archiving. Subclasses
+    only supply the transport and the retry loop around it.
+    """
+
+    def __init__(self, api_key, auth_token, cache, max_age, limiter, max_retries,
+                 breaker, base_url, archive):
         self.api_key = api_key
         self.auth_token = auth_token
-        self.session = requests.Session()
-        
-        if api_key and auth_token:
-            self.session.headers.update({
-                'Authorization': f'ResyAPI api_key="{api_key}"',
-                'x-resy-auth-token': auth_token,
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-                'Accept': 'application/json, text/javascript, */*; q=0.01',
-                'Referer': 'https://resy.com/'
-            })
-    
-    def check_availability(self, venue_id: str, date: str, party_size: int = 2) -> Dict:
-        """Check availability for a restaurant on a given date"""
-        url = "https://api.resy.com/4/find"
-        params = {
-            "lat": "0",
-            "long": "0", 
-            "day": date,
-            "party_size": str(party_size),
-            "venue_id": venue_id
-        }
-        
-        try:
-            response = self.session.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                return self._parse_availability(data)
-            else:
-                return {"available": False, "error": f"HTTP {response.status_code}"}
-        except Exception as e:
-            return {"available": False, "error": str(e)}
-    
+        self.cache = cache
+        self.max_age = max_age
+        self.limiter = limiter or default_limiter
+        self.max_retries = max_retries
+        self.breaker = breaker or CircuitBreaker()
+        self.archive = archive
+        self.find_url = f"{base_url}/4/find"
+
+    def _before_fetch(self, cache_key: str):
+        """(data, error, fresh) if no request is needed (cache hit, open circuit), else None"""
+        if self.cache is not None:
+            data = self.cache.get(cache_key, self.max_age)
+            if data is not None:
+                return data, None, False
+        if not self.breaker.allow():
+            return None, error_result("Resy is failing; circuit open, check skipped"), False
+        return None
+
+    def _after_response(self, status_code: int, read_json, cache_key: str):
+        """(data, error, fresh) once a response settles the fetch, or None to retry"""
+        if status_code == 200:
+            self.breaker.record_success()
+            try:
+                data = read_json()
+            except ValueError as e:
+                return None, error_result(f"Invalid JSON: {e}"), False
+            if self.cache is not None:
+                self.cache.set(cache_key, data)
+            return data, None, True
+
+        if not is_retryable_status(status_code):
+            # Client errors (bad auth, bad params) mean Resy itself is up
+            self.breaker.record_success()
+            return None, error_result(f"HTTP {status_code}"), False
+        return None
+
+    def _give_up(self, error: str):
+        self.breaker.record_failure()
+        return None, error_result(f"{error} (after {self.max_retries + 1} attempts)"), False
+
+    def _venue_result(self, venue_id: str, date: str, party_size: int, fetched) -> Dict:
+        """Parse a single-venue fetch and archive it if it was fresh"""
+        data, error, fresh = fetched
+        if error is not None:
+            return error
+        result = self._parse_availability(data)
+        if fresh and self.archive is not None:
+            self.archive.record(venue_id, date, party_size, result)
+        return result
+
     def _parse_availability(self, data: Dict) -> Dict:
         """Parse Resy API response to extract availability info"""
         try:
             venues = data.get("results", {}).get("venues", [])
-            if not venues:
-                return {"available": False, "slots": [], "message": "No availability"}
-            
-            venue = venues[0]
+        except Exception as e:
+            return error_result(f"Parse error: {str(e)}")
+        if not venues:
+            return {"available": False, "status": STATUS_UNAVAILABLE, "slots": [], "message": "No availability"}
+        return self._parse_venue(venues[0])
+
+    def _parse_venue(self, venue: Dict) -> Dict:
+        """Parse one /4/find venue entry into an availability result"""
+        try:
             slots = venue.get("slots", [])
             
             if not slots:
-                return {"available": False, "slots": [], "message": "No time slots available"}
+                return {"available": False, "status": STATUS_UNAVAILABLE, "slots": [], "message": "No time slots available"}
             
             available_times = []
             for slot in slots:
@@ -90,11 +201,201 @@ class ResyChecker:
             
             return {
                 "available": True,
+                "status": STATUS_AVAILABLE,
                 "slots": available_times,
                 "message": f"Found {len(available_times)} available slots"
             }
         except Exception as e:
-            return {"available": False, "error": f"Parse error: {str(e)}"}
+            return error_result(f"Parse error: {str(e)}")
+
+class ResyChecker(_FindClient):
+    def __init__(self, api_key: str = None, auth_token: str = None, pool_size: int = 10,
+                 cache=None, max_age: float = None, limiter=None,
+                 timeout=DEFAULT_TIMEOUT, max_retries: int = DEFAULT_MAX_RETRIES,
+                 breaker: CircuitBreaker = None, base_url: str = RESY_API_BASE,
+                 archive=None):
+        """
+        Args:
+            cache: Optional ResponseCache for raw /4/find responses
+            max_age: Oldest cached response to reuse, in seconds (default and cap: cache TTL)
+            limiter: RateLimiter for outgoing calls (default: shared per-host limiter)
+            timeout: (connect, read) timeout per request, in seconds
+            max_retries: Retries for timeouts, connection errors, 429 and 5xx
+            breaker: CircuitBreaker that fails checks fast while Resy is degraded
+            base_url: Resy API root (override to point at a local stand-in)
+            archive: Optional AvailabilityArchive recording every freshly fetched result
+        """
+        super().__init__(api_key, auth_token, cache, max_age, limiter, max_retries,
+                         breaker, base_url, archive)
+        self.timeout = timeout
+        self.flights = SingleFlight()
+        self.session = requests.Session()
+
+        # Size the keep-alive pool so concurrent callers can share the session
+        # without discarding connections
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        if api_key and auth_token:
+            self.session.headers.update(build_resy_headers(api_key, auth_token))
+    
+    def check_availability(self, venue_id: str, date: str, party_size: int = 2) -> Dict:
+        """
+        Check availability for a restaurant on a given date.
+
+        The result's "status" is "available", "unavailable" or "error"; an
+        error means the check itself failed, not that the venue is full.
+        Concurrent checks of the same venue/date/party size share one call
+        and one result.
+        """
+        cache_key = find_cache_key(venue_id, date, party_size)
+        return self.flights.do(
+            cache_key, lambda: self._check(venue_id, date, party_size, cache_key)
+        )
+
+    def _check(self, venue_id: str, date: str, party_size: int, cache_key: str) -> Dict:
+        fetched = self._fetch(build_find_params(venue_id, date, party_size), cache_key)
+        return self._venue_result(venue_id, date, party_size, fetched)
+
+    def find_area(self, lat: float, lng: float, date: str, party_size: int = 2,
+                  per_page: int = AREA_PAGE_SIZE, max_pages: int = AREA_MAX_PAGES) -> Dict:
+        """
+        Check every venue Resy returns around a point with paged /4/find
+        geo queries.
+
+        Returns {venue_id: result} with results shaped like
+        check_availability's. Venues missing from the map were not covered
+        (outside the search area, past the last page, or a page failed) and
+        need their own check.
+        """
+        results = {}
+        for page in range(1, max_pages + 1):
+            params = build_area_params(lat, lng, date, party_size, page, per_page)
+            data, error, fresh = self._fetch(
+                params, area_cache_key(lat, lng, date, party_size, page)
+            )
+            if error is not None:
+                break
+
+            venues = data.get("results", {}).get("venues", [])
+            for venue in venues:
+                venue_id = venue_id_of(venue)
+                if venue_id is not None:
+                    results[venue_id] = self._parse_venue(venue)
+                    if fresh and self.archive is not None:
+                        self.archive.record(venue_id, date, party_size, results[venue_id])
+            if len(venues) < per_page:
+                break
+        return results
+
+    def _fetch(self, params: Dict, cache_key: str):
+        """
+        GET /4/find through the cache, circuit breaker and retry loop.
+
+        Returns (data, None, fresh) on success, where fresh is False for a
+        cache hit, or (None, error_result, False) on failure.
+        """
+        settled = self._before_fetch(cache_key)
+        if settled is not None:
+            return settled
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(backoff_delay(attempt - 1))
+            try:
+                # 429s are retried by this loop, so not again inside the limiter
+                response = self.limiter.request(
+                    self.session, 'GET', self.find_url, max_throttle_retries=0,
+                    params=params, timeout=self.timeout
+                )
+            except requests.RequestException as e:
+                error = str(e)
+                continue
+
+            settled = self._after_response(response.status_code, response.json, cache_key)
+            if settled is not None:
+                return settled
+            error = f"HTTP {response.status_code}"
+
+        return self._give_up(error)
+
+class AsyncResyChecker(_FindClient):
+    """
+    asyncio counterpart of ResyChecker backed by a pooled httpx.AsyncClient.
+
+    Use as an async context manager (or call aclose()) so the keep-alive
+    connections are released when done.
+    """
+
+    def __init__(self, api_key: str = None, auth_token: str = None, pool_size: int = 100,
+                 cache=None, max_age: float = None, limiter=None,
+                 timeout=DEFAULT_TIMEOUT, max_retries: int = DEFAULT_MAX_RETRIES,
+                 breaker: CircuitBreaker = None, base_url: str = RESY_API_BASE,
+                 archive=None):
+        if httpx is None:
+            raise ImportError("AsyncResyChecker requires httpx (pip install httpx)")
+
+        super().__init__(api_key, auth_token, cache, max_age, limiter, max_retries,
+                         breaker, base_url, archive)
+        self.flights = AsyncSingleFlight()
+
+        headers = build_resy_headers(api_key, auth_token) if api_key and auth_token else {}
+        limits = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size
+        )
+        connect_timeout, read_timeout = timeout
+        self.client = httpx.AsyncClient(
+            headers=headers,
+            limits=limits,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying connection pool"""
+        await self.client.aclose()
+
+    async def check_availability(self, venue_id: str, date: str, party_size: int = 2) -> Dict:
+        """Check availability for a restaurant on a given date (see ResyChecker)"""
+        cache_key = find_cache_key(venue_id, date, party_size)
+        return await self.flights.do(
+            cache_key, lambda: self._check(venue_id, date, party_size, cache_key)
+        )
+
+    async def _check(self, venue_id: str, date: str, party_size: int, cache_key: str) -> Dict:
+        fetched = await self._fetch(build_find_params(venue_id, date, party_size), cache_key)
+        return self._venue_result(venue_id, date, party_size, fetched)
+
+    async def _fetch(self, params: Dict, cache_key: str):
+        """Async counterpart of ResyChecker._fetch"""
+        settled = self._before_fetch(cache_key)
+        if settled is not None:
+            return settled
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(backoff_delay(attempt - 1))
+            try:
+                response = await self.limiter.request_async(
+                    self.client, 'GET', self.find_url, max_throttle_retries=0, params=params
+                )
+            except httpx.HTTPError as e:
+                error = str(e) or type(e).__name__
+                continue
+
+            settled = self._after_response(response.status_code, response.json, cache_key)
+            if settled is not None:
+                return settled
+            error = f"HTTP {response.status_code}"
+
+        return self._give_up(error)
 
 def parse_date_query(query: str) -> str:
     """Convert natural language to YYYY-MM-DD format"""
@@ -178,6 +479,34 @@ def find_available_restaurants(when: str = "tomorrow night", party_size: int = 2
     
     return results
 
+async def find_available_restaurants_async(when: str = "tomorrow night", party_size: int = 2,
+                                           api_key: str = None, auth_token: str = None,
+                                           concurrency: int = 20) -> List[Dict]:
+    """Async version of find_available_restaurants; checks venues concurrently"""
+    date = parse_date_query(when)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with AsyncResyChecker(api_key, auth_token, pool_size=concurrency) as checker:
+        async def check(restaurant):
+            async with semaphore:
+                availability = await checker.check_availability(
+                    venue_id=restaurant['venue_id'],
+                    date=date,
+                    party_size=party_size
+                )
+            return {
+                **restaurant,
+                'date': date,
+                'party_size': party_size,
+                **availability
+            }
+
+        # gather preserves input order
+        return await asyncio.gather(*(
+            check(restaurant) for restaurant in restaurants
+            if restaurant.get('venue_id')
+        ))
+
 if __name__ == "__main__":
     print("🍽️  Restaurant Availability Checker")
     print("=" * 40)
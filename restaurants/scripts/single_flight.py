@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Coalesce identical in-flight calls.
+
+While a call for a key is running, later callers asking for the same key
+wait for it and get the same result (or exception) instead of starting
+their own. Once the call finishes the key is forgotten, so this only
+deduplicates concurrent work; caching finished results is the job of
+ResponseCache. Results are shared objects, so callers must not mutate
+them.
+"""
+
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Thread-based coalescing: one caller per key runs fn, the rest wait"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def waiting(self, key) -> int:
+        """Callers that joined key's in-flight call (not counting its leader), or 0"""
+        with self._lock:
+            call = self._calls.get(key)
+            return call.waiters if call is not None else 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """asyncio coalescing: the first caller's coroutine is shared by the rest"""
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, fn):
+        """fn is a zero-argument callable returning a coroutine"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        # Shielded so one caller being cancelled doesn't cancel the others' call
+        return await asyncio.shield(task)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+In-memory spatial index over stored venue coordinates.
+
+A 2-d tree over points projected to kilometres around the data's mean
+latitude answers "within X km of here" and "k nearest to here" without
+any Maps API calls. The projection only prunes the tree search; matches
+and reported distances are exact great-circle (haversine) distances.
+
+Usage:
+  python3 spatial_index.py --near 40.7265,-73.9815 --radius 1.5
+  python3 spatial_index.py --near "Union Square, NYC" --k 5
+"""
+
+import argparse
+import heapq
+import math
+import re
+import sys
+
+from maps_client import geocode, get_geocode_cache, load_maps_credentials, normalize_geocode_query
+from restaurant_store import RestaurantStore
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 110.574
+KM_PER_DEGREE_LNG_AT_EQUATOR = 111.320
+# Relative slack between projected and great-circle distance when pruning
+PROJECTION_MARGIN = 0.01
+
+COORDS_PATTERN = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$')
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points, in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def parse_coords(text: str):
+    """(lat, lng) from "lat,lng", or None if text isn't a coordinate pair"""
+    match = COORDS_PATTERN.match(text)
+    if not match:
+        return None
+    lat, lng = float(match.group(1)), float(match.group(2))
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise ValueError(f"coordinates out of range: {text}")
+    return lat, lng
+
+
+class _Node:
+    __slots__ = ('x', 'y', 'item', 'axis', 'left', 'right')
+
+    def __init__(self, x, y, item, axis, left, right):
+        self.x, self.y, self.item, self.axis = x, y, item, axis
+        self.left, self.right = left, right
+
+
+class SpatialIndex:
+    def __init__(self, points):
+        """
+        Args:
+            points: Iterable of (lat, lng, item); item is returned by queries
+        """
+        points = list(points)
+        self._size = len(points)
+        self._ref_lat = sum(lat for lat, _, _ in points) / len(points) if points else 0.0
+        self._km_per_lng = KM_PER_DEGREE_LNG_AT_EQUATOR * math.cos(math.radians(self._ref_lat))
+        projected = [(*self._project(lat, lng), (lat, lng, item)) for lat, lng, item in points]
+        self._root = self._build(projected, 0)
+
+    def __len__(self):
+        return self._size
+
+    @classmethod
+    def from_records(cls, records):
+        """Index store records (or restaurant entries) that have coordinates"""
+        return cls(
+            (record['latitude'], record['longitude'], record) for record in records
+            if record.get('latitude') is not None and record.get('longitude') is not None
+        )
+
+    def _project(self, lat, lng):
+        return lng * self._km_per_lng, lat * KM_PER_DEGREE_LAT
+
+    def _build(self, points, depth):
+        if not points:
+            return None
+        axis = depth % 2
+        points.sort(key=lambda point: point[axis])
+        middle = len(points) // 2
+        x, y, item = points[middle]
+        return _Node(
+            x, y, item, axis,
+            self._build(points[:middle], depth + 1),
+            self._build(points[middle + 1:], depth + 1)
+        )
+
+    def within(self, lat: float, lng: float, radius_km: float) -> list:
+        """[(distance_km, item), ...] within radius_km of the point, nearest first"""
+        qx, qy = self._project(lat, lng)
+        reach = radius_km * (1 + PROJECTION_MARGIN)
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if (node.x - qx) ** 2 + (node.y - qy) ** 2 <= reach ** 2:
+                point_lat, point_lng, item = node.item
+                distance = haversine_km(lat, lng, point_lat, point_lng)
+                if distance <= radius_km:
+                    found.append((distance, item))
+            delta = (qx - node.x) if node.axis == 0 else (qy - node.y)
+            near, far = (node.left, node.right) if delta < 0 else (node.right, node.left)
+            stack.append(near)
+            if abs(delta) <= reach:
+                stack.append(far)
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+    def nearest(self, lat: float, lng: float, k: int = 1) -> list:
+        """[(distance_km, item), ...] for the k nearest points, nearest first"""
+        if k < 1:
+            return []
+        qx, qy = self._project(lat, lng)
+        # Max-heap of the best k by projected distance: (-dist2, tiebreak, item)
+        best = []
+        counter = 0
+
+        def visit(node):
+            nonlocal counter
+            if node is None:
+                return
+            dist2 = (node.x - qx) ** 2 + (node.y - qy) ** 2
+            counter += 1
+            if len(best) < k:
+                heapq.heappush(best, (-dist2, counter, node.item))
+            elif dist2 < -best[0][0]:
+                heapq.heapreplace(best, (-dist2, counter, node.item))
+
+            delta = (qx - node.x) if node.axis == 0 else (qy - node.y)
+            near, far = (node.left, node.right) if delta < 0 else (node.right, node.left)
+            visit(near)
+            if len(best) < k or delta ** 2 <= -best[0][0]:
+                visit(far)
+
+        visit(self._root)
+        if not best:
+            return []
+        # The projected k nearest bound the true k nearest; re-rank exactly
+        # within the farthest of them
+        radius = max(
+            haversine_km(lat, lng, point_lat, point_lng)
+            for _, _, (point_lat, point_lng, _) in best
+        )
+        return self.within(lat, lng, radius)[:k]
+
+
+def build_store_index(data_dir: str = None, with_venue_id: bool = False) -> SpatialIndex:
+    """Index every list's restaurants that have coordinates"""
+    store = RestaurantStore(data_dir)
+    return SpatialIndex.from_records(store.select(with_venue_id=with_venue_id, with_coords=True))
+
+
+def resolve_location(text: str):
+    """
+    (lat, lng) for "lat,lng" or an address.
+
+    Addresses are looked up in the geocode cache first, so the Maps API is
+    only called for places never geocoded before.
+    """
+    coords = parse_coords(text)
+    if coords is not None:
+        return coords
+
+    cached = get_geocode_cache().get(normalize_geocode_query(text))
+    if cached is None:
+        cached = geocode(text, load_maps_credentials())
+    return cached['lat'], cached['lng']
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Find restaurants near a point across every list',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--near', required=True, help='"lat,lng" or an address')
+    parser.add_argument('--radius', type=float, default=None,
+                        help='Search radius in km')
+    parser.add_argument('--k', type=int, default=10,
+                        help='Number of nearest restaurants when no radius is given (default: 10)')
+    parser.add_argument('--restaurants-dir', default=None,
+                        help='Directory containing restaurant CSV files')
+    args = parser.parse_args()
+
+    try:
+        lat, lng = resolve_location(args.near)
+    except Exception as e:
+        print(f"Error locating '{args.near}': {e}", file=sys.stderr)
+        sys.exit(1)
+
+    index = build_store_index(args.restaurants_dir)
+    if args.radius is not None:
+        matches = index.within(lat, lng, args.radius)
+    else:
+        matches = index.nearest(lat, lng, args.k)
+
+    seen = set()
+    for distance, record in matches:
+        key = record['venue_id'] or record['name']
+        if key in seen:
+            continue
+        seen.add(key)
+        print(f"{distance:5.2f} km  {record['name']} ({record['location']}) "
+              f"[{record['list_type']}/{record['category']}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Estimate travel times from straight-line distance.
+
+One vectorized great-circle pass over every venue's stored coordinates
+(NumPy when installed, plain Python otherwise) gives distances from an
+origin. A per-mode linear fit, minutes = intercept + per_km * km,
+calibrated on venues whose travel time is already known, turns them into
+estimates. Venues whose estimate is clearly over (or under) a travel
+limit are settled without any Distance Matrix calls; only borderline ones
+are worth an API call.
+
+Usage:
+  python3 travel_estimate.py calibrate
+  python3 travel_estimate.py estimate --list try --category dinner --max-travel-time 30
+"""
+
+import argparse
+import math
+import sys
+
+from maps_client import get_home_address, get_travel_times
+from restaurant_store import RestaurantStore
+from spatial_index import EARTH_RADIUS_KM, haversine_km, resolve_location
+
+try:
+    import numpy as np
+except ImportError:  # Fall back to a pure-Python loop
+    np = None
+
+# Uncalibrated (intercept minutes, minutes per km) by mode, for NYC-ish cities
+DEFAULT_MODELS = {
+    'transit': (10.0, 3.5),
+    'driving': (6.0, 2.5),
+    'walking': (0.0, 12.5),
+    'bicycling': (2.0, 4.0),
+}
+# Known travel times needed before a mode's fit replaces its default
+MIN_CALIBRATION_POINTS = 5
+# Uncertainty band (minutes) for an uncalibrated model
+DEFAULT_MARGIN_MINUTES = 8.0
+
+
+def haversine_many(lat: float, lng: float, lats, lngs) -> list:
+    """Great-circle distances in km from one point to many, as a list"""
+    if np is None:
+        return [haversine_km(lat, lng, lat2, lng2) for lat2, lng2 in zip(lats, lngs)]
+
+    phi1 = math.radians(lat)
+    phi2 = np.radians(np.asarray(lats, dtype=float))
+    dphi = phi2 - phi1
+    dlmb = np.radians(np.asarray(lngs, dtype=float) - lng)
+    a = np.sin(dphi / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return (2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))).tolist()
+
+
+class TravelModel:
+    """minutes = intercept + per_km * km, with a margin covering most residuals"""
+
+    def __init__(self, mode: str, intercept: float, per_km: float,
+                 margin: float = DEFAULT_MARGIN_MINUTES, samples: int = 0):
+        self.mode = mode
+        self.intercept = intercept
+        self.per_km = per_km
+        self.margin = margin
+        self.samples = samples
+
+    @classmethod
+    def default(cls, mode: str = 'transit') -> 'TravelModel':
+        intercept, per_km = DEFAULT_MODELS[mode]
+        return cls(mode, intercept, per_km)
+
+    @classmethod
+    def fit(cls, mode: str, distances: list, minutes: list) -> 'TravelModel':
+        """Least-squares fit; falls back to the default with too few points"""
+        n = len(distances)
+        if n < MIN_CALIBRATION_POINTS:
+            return cls.default(mode)
+
+        mean_x = sum(distances) / n
+        mean_y = sum(minutes) / n
+        var_x = sum((x - mean_x) ** 2 for x in distances)
+        if var_x == 0:
+            return cls.default(mode)
+        per_km = sum((x - mean_x) * (y - mean_y) for x, y in zip(distances, minutes)) / var_x
+        if per_km <= 0:
+            # Distances too clustered to learn a slope; keep the prior slope
+            per_km = DEFAULT_MODELS[mode][1]
+        intercept = mean_y - per_km * mean_x
+
+        # ~90% of known venues fall within the margin
+        residuals = sorted(abs(y - (intercept + per_km * x)) for x, y in zip(distances, minutes))
+        margin = max(residuals[min(int(n * 0.9), n - 1)], 2.0)
+        return cls(mode, intercept, per_km, margin, n)
+
+    def minutes(self, km: float) -> int:
+        return max(0, round(self.intercept + self.per_km * km))
+
+    def classify(self, km: float, max_minutes: float) -> str:
+        """"near" (surely within max_minutes), "far" (surely over) or "borderline" """
+        estimate = self.intercept + self.per_km * km
+        if estimate + self.margin <= max_minutes:
+            return 'near'
+        if estimate - self.margin > max_minutes:
+            return 'far'
+        return 'borderline'
+
+
+def calibrate(origin: tuple, restaurants: list, mode: str = 'transit') -> TravelModel:
+    """
+    Fit a model on restaurants that have coordinates and a known travel time
+    from origin by mode (the stored travel_time_minutes are transit times
+    from home).
+    """
+    known = [
+        r for r in restaurants
+        if r.get('latitude') is not None and r.get('travel_time_minutes') is not None
+    ]
+    distances = haversine_many(
+        origin[0], origin[1],
+        [r['latitude'] for r in known], [r['longitude'] for r in known]
+    )
+    return TravelModel.fit(mode, distances, [r['travel_time_minutes'] for r in known])
+
+
+def prefilter(origin: tuple, restaurants: list, max_minutes: float, model: TravelModel):
+    """
+    Split restaurants by a travel limit without API calls.
+
+    Known travel times are used as is. Missing ones are estimated from
+    distance (and marked "travel_time_estimated"). Returns (keep, far,
+    borderline), where borderline restaurants could go either way and are
+    worth a Distance Matrix call; restaurants without coordinates or a
+    known time are kept.
+    """
+    keep, far, borderline = [], [], []
+    located = [r for r in restaurants if r.get('latitude') is not None and r.get('longitude') is not None]
+    distances = haversine_many(
+        origin[0], origin[1],
+        [r['latitude'] for r in located], [r['longitude'] for r in located]
+    )
+    distance_by_id = {id(r): km for r, km in zip(located, distances)}
+
+    for restaurant in restaurants:
+        if restaurant.get('travel_time_minutes') is not None:
+            (keep if restaurant['travel_time_minutes'] <= max_minutes else far).append(restaurant)
+            continue
+        km = distance_by_id.get(id(restaurant))
+        if km is None:
+            keep.append(restaurant)
+            continue
+
+        estimated = {**restaurant, 'travel_time_minutes': model.minutes(km),
+                     'travel_time_estimated': True}
+        groups = {'near': keep, 'far': far, 'borderline': borderline}
+        groups[model.classify(km, max_minutes)].append(estimated)
+
+    return keep, far, borderline
+
+
+def refine(origin: str, borderline: list, max_minutes: float, api_key: str, mode: str = 'transit'):
+    """
+    Settle borderline restaurants with one batched Distance Matrix query.
+
+    Returns (keep, far) with real travel times; restaurants without a route
+    are kept on their estimate.
+    """
+    destinations = [f"{r['latitude']},{r['longitude']}" for r in borderline]
+    results = get_travel_times(origin, destinations, api_key, mode)
+    keep, far = [], []
+    for restaurant, result in zip(borderline, results):
+        if result is not None:
+            restaurant = {**restaurant, 'travel_time_minutes': result['duration_minutes'],
+                          'travel_time_estimated': False}
+        (keep if restaurant['travel_time_minutes'] <= max_minutes else far).append(restaurant)
+    return keep, far
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Estimate travel times from stored coordinates')
+    parser.add_argument('command', choices=['calibrate', 'estimate'])
+    parser.add_argument('--list', choices=['try', 'love'], default=None)
+    parser.add_argument('--category', default=None)
+    parser.add_argument('--max-travel-time', type=int, default=30)
+    parser.add_argument('--restaurants-dir', default=None)
+    args = parser.parse_args()
+
+    try:
+        origin = resolve_location(get_home_address())
+    except Exception as e:
+        print(f"Error locating home: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    store = RestaurantStore(args.restaurants_dir)
+    restaurants = store.select(args.list, args.category, with_venue_id=True)
+    model = calibrate(origin, restaurants)
+    if args.command == 'calibrate':
+        source = f"fit on {model.samples} venues" if model.samples else "default, too few known times"
+        print(f"{model.mode}: {model.intercept:.1f} min + {model.per_km:.2f} min/km "
+              f"(±{model.margin:.0f} min, {source}; numpy {'on' if np else 'off'})")
+        return
+
+    keep, far, borderline = prefilter(origin, restaurants, args.max_travel_time, model)
+    for label, group in (('within', keep), ('borderline', borderline), ('too far', far)):
+        print(f"{label} ({len(group)}):")
+        for r in group:
+            estimated = ' (est.)' if r.get('travel_time_estimated') else ''
+            minutes = r['travel_time_minutes']
+            print(f"   {r['name']}: {'?' if minutes is None else minutes} min{estimated}")
+
+
+if __name__ == "__main__":
+    main()
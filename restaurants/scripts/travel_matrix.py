@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Travel times from several origins, by mode, for every venue.
+
+Minutes are kept in one flat unsigned-short array laid out as origins x
+venues x modes (2 bytes per cell), with a small JSON header naming the
+axes. Cells start unknown and are filled by batched Distance Matrix
+calls; a refresh only queries the cells that are still unknown, so
+adding a venue or an origin costs just its own row or column.
+
+Usage:
+  python3 travel_matrix.py add-origin office "1 Broadway, New York, NY"
+  python3 travel_matrix.py refresh --origin office --mode walking
+  python3 travel_matrix.py show --origin office --mode transit
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from array import array
+
+from checkpoint import atomic_write_bytes, atomic_write_json
+from maps_client import (
+    MAX_MATRIX_ELEMENTS,
+    MAX_MATRIX_SIDE,
+    get_home_address,
+    get_travel_time_matrix,
+    load_maps_credentials
+)
+from restaurant_store import RestaurantStore
+
+DEFAULT_MATRIX_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'travel_matrix'
+)
+
+MODES = ['transit', 'driving', 'walking', 'bicycling']
+HOME_ORIGIN = 'home'
+
+# Cell markers; real travel times are clamped below them
+UNKNOWN = 0xFFFF
+NO_ROUTE = 0xFFFE
+
+# An unregistered origin is taken as a place only if it has a digit or a
+# comma ("1 Broadway", "Astoria, NY", "40.75,-73.99"), so a mistyped name
+# isn't geocoded
+PLACE_PATTERN = re.compile(r'[\d,]')
+
+
+class TravelMatrix:
+    def __init__(self, path: str = None):
+        """path is the file prefix; the matrix lives in <path>.json and <path>.bin"""
+        self.path = path or DEFAULT_MATRIX_PATH
+        self.origins = {}       # name -> address
+        self.origin_names = []
+        self.venue_ids = []
+        self._venue_index = {}
+        self._transient = set()
+        self.cells = array('H')
+        self._load()
+        # Re-pointed on every load, so a changed HOME_ADDRESS drops the old times
+        try:
+            self.add_origin(HOME_ORIGIN, get_home_address())
+        except ValueError:
+            pass
+
+    def _load(self):
+        try:
+            with open(f"{self.path}.json", 'r', encoding='utf-8') as f:
+                header = json.load(f)
+            cells = array('H')
+            with open(f"{self.path}.bin", 'rb') as f:
+                cells.frombytes(f.read())
+        except (FileNotFoundError, ValueError):
+            return
+
+        if header.get('modes') != MODES:
+            # Mode axis changed; start over rather than misread cells
+            return
+        self.origin_names = [origin['name'] for origin in header['origins']]
+        self.origins = {origin['name']: origin['address'] for origin in header['origins']}
+        self.venue_ids = header['venue_ids']
+        self._venue_index = {venue_id: index for index, venue_id in enumerate(self.venue_ids)}
+        expected = len(self.origin_names) * len(self.venue_ids) * len(MODES)
+        self.cells = cells if len(cells) == expected else array('H', [UNKNOWN]) * expected
+
+    def save(self):
+        """Write the binary cells then the header, each atomically; ad-hoc origins are left out"""
+        kept = [name for name in self.origin_names if name not in self._transient]
+        cells = self.cells
+        if len(kept) < len(self.origin_names):
+            block = len(self.venue_ids) * len(MODES)
+            cells = array('H')
+            for name in kept:
+                o = self.origin_names.index(name)
+                cells.extend(self.cells[o * block:(o + 1) * block])
+        atomic_write_bytes(f"{self.path}.bin", cells.tobytes())
+        atomic_write_json(f"{self.path}.json", {
+            'modes': MODES,
+            'origins': [{'name': name, 'address': self.origins[name]} for name in kept],
+            'venue_ids': self.venue_ids,
+        })
+
+    def _offset(self, origin_index: int, venue_index: int, mode: str) -> int:
+        return (origin_index * len(self.venue_ids) + venue_index) * len(MODES) + MODES.index(mode)
+
+    def _resize(self, origin_names: list, venue_ids: list):
+        """Re-lay the cells for new axes, carrying known values over"""
+        old = {
+            (origin, venue_id): self.cells[
+                self._offset(o, v, MODES[0]):self._offset(o, v, MODES[0]) + len(MODES)
+            ]
+            for o, origin in enumerate(self.origin_names)
+            for v, venue_id in enumerate(self.venue_ids)
+        }
+        self.origin_names = origin_names
+        self.venue_ids = venue_ids
+        self._venue_index = {venue_id: index for index, venue_id in enumerate(venue_ids)}
+        self.cells = array('H', [UNKNOWN]) * (len(origin_names) * len(venue_ids) * len(MODES))
+        for (origin, venue_id), values in old.items():
+            start = self._offset(origin_names.index(origin), self._venue_index[venue_id], MODES[0])
+            self.cells[start:start + len(MODES)] = values
+
+    def add_origin(self, name: str, address: str):
+        """Register (or re-point) a named origin; a new address forgets its old times"""
+        if name in self.origins:
+            if self.origins[name] == address:
+                return
+            o = self.origin_names.index(name)
+            for v in range(len(self.venue_ids)):
+                start = self._offset(o, v, MODES[0])
+                self.cells[start:start + len(MODES)] = array('H', [UNKNOWN] * len(MODES))
+            self.origins[name] = address
+            return
+        self.origins[name] = address
+        self._resize(self.origin_names + [name], self.venue_ids)
+
+    def use_origin(self, origin: str):
+        """
+        Make origin queryable: a registered name, or an address or "lat,lng"
+        added for this run only (it is never saved). Raises ValueError for
+        anything else, including an unset home.
+        """
+        if origin in self.origins:
+            return
+        if origin == HOME_ORIGIN:
+            raise ValueError("HOME_ADDRESS not set; add it to .env or give an address instead of home")
+        if not PLACE_PATTERN.search(origin):
+            known = ', '.join(self.origin_names) or 'none'
+            raise ValueError(
+                f"unknown origin '{origin}' (known: {known}); register it with "
+                f"travel_matrix.py add-origin or give a full address"
+            )
+        self.add_origin(origin, origin)
+        self._transient.add(origin)
+
+    def add_venues(self, venue_ids):
+        new = [str(venue_id) for venue_id in dict.fromkeys(venue_ids)
+               if str(venue_id) not in self._venue_index]
+        if new:
+            self._resize(self.origin_names, self.venue_ids + new)
+
+    def get(self, origin: str, venue_id, mode: str = 'transit'):
+        """Minutes, or None when unknown or there is no route"""
+        venue_index = self._venue_index.get(str(venue_id))
+        if origin not in self.origins or venue_index is None:
+            return None
+        value = self.cells[self._offset(self.origin_names.index(origin), venue_index, mode)]
+        return None if value in (UNKNOWN, NO_ROUTE) else value
+
+    def column(self, origin: str, mode: str = 'transit') -> dict:
+        """{venue_id: minutes} for every venue with a known time from origin"""
+        times = {}
+        for venue_id in self.venue_ids:
+            minutes = self.get(origin, venue_id, mode)
+            if minutes is not None:
+                times[venue_id] = minutes
+        return times
+
+    def missing(self, origin: str, venue_ids, mode: str = 'transit') -> list:
+        o = self.origin_names.index(origin)
+        return [
+            venue_id for venue_id in venue_ids
+            if self.cells[self._offset(o, self._venue_index[str(venue_id)], mode)] == UNKNOWN
+        ]
+
+    def fill(self, origin: str, restaurants: list, mode: str, api_key: str) -> int:
+        """
+        Query travel times for restaurants whose cell is still unknown.
+
+        Restaurants need venue_id and coordinates; the rest are skipped.
+        Queries go out one Distance Matrix request at a time and the matrix
+        is saved after each, so a failing request keeps the times already
+        paid for. Returns the number of cells queried.
+        """
+        return self.fill_origins([origin], restaurants, mode, api_key)
+
+    def fill_origins(self, origins: list, restaurants: list, mode: str, api_key: str) -> int:
+        """
+        fill() for several origins at once: each request covers every origin
+        still missing a time for its venues, up to the per-request element
+        limit, instead of one round of requests per origin.
+        """
+        located = {
+            str(r['venue_id']): r for r in restaurants
+            if r.get('venue_id') and r.get('latitude') is not None and r.get('longitude') is not None
+        }
+        self.add_venues(located)
+        missing = {origin: set(self.missing(origin, located, mode)) for origin in origins}
+        origins = [origin for origin in origins if missing[origin]]
+        todo = [venue_id for venue_id in located if any(venue_id in missing[o] for o in origins)]
+        if not todo:
+            return 0
+
+        step = min(MAX_MATRIX_SIDE, MAX_MATRIX_ELEMENTS // min(len(origins), MAX_MATRIX_SIDE))
+        queried = 0
+        for start in range(0, len(todo), step):
+            chunk = todo[start:start + step]
+            asking = [origin for origin in origins if missing[origin].intersection(chunk)]
+            destinations = [f"{located[v]['latitude']},{located[v]['longitude']}" for v in chunk]
+            rows = get_travel_time_matrix([self.origins[o] for o in asking], destinations, api_key, mode)
+            for origin, results in zip(asking, rows):
+                o = self.origin_names.index(origin)
+                for venue_id, result in zip(chunk, results):
+                    if venue_id not in missing[origin]:
+                        continue
+                    value = NO_ROUTE if result is None else min(result['duration_minutes'], NO_ROUTE - 1)
+                    self.cells[self._offset(o, self._venue_index[venue_id], mode)] = value
+                    queried += 1
+            self.save()
+        return queried
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Multi-origin, multi-mode travel time matrix',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = subparsers.add_parser('add-origin', help='Register a named starting point')
+    add_parser.add_argument('name')
+    add_parser.add_argument('address')
+
+    for command in ('refresh', 'show'):
+        sub = subparsers.add_parser(command)
+        sub.add_argument('--origin', default=HOME_ORIGIN)
+        sub.add_argument('--mode', choices=MODES, default='transit')
+        sub.add_argument('--restaurants-dir', default=None)
+
+    parser.add_argument('--path', default=DEFAULT_MATRIX_PATH, help='Matrix file prefix')
+    args = parser.parse_args()
+
+    matrix = TravelMatrix(args.path)
+
+    if args.command == 'add-origin':
+        matrix.add_origin(args.name, args.address)
+        matrix.save()
+        print(f"Origin '{args.name}': {args.address}")
+        return
+
+    if args.origin not in matrix.origins:
+        print(f"Error: unknown origin '{args.origin}' (known: {', '.join(matrix.origin_names) or 'none'})")
+        sys.exit(1)
+
+    records = RestaurantStore(args.restaurants_dir).select(with_venue_id=True, with_coords=True)
+    if args.command == 'refresh':
+        try:
+            queried = matrix.fill(args.origin, records, args.mode, load_maps_credentials())
+        except (ValueError, OSError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        matrix.save()
+        print(f"Queried {queried} missing {args.mode} times from '{args.origin}'")
+        return
+
+    names = {str(r['venue_id']): r['name'] for r in records}
+    times = matrix.column(args.origin, args.mode)
+    for venue_id, minutes in sorted(times.items(), key=lambda item: item[1]):
+        print(f"{minutes:4d} min  {names.get(venue_id, venue_id)}")
+    unknown = len(names) - len(set(names) & set(times))
+    if unknown:
+        print(f"({unknown} venues not yet queried; run refresh)")
+
+
+if __name__ == "__main__":
+    main()
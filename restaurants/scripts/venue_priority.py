@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Priority ordering for availability scans.
+
+Venues are scored on how close they are, how often they have had a
+table in past checks, and which lists they are on, so scans that stop
+early (check_availability.py --first N) try the likeliest good options
+first. Past outcomes come from the availability archive (see
+AvailabilityArchive.hit_rates).
+"""
+
+# Travel time assumed for venues without one, in minutes
+DEFAULT_TRAVEL_MINUTES = 30
+# Score weights: past availability counts most, then distance, then lists
+AVAILABILITY_WEIGHT = 1.0
+TRAVEL_WEIGHT = 0.5
+LOVE_LIST_BONUS = 0.2
+EXTRA_LIST_BONUS = 0.1
+
+
+def priority_score(restaurant: dict, hit_rate: float = 0.5) -> float:
+    """Higher is better: likely to have a table, close by, and well loved"""
+    travel = restaurant.get('travel_time_minutes')
+    if travel is None:
+        travel = DEFAULT_TRAVEL_MINUTES
+
+    lists = restaurant.get('lists', [])
+    list_bonus = sum(LOVE_LIST_BONUS for label in lists if label.startswith('love/'))
+    list_bonus += EXTRA_LIST_BONUS * max(len(lists) - 1, 0)
+
+    return AVAILABILITY_WEIGHT * hit_rate - TRAVEL_WEIGHT * travel / 60 + list_bonus
+
+
+def prioritize(restaurants: list, hit_rates: dict = None) -> list:
+    """Restaurants sorted best first (stable, so ties keep list order)"""
+    hit_rates = hit_rates or {}
+    return sorted(
+        restaurants,
+        key=lambda r: priority_score(r, hit_rates.get(str(r['venue_id']), 0.5)),
+        reverse=True
+    )
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Watch Resy for newly opened (or closed) slots.
+
+Polls a watchlist of venues and reports only the differences from the
+previous poll, so a cancellation shows up once instead of on every run.
+Each venue is scheduled on its own: venues whose slots change get polled
+more often, quiet venues back off, keeping the request budget where the
+action is. Venues with a learned release cadence (see release_schedule.py)
+are polled rapidly around their predicted drop instead. Entries marked
+"auto_book" are booked the moment a slot opens within that entry's own
+dates, party size and window (see resy_booking.py), once per entry. Slot
+state is saved between runs.
+
+Watchlist (JSON):
+  [
+    {"venue_id": "59569", "name": "Mono Mono", "date": "tomorrow", "days": 7,
+     "party_size": 2, "earliest": "18:00", "latest": "20:30"},
+    {"venue_id": "3708", "date_range": "2025-12-20:2025-12-26", "party_size": 4,
+     "auto_book": true}
+  ]
+
+Usage:
+  python3 watch_availability.py watchlist.json
+  python3 watch_availability.py watchlist.json --format ndjson --min-interval 15
+  python3 watch_availability.py watchlist.json --auto-book
+"""
+
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+from availability_archive import AvailabilityArchive
+from check_availability import FIND_CACHE_TTL, build_date_list, parse_date_range
+from checkpoint import atomic_write_json
+from release_schedule import DEFAULT_SCHEDULE_PATH, FAST_INTERVAL, ReleaseSchedule
+from resy_booking import STATUS_BOOKED, ResyBooker
+from resy_client import ResyChecker, STATUS_ERROR, load_resy_credentials, parse_date_query
+from response_cache import ResponseCache
+
+DEFAULT_STATE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'watch_state.json'
+)
+
+# Seconds a warmed booking connection is trusted before it is refreshed,
+# comfortably inside typical keep-alive idle timeouts
+WARM_TTL = 45
+
+
+def load_watchlist(path: str) -> list:
+    """
+    Load and expand the watchlist into one entry per venue:
+    {"venue_id", "name", "probes": [(date, party_size, earliest, latest, book_entry), ...]}
+
+    Each probe keeps the time window of the entry it came from, so entries
+    for the same venue can watch different windows. book_entry is the index
+    of the watchlist entry when that entry has auto_book, else None.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        raw_entries = json.load(f)
+
+    venues = {}
+    for index, raw in enumerate(raw_entries):
+        venue_id = str(raw['venue_id'])
+        if raw.get('date_range'):
+            dates = parse_date_range(raw['date_range'])
+        else:
+            dates = build_date_list(parse_date_query(raw.get('date', 'tomorrow')), raw.get('days', 1))
+
+        venue = venues.setdefault(venue_id, {
+            'venue_id': venue_id,
+            'name': raw.get('name', venue_id),
+            'probes': [],
+        })
+        book_entry = index if raw.get('auto_book') else None
+        for date in dates:
+            probe = (date, int(raw.get('party_size', 2)),
+                     raw.get('earliest', '00:00'), raw.get('latest', '23:59'))
+            existing = next((i for i, p in enumerate(venue['probes']) if p[:4] == probe), None)
+            if existing is None:
+                venue['probes'].append((*probe, book_entry))
+            elif venue['probes'][existing][4] is None and book_entry is not None:
+                venue['probes'][existing] = (*probe, book_entry)
+
+    return list(venues.values())
+
+
+def slot_key(slot: dict) -> str:
+    return f"{slot['time']}|{slot['type']}"
+
+
+def probe_key(venue_id: str, date: str, party_size: int, earliest: str, latest: str) -> str:
+    return f"{venue_id}|{date}|{party_size}|{earliest}-{latest}"
+
+
+class Watcher:
+    def __init__(self, checker, venues: list, state_path: str = DEFAULT_STATE_PATH,
+                 min_interval: float = 30, max_interval: float = 600,
+                 report_initial: bool = False, emit=None, releases: ReleaseSchedule = None,
+                 booker: ResyBooker = None, release_interval: float = FAST_INTERVAL):
+        """
+        Args:
+            checker: ResyChecker used for every poll
+            venues: Entries from load_watchlist()
+            state_path: JSON file holding the last seen slots per probe
+            min_interval / max_interval: Bounds on each venue's poll interval, in seconds
+            report_initial: Report slots found on a probe's first poll as opened
+            emit: Callback receiving each event dict (default: print as text)
+            releases: Optional ReleaseSchedule that learns from opened slots and
+                times polls around predicted drops
+            release_interval: Poll interval inside a predicted drop's window;
+                may be below min_interval
+            booker: Optional prepared ResyBooker; each auto_book entry is
+                booked on the first slot opening in its own probes, once
+        """
+        self.checker = checker
+        self.venues = {venue['venue_id']: venue for venue in venues}
+        self.state_path = state_path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.report_initial = report_initial
+        self.emit = emit or print_event
+        self.releases = releases
+        self.release_interval = release_interval
+        self.booker = booker
+        self.booked = set()     # watchlist entry indices already booked
+        self._warmed_at = None
+        self.intervals = {venue_id: min_interval for venue_id in self.venues}
+        self.state = self._load_state()
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_state(self):
+        atomic_write_json(self.state_path, self.state)
+
+    def poll_venue(self, venue_id: str) -> list:
+        """Poll every probe of one venue and return the slot changes as events"""
+        venue = self.venues[venue_id]
+        today = datetime.now().strftime('%Y-%m-%d')
+        events = []
+        if any(self._should_book(probe[4]) for probe in venue['probes']):
+            # Keep the booking connection warm while waiting for a slot
+            if self._warmed_at is None or time.monotonic() - self._warmed_at >= WARM_TTL:
+                self.booker.warm()
+                self._warmed_at = time.monotonic()
+
+        results = {}
+        for date, party_size, earliest, latest, book_entry in venue['probes']:
+            if date < today or book_entry in self.booked:
+                continue
+
+            # Probes differing only in their window share one check per poll
+            if (date, party_size) not in results:
+                results[(date, party_size)] = self.checker.check_availability(venue_id, date, party_size)
+            result = results[(date, party_size)]
+            if result.get('status') == STATUS_ERROR:
+                # A failed check says nothing about the slots; keep the old state
+                continue
+
+            slots = {
+                slot_key(slot): slot for slot in result.get('slots', [])
+                if earliest <= slot['time'] <= latest
+            }
+            key = probe_key(venue_id, date, party_size, earliest, latest)
+            first_poll = key not in self.state
+            previous = set(self.state.get(key, []))
+            current = set(slots)
+            self.state[key] = sorted(current)
+
+            if first_poll and not self.report_initial:
+                continue
+
+            observed_at = datetime.now().isoformat(timespec='seconds')
+            for change, keys in (('opened', current - previous), ('closed', previous - current)):
+                for skey in sorted(keys):
+                    time_str, slot_type = skey.split('|', 1)
+                    event = {
+                        'event': change,
+                        'venue_id': venue_id,
+                        'name': venue['name'],
+                        'date': date,
+                        'party_size': party_size,
+                        'time': time_str,
+                        'type': slot_type,
+                        'observed_at': observed_at,
+                    }
+                    if change == 'opened':
+                        event['token'] = slots[skey].get('token', '')
+                        if self.releases is not None:
+                            self.releases.record_opened(venue_id, date, party_size, skey)
+                    events.append(event)
+
+                    if change == 'opened' and self._should_book(book_entry):
+                        events.append(self._book(event, book_entry))
+
+        self._save_state()
+        return events
+
+    def _should_book(self, book_entry) -> bool:
+        return self.booker is not None and book_entry is not None and book_entry not in self.booked
+
+    def _finished(self, venue_id: str) -> bool:
+        """True once every probe of a venue belongs to an entry that got booked"""
+        return all(probe[4] in self.booked for probe in self.venues[venue_id]['probes'])
+
+    def _book(self, opened: dict, book_entry: int) -> dict:
+        """Book an opened slot straight from its token, before anything else runs"""
+        booking = self.booker.book(opened['token'], opened['date'], opened['party_size'])
+        event = dict(opened)
+        event.pop('token', None)
+        if booking['status'] == STATUS_BOOKED:
+            self.booked.add(book_entry)
+            event.update(event='booked', reservation_id=booking.get('reservation_id'))
+        else:
+            event.update(event='book_failed', error=booking.get('error'))
+        event['timings'] = booking['timings']
+        return event
+
+    def next_interval(self, venue_id: str, changed: bool) -> float:
+        """
+        Poll busy venues faster and quiet ones slower, within the configured
+        bounds, unless the venue's release cadence has been learned.
+        """
+        interval = self.intervals[venue_id]
+        if changed:
+            interval = max(self.min_interval, interval / 2)
+        else:
+            interval = min(self.max_interval, interval * 1.5)
+        self.intervals[venue_id] = interval
+
+        if self.releases is not None:
+            planned = self.releases.interval_for(venue_id, self.max_interval, self.release_interval)
+            if planned is not None:
+                return planned
+        return interval
+
+    def run(self, once: bool = False):
+        """Poll venues on their own schedules until interrupted (or one pass with once=True)"""
+        # Stagger the first polls so venues don't all fire together
+        now = time.monotonic()
+        schedule = [
+            (now + index * (self.min_interval / max(len(self.venues), 1)), venue_id)
+            for index, venue_id in enumerate(self.venues)
+        ]
+        heapq.heapify(schedule)
+
+        while schedule:
+            due, venue_id = heapq.heappop(schedule)
+            if not once:
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+            events = self.poll_venue(venue_id)
+            for event in events:
+                self.emit(event)
+
+            if once or self._finished(venue_id):
+                continue
+            interval = self.next_interval(venue_id, bool(events))
+            # Jitter keeps venues from synchronizing over time
+            heapq.heappush(schedule, (time.monotonic() + interval * random.uniform(0.9, 1.1), venue_id))
+
+
+EVENT_SYMBOLS = {'opened': '🟢', 'closed': '🔴', 'booked': '🎉', 'book_failed': '⚠️'}
+
+
+def print_event(event: dict):
+    detail = event['event']
+    if event['event'] == 'booked':
+        detail = f"booked in {event['timings']['total_ms']:.0f}ms"
+    elif event['event'] == 'book_failed':
+        detail = f"booking failed: {event.get('error')}"
+    print(f"{EVENT_SYMBOLS[event['event']]} {event['observed_at']}  {event['name']}  {event['date']} "
+          f"{event['time']} ({event['type']}, party of {event['party_size']}) {detail}",
+          flush=True)
+
+
+def print_event_json(event: dict):
+    print(json.dumps(event), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Watch Resy venues and report newly opened slots',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('watchlist', help='Watchlist JSON file')
+    parser.add_argument('--min-interval', type=float, default=30,
+                        help='Fastest poll interval per venue, in seconds, outside learned '
+                             'release windows (default: 30)')
+    parser.add_argument('--release-interval', type=float, default=FAST_INTERVAL,
+                        help='Poll interval inside a learned release window, in seconds; '
+                             f'may be below --min-interval (default: {FAST_INTERVAL})')
+    parser.add_argument('--max-interval', type=float, default=600,
+                        help='Slowest poll interval per venue, in seconds (default: 600)')
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH,
+                        help='File holding last seen slots between runs')
+    parser.add_argument('--report-initial', action='store_true',
+                        help='Report slots already open on the first poll')
+    parser.add_argument('--format', choices=['text', 'ndjson'], default='text')
+    parser.add_argument('--once', action='store_true',
+                        help='Poll every venue once and exit')
+    parser.add_argument('--release-schedule', default=DEFAULT_SCHEDULE_PATH,
+                        help='Database of learned slot release times')
+    parser.add_argument('--no-release-schedule', action='store_true',
+                        help="Don't learn or use venues' release times")
+    parser.add_argument('--auto-book', action='store_true',
+                        help='Book slots for watchlist entries marked "auto_book"')
+    args = parser.parse_args()
+
+    if args.min_interval <= 0 or args.max_interval < args.min_interval:
+        parser.error('need 0 < --min-interval <= --max-interval')
+    if args.release_interval <= 0:
+        parser.error('--release-interval must be positive')
+
+    try:
+        api_key, auth_token = load_resy_credentials()
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        venues = load_watchlist(args.watchlist)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error loading watchlist {args.watchlist}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    booker = None
+    if args.auto_book:
+        booker = ResyBooker(api_key, auth_token)
+        try:
+            booker.prepare()
+        except (OSError, ValueError) as e:
+            print(f"Error preparing auto-booking: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    # Always fetch fresh data, but share what we see with other scripts' caches
+    checker = ResyChecker(
+        api_key,
+        auth_token,
+        cache=ResponseCache(table='resy_find', ttl=FIND_CACHE_TTL),
+        max_age=0,
+        archive=AvailabilityArchive()
+    )
+    watcher = Watcher(
+        checker,
+        venues,
+        state_path=args.state,
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+        report_initial=args.report_initial,
+        emit=print_event_json if args.format == 'ndjson' else print_event,
+        releases=None if args.no_release_schedule else ReleaseSchedule(args.release_schedule),
+        booker=booker,
+        release_interval=args.release_interval
+    )
+
+    probes = sum(len(venue['probes']) for venue in venues)
+    print(f"👀 Watching {len(venues)} venues ({probes} date/party-size probes)", file=sys.stderr)
+    try:
+        watcher.run(once=args.once)
+    except KeyboardInterrupt:
+        print("\nStopped", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
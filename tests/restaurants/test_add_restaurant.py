@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+add_restaurant duplicate detection within and across lists. Run with
+pytest or directly.
+"""
+import csv
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'restaurants', 'scripts'))
+
+from add_restaurant import add_restaurant
+from restaurant_store import RestaurantStore
+
+HEADER = 'name,venue_id,location,cuisine,notes,latitude,longitude,travel_time_minutes\n'
+
+
+def make_lists(data_dir):
+    for filename in ('places_to_try_dinner.csv', 'places_we_love_dinner.csv'):
+        with open(os.path.join(data_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(HEADER)
+
+
+def names(data_dir, filename='places_to_try_dinner.csv'):
+    with open(os.path.join(data_dir, filename), encoding='utf-8', newline='') as f:
+        return [row['name'] for row in csv.DictReader(f)]
+
+
+def test_names_are_cleaned_and_near_duplicates_rejected():
+    with tempfile.TemporaryDirectory() as data_dir:
+        make_lists(data_dir)
+        store = RestaurantStore(data_dir)
+        assert add_restaurant('  Mono   Mono ', ' East  Village ', 'Korean', 'try', 'dinner',
+                              venue_id=59569, restaurants_dir=data_dir, store=store)
+        assert names(data_dir) == ['Mono Mono']
+        assert store.find(venue_id=59569)[0]['location'] == 'East Village'
+
+        # Same venue, or only case/spacing apart, even under another venue id
+        assert not add_restaurant('Mono Mono', 'East Village', 'Korean', 'try', 'dinner',
+                                  venue_id=59569, restaurants_dir=data_dir, store=store)
+        assert not add_restaurant('mono  MONO', 'East Village', 'Korean', 'try', 'dinner',
+                                  venue_id=1, restaurants_dir=data_dir, store=store)
+        assert not add_restaurant('MONO MONO', 'East Village', 'Korean', 'try', 'dinner',
+                                  restaurants_dir=data_dir, store=store)
+        assert names(data_dir) == ['Mono Mono']
+
+
+def test_other_lists_are_reported_but_allowed():
+    with tempfile.TemporaryDirectory() as data_dir:
+        make_lists(data_dir)
+        store = RestaurantStore(data_dir)
+        assert add_restaurant('Lilia', 'Williamsburg', 'Italian', 'try', 'dinner',
+                              venue_id=418, restaurants_dir=data_dir, store=store)
+        assert add_restaurant('Lilia', 'Williamsburg', 'Italian', 'love', 'dinner',
+                              venue_id=418, restaurants_dir=data_dir, store=store)
+        assert names(data_dir, 'places_we_love_dinner.csv') == ['Lilia']
+        assert sorted(r['list_type'] for r in store.find(venue_id=418)) == ['love', 'try']
+
+
+if __name__ == "__main__":
+    test_names_are_cleaned_and_near_duplicates_rejected()
+    test_other_lists_are_reported_but_allowed()
+    print("✅ add restaurant tests passed")
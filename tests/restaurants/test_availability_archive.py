@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+AvailabilityArchive aggregates over a small seeded archive, and their use
+in venue_priority. Run with pytest or directly.
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'restaurants', 'scripts'))
+
+from availability_archive import AvailabilityArchive
+from venue_priority import prioritize
+
+DATE = '2099-06-05'
+DAY = datetime(2099, 6, 5)
+
+
+def result(*times):
+    slots = [{'time': t, 'type': 'Dining Room'} for t in times]
+    return {'status': 'available' if slots else 'unavailable', 'available': bool(slots), 'slots': slots}
+
+
+def seeded(directory):
+    archive = AvailabilityArchive(os.path.join(directory, 'archive.sqlite'))
+    noon = DAY + timedelta(hours=12)
+    # Venue 1 for two: open 10 and 7 days out, full from 3 days out
+    for days, times in ((10, ('19:00', '19:30', '21:00')), (7, ('19:15',)), (3, ()), (1, ())):
+        archive.record('1', DATE, 2, result(*times), observed_at=noon - timedelta(days=days))
+    # Venue 1 for four: never open, so it never "sells out"
+    for days in (10, 3):
+        archive.record('1', DATE, 4, result(), observed_at=noon - timedelta(days=days))
+    archive.record('2', DATE, 2, result(), observed_at=noon - timedelta(days=5))
+    # Failed checks aren't observations
+    archive.record('2', DATE, 2, {'status': 'error', 'available': False, 'slots': []})
+    return archive
+
+
+def test_hit_rates_are_smoothed_per_venue():
+    with tempfile.TemporaryDirectory() as directory:
+        archive = seeded(directory)
+        # (hits + 1) / (checks + 2)
+        assert archive.hit_rates() == {'1': 3 / 8, '2': 1 / 3}
+
+
+def test_rates_by_weekday_and_hour():
+    with tempfile.TemporaryDirectory() as directory:
+        archive = seeded(directory)
+        weekday = DAY.weekday()
+        assert archive.rates('1', party_size=2) == [
+            {'weekday': weekday, 'hour': 19, 'rate': 0.5, 'observations': 4},
+            {'weekday': weekday, 'hour': 21, 'rate': 0.25, 'observations': 4},
+        ]
+        # Two slots in the same hour count once per observation; party sizes pool
+        assert [row['rate'] for row in archive.rates('1')] == [2 / 6, 1 / 6]
+        assert archive.rates('2') == []
+
+
+def test_sellout_lead_times():
+    with tempfile.TemporaryDirectory() as directory:
+        archive = seeded(directory)
+        # First seen full at noon three days before the date
+        assert archive.sellout_lead_times('1', party_size=2) == [2.5]
+        assert archive.sellout_lead_times('1', party_size=4) == []
+        assert archive.sellout_lead_times('1') == [2.5]
+
+
+def test_prioritize_uses_archive_hit_rates():
+    with tempfile.TemporaryDirectory() as directory:
+        hit_rates = seeded(directory).hit_rates()
+    restaurants = [
+        {'venue_id': 2, 'travel_time_minutes': 20, 'lists': ['try/dinner']},
+        {'venue_id': 1, 'travel_time_minutes': 20, 'lists': ['try/dinner']},
+        {'venue_id': 3, 'travel_time_minutes': 20, 'lists': ['try/dinner']},
+        {'venue_id': 4, 'travel_time_minutes': 50, 'lists': ['try/dinner']},
+    ]
+    # Never-observed venues default to 0.5, ahead of venues often seen full
+    assert [r['venue_id'] for r in prioritize(restaurants, hit_rates)] == [3, 1, 2, 4]
+    # Without history, ties keep list order and travel time decides
+    assert [r['venue_id'] for r in prioritize(restaurants)] == [2, 1, 3, 4]
+
+
+if __name__ == "__main__":
+    test_hit_rates_are_smoothed_per_venue()
+    test_rates_by_weekday_and_hour()
+    test_sellout_lead_times()
+    test_prioritize_uses_archive_hit_rates()
+    print("✅ availability archive tests passed")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+End-to-end booking test against a local stand-in of the Resy endpoints.
+
+Runs find -> details -> book through ResyChecker and ResyBooker over real
+HTTP, without touching Resy. Run with pytest or directly.
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'restaurants', 'scripts'))
+
+from resy_booking import ResyBooker, STATUS_BOOKED, STATUS_FAILED
+from resy_client import ResyChecker
+from response_cache import ResponseCache
+
+SLOT_TOKEN = 'rgs://resy/59569/1/2025-12-20/2025-12-20/19:00:00/2/Dining Room'
+
+
+class FakeResy(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    calls = []
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0))).decode()
+
+    def do_HEAD(self):
+        self.calls.append('HEAD')
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        self.calls.append(path)
+        if path == '/4/find':
+            self._send(200, {'results': {'venues': [{'slots': [{
+                'date': {'start': '2025-12-20 19:00:00', 'end': '2025-12-20 21:00:00'},
+                'config': {'type': 'Dining Room', 'token': SLOT_TOKEN},
+            }]}]}})
+        elif path == '/2/user':
+            self._send(200, {'payment_methods': [{'id': 111}, {'id': 222, 'is_default': True}]})
+        else:
+            self._send(404, {})
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        self.calls.append(path)
+        if path == '/3/details':
+            body = json.loads(self._body())
+            if body['config_id'] != SLOT_TOKEN:
+                self._send(404, {'message': 'slot gone'})
+            else:
+                self._send(200, {'book_token': {'value': 'BOOK-TOKEN'}})
+        elif path == '/3/book':
+            form = parse_qs(self._body())
+            ok = (form['book_token'] == ['BOOK-TOKEN']
+                  and json.loads(form['struct_payment_method'][0]) == {'id': 222})
+            if ok:
+                self._send(201, {'reservation_id': 987, 'resy_token': 'RESY-TOKEN'})
+            else:
+                self._send(412, {})
+        else:
+            self._send(404, {})
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeResy)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_booker(base_url, cache_dir):
+    cache = ResponseCache(path=os.path.join(cache_dir, 'cache.sqlite'), table='resy_profile')
+    return ResyBooker('key', 'auth-token', base_url=base_url, cache=cache)
+
+
+def test_find_then_book():
+    server, base_url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            FakeResy.calls = []
+            booker = make_booker(base_url, cache_dir)
+            timings = booker.prepare()
+            assert booker.payment_method_id == 222
+            assert set(timings) == {'profile_ms', 'warm_ms'}
+
+            checker = ResyChecker('key', 'auth-token', base_url=base_url)
+            result = checker.check_availability('59569', '2025-12-20', 2)
+            slot = result['slots'][0]
+            assert slot['token'] == SLOT_TOKEN
+
+            booking = booker.book(slot['token'], '2025-12-20', 2)
+            assert booking['status'] == STATUS_BOOKED, booking
+            assert booking['reservation_id'] == 987
+            assert booking['resy_token'] == 'RESY-TOKEN'
+            assert set(booking['timings']) == {'details_ms', 'book_ms', 'total_ms'}
+            assert booking['timings']['total_ms'] >= booking['timings']['book_ms']
+            assert FakeResy.calls.count('/2/user') == 1
+
+            # A second booker reuses the cached payment method instead of
+            # refetching it, and nothing else from the profile is kept
+            make_booker(base_url, cache_dir).prepare()
+            assert FakeResy.calls.count('/2/user') == 1
+            assert booker.cache.get('payment|auth-token') == {'payment_method_id': 222}
+    finally:
+        server.shutdown()
+
+
+def test_stale_token_fails_without_booking():
+    server, base_url = start_server()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            FakeResy.calls = []
+            booker = make_booker(base_url, cache_dir)
+            booking = booker.book('stale-token', '2025-12-20', 2)
+            assert booking['status'] == STATUS_FAILED
+            assert 'details' in booking['error']
+            assert '/3/book' not in FakeResy.calls
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_find_then_book()
+    test_stale_token_fails_without_booking()
+    print("✅ booking tests passed")
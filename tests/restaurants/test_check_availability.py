@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Check scheduling and output of check_availability, with a fake checker
+instead of Resy. Run with pytest or directly.
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'restaurants', 'scripts'))
+
+from check_availability import (
+    check_restaurants,
+    load_cross_list,
+    parse_date_range,
+    parse_party_sizes,
+    prefetch_area_results,
+    print_list_breakdown,
+    run_checks,
+    run_sweep,
+    stream_records
+)
+from resy_client import STATUS_AVAILABLE, STATUS_ERROR, STATUS_UNAVAILABLE
+
+DATE = '2099-06-05'
+
+
+class FakeChecker:
+    """Venues listed in `open_venues` have a 19:00 slot; tracks calls in flight"""
+
+    def __init__(self, open_venues=(), delay=0.0, delays=None):
+        self.open_venues = set(open_venues)
+        self.delay = delay
+        self.delays = delays or {}
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def check_availability(self, venue_id, date, party_size):
+        with self.lock:
+            self.calls.append(venue_id)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delays.get(venue_id, self.delay))
+        with self.lock:
+            self.in_flight -= 1
+        if venue_id in self.open_venues:
+            return {'status': STATUS_AVAILABLE, 'available': True,
+                    'slots': [{'time': '19:00', 'type': 'Dining Room', 'token': 'token'}]}
+        return {'status': STATUS_UNAVAILABLE, 'available': False, 'slots': []}
+
+
+def jobs_for(count):
+    return [({'venue_id': str(v), 'name': f"Venue {v}"}, DATE, 2) for v in range(count)]
+
+
+def test_stopping_early_bounds_the_calls_made():
+    checker = FakeChecker(open_venues={'0'}, delay=0.02)
+    counts = {}
+    results = run_checks(checker, jobs_for(12), concurrency=3, counts=counts)
+    job, result = next(results)
+    results.close()
+
+    assert job[0]['venue_id'] == '0' and result['available']
+    # Only the first window of jobs was ever submitted
+    assert checker.max_in_flight <= 3
+    assert len(checker.calls) == counts['started'] <= 3
+
+
+def test_results_keep_job_order_and_bounded_concurrency():
+    checker = FakeChecker(delay=0.005)
+    counts = {}
+    results = list(run_checks(checker, jobs_for(20), concurrency=4, counts=counts))
+
+    assert [job[0]['venue_id'] for job, _ in results] == [str(v) for v in range(20)]
+    assert checker.max_in_flight <= 4
+    assert counts['started'] == 20
+
+    unordered = run_checks(FakeChecker(), jobs_for(20), concurrency=4, ordered=False)
+    assert sorted(int(job[0]['venue_id']) for job, _ in unordered) == list(range(20))
+
+
+def test_parallel_checks_report_in_list_order():
+    # Earlier venues answer last, so completion order is the reverse of list order
+    checker = FakeChecker(open_venues={'1', '4'}, delays={str(v): 0.01 * (6 - v) for v in range(6)})
+    restaurants = [job[0] for job in jobs_for(6)]
+    results = list(check_restaurants(checker, restaurants, DATE, 2, concurrency=6))
+
+    assert [restaurant['venue_id'] for restaurant, _ in results] == [str(v) for v in range(6)]
+    assert [result['available'] for _, result in results] == [False, True, False, False, True, False]
+    assert checker.max_in_flight > 1
+
+
+def test_sweep_prints_one_grid_for_every_date_and_size():
+    class SweepChecker:
+        def __init__(self):
+            self.calls = []
+
+        def check_availability(self, venue_id, date, party_size):
+            self.calls.append((venue_id, date, party_size))
+            if venue_id == '2':
+                return {'status': STATUS_ERROR, 'available': False, 'slots': [], 'error': 'HTTP 500'}
+            times = ['18:00', '19:00', '22:00'] if party_size == 2 else []
+            slots = [{'time': t, 'type': 'Dining Room', 'token': 'token'} for t in times]
+            return {'status': STATUS_AVAILABLE if slots else STATUS_UNAVAILABLE,
+                    'available': bool(slots), 'slots': slots}
+
+    dates = parse_date_range('2099-06-05:2099-06-06')
+    assert dates == ['2099-06-05', '2099-06-06']
+    assert parse_party_sizes('4, 2,4') == [2, 4]
+
+    checker = SweepChecker()
+    restaurants = [{'venue_id': '1', 'name': 'Lilia'}, {'venue_id': '2', 'name': 'Misi'}]
+    output = io.StringIO()
+    with redirect_stdout(output):
+        run_sweep(checker, restaurants, dates, [2, 4], '20:30', concurrency=3)
+
+    assert len(checker.calls) == len(set(checker.calls)) == 8
+    lines = output.getvalue().splitlines()
+    assert lines[0].split() == ['Venue', 'Fri', '06-05', 'Sat', '06-06']
+    # Slots after --max-time don't count
+    assert lines[2].split() == ['Lilia', '2p:2', '4p:-', '2p:2', '4p:-']
+    assert lines[3].split() == ['Misi', '2p:!', '4p:!', '2p:!', '4p:!']
+    assert lines[-1] == ('Summary: 2/8 venue/date/party-size combinations available '
+                         '(4 checks failed)')
+
+
+def test_stream_records_ndjson_and_json():
+    restaurant = {'venue_id': '1', 'name': 'Lilia', 'location': 'Williamsburg', 'cuisine': 'Italian',
+                  'travel_time_minutes': 25, 'lists': ['try/dinner', 'love/dinner']}
+    jobs = [(restaurant, DATE, 2), ({**restaurant, 'venue_id': '2', 'lists': ['try/dinner']}, DATE, 2)]
+    checker = FakeChecker(open_venues={'1'})
+
+    out = io.StringIO()
+    stream_records(checker, jobs, 'ndjson', '20:30', out=out)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(r['venue_id'], r['status']) for r in records] == [('1', 'available'), ('2', 'unavailable')]
+    assert records[0]['slots'][0]['time'] == '19:00'
+    assert records[0]['lists'] == ['try/dinner', 'love/dinner']
+    assert records[0]['book_url'].endswith(f"?date={DATE}&seats=2")
+
+    out = io.StringIO()
+    stream_records(checker, jobs, 'json', '18:00', out=out)
+    records = json.loads(out.getvalue())
+    # A slot after --max-time doesn't make a venue available
+    assert [r['status'] for r in records] == ['unavailable', 'unavailable']
+    assert records[0]['message'] == 'No availability before 18:00'
+
+    # With first, the stream stops at the first hit and is still valid JSON
+    out = io.StringIO()
+    stream_records(checker, jobs, 'json', '20:30', out=out, first=1)
+    assert [r['venue_id'] for r in json.loads(out.getvalue())] == ['1']
+
+
+def test_cross_list_scan_checks_each_venue_once():
+    header = 'name,venue_id,location,cuisine,notes,latitude,longitude,travel_time_minutes\n'
+    lists = {
+        'places_to_try_dinner.csv': 'Mono Mono,59569,East Village,Korean,,,,\nLilia,418,Williamsburg,Italian,,,,\n',
+        'places_we_love_dinner.csv': 'Dhamaka,1,LES,Indian,,,,\nMono Mono,59569,East Village,Korean,,40.7,-73.9,20\n',
+        'places_to_try_brunch.csv': 'No Resy,,SoHo,Cafe,,,,\n',
+    }
+    with tempfile.TemporaryDirectory() as data_dir:
+        for filename, rows in lists.items():
+            with open(os.path.join(data_dir, filename), 'w', encoding='utf-8') as f:
+                f.write(header + rows)
+
+        restaurants = load_cross_list(data_dir)
+        assert [(r['name'], r['lists']) for r in restaurants] == [
+            ('Dhamaka', ['love/dinner']),
+            ('Mono Mono', ['love/dinner', 'try/dinner']),
+            ('Lilia', ['try/dinner']),
+        ]
+        # Gaps are filled from the venue's other lists
+        assert restaurants[1]['travel_time_minutes'] == 20
+        assert [r['name'] for r in load_cross_list(data_dir, list_type='try')] == ['Mono Mono', 'Lilia']
+
+    checker = FakeChecker(open_venues={'59569'})
+    results = list(check_restaurants(checker, restaurants, DATE, 2))
+    assert sorted(checker.calls) == ['1', '418', '59569']
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        print_list_breakdown(restaurants, [r for r, result in results if result['available']])
+    assert output.getvalue().splitlines() == [
+        'By list:', '   love/dinner: 1/2 available', '   try/dinner: 1/2 available'
+    ]
+
+
+def test_area_results_cover_venues_in_any_cell():
+    # Venues 1 and 2 share a cell; 3 and 4 are each alone in theirs
+    restaurants = [
+        {'venue_id': '1', 'latitude': 40.701, 'longitude': -73.999},
+        {'venue_id': '2', 'latitude': 40.702, 'longitude': -73.998},
+        {'venue_id': '3', 'latitude': 40.721, 'longitude': -73.998},
+        {'venue_id': '4', 'latitude': 40.901, 'longitude': -73.901},
+    ]
+    available = {'status': STATUS_AVAILABLE, 'available': True, 'slots': []}
+
+    class AreaChecker:
+        def __init__(self):
+            self.searches = []
+
+        def find_area(self, lat, lng, date, party_size):
+            self.searches.append((date, party_size))
+            # The response reaches past the cell and includes an unrequested venue
+            return {'1': available, '3': available, '99': available}
+
+    checker = AreaChecker()
+    results, requests = prefetch_area_results(checker, restaurants, [DATE], [2, 4])
+
+    # Only the two-venue cell is searched, once per party size
+    assert requests == len(checker.searches) == 2
+    assert sorted(results) == [('1', DATE, 2), ('1', DATE, 4), ('3', DATE, 2), ('3', DATE, 4)]
+
+
+if __name__ == "__main__":
+    test_stopping_early_bounds_the_calls_made()
+    test_results_keep_job_order_and_bounded_concurrency()
+    test_parallel_checks_report_in_list_order()
+    test_sweep_prints_one_grid_for_every_date_and_size()
+    test_stream_records_ndjson_and_json()
+    test_cross_list_scan_checks_each_venue_once()
+    test_area_results_cover_venues_in_any_cell()
+    print("✅ check availability tests passed")
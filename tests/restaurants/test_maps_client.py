@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+maps_client CSV updates and batching, with fake Google responses. Run with
+pytest or directly.
+"""
+import csv
+import gzip
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'restaurants', 'scripts'))
+
+import maps_client
+import restaurant_store
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
+from restaurant_store import RestaurantStore
+
+HEADER = 'name,venue_id,location,cuisine,notes,latitude,longitude,travel_time_minutes\n'
+NAMES = ['Lilia', 'Via Carota', 'Dhamaka', 'Misi', 'Semma']
+
+
+@contextmanager
+def patched(module, **replacements):
+    saved = {name: getattr(module, name) for name in replacements}
+    for name, value in replacements.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.status_code = 200
+        self.headers = {}
+        self._body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._body
+
+
+class FakeGoogle:
+    """Stands in for the requests module; Distance Matrix minutes = destination index"""
+
+    def __init__(self):
+        self.calls = []
+
+    def request(self, method, url, params=None, **kwargs):
+        self.calls.append(params)
+        if 'distancematrix' in url:
+            origins = params['origins'].split('|')
+            destinations = params['destinations'].split('|')
+            return FakeResponse({'status': 'OK', 'rows': [
+                {'elements': [self._element(d) for d in destinations]} for _ in origins
+            ]})
+        return FakeResponse({'status': 'OK', 'results': [{
+            'geometry': {'location': {'lat': 40.72, 'lng': -73.99}},
+            'formatted_address': params['address'],
+        }]})
+
+    @staticmethod
+    def _element(destination):
+        minutes = int(destination.split(',')[1])
+        if minutes < 0:
+            return {'status': 'ZERO_RESULTS'}
+        return {'status': 'OK', 'duration': {'value': minutes * 60, 'text': f"{minutes} mins"},
+                'distance': {'value': 1000}}
+
+
+def read_csv(data_dir):
+    with open(os.path.join(data_dir, 'places_to_try_dinner.csv'), encoding='utf-8', newline='') as f:
+        return {row['name']: row for row in csv.DictReader(f)}
+
+
+def fake_travel_times(origin, destinations, api_key, mode='transit'):
+    return [{'duration_minutes': 20, 'duration_text': '20 mins'} for _ in destinations]
+
+
+def test_interrupted_update_resumes_without_repeating_lookups():
+    with tempfile.TemporaryDirectory() as data_dir:
+        with open(os.path.join(data_dir, 'places_to_try_dinner.csv'), 'w', encoding='utf-8') as f:
+            f.write(HEADER + ''.join(f"{name},,Manhattan,,,,,\n" for name in NAMES))
+
+        geocoded = []
+
+        def interrupted(query, api_key):
+            if len(geocoded) == 3:
+                raise KeyboardInterrupt
+            geocoded.append(query.split(',')[0])
+            return {'lat': [40.71, 40.72, 40.73][len(geocoded) - 1], 'lng': -74.0}
+
+        with patched(restaurant_store, DEFAULT_DATA_DIR=data_dir), \
+                patched(maps_client, CHECKPOINT_EXPORT_EVERY=2, geocode=interrupted,
+                        get_travel_times=fake_travel_times):
+            try:
+                maps_client.update_restaurant_csv('try', 'dinner', 'key', '1 Home St')
+            except KeyboardInterrupt:
+                pass
+            else:
+                raise AssertionError('run was not interrupted')
+
+            # Two results were exported; the third only reached the checkpoint,
+            # and the store holds nothing the CSV doesn't
+            rows = read_csv(data_dir)
+            assert [name for name in NAMES if rows[name]['latitude']] == ['Lilia', 'Via Carota']
+            stored = {r['name']: r for r in RestaurantStore(data_dir).select('try', 'dinner')}
+            assert [name for name in NAMES if stored[name]['latitude'] is not None] == ['Lilia', 'Via Carota']
+
+            geocoded.clear()
+            maps_client.geocode = lambda query, api_key: (
+                geocoded.append(query.split(',')[0]) or {'lat': 40.8, 'lng': -73.9}
+            )
+            assert maps_client.update_restaurant_csv('try', 'dinner', 'key', '1 Home St', resume=True)
+
+        assert geocoded == ['Misi', 'Semma']
+        rows = read_csv(data_dir)
+        assert float(rows['Dhamaka']['latitude']) == 40.73
+        assert all(row['travel_time_minutes'] == '20' for row in rows.values())
+        assert not any(name.endswith('.checkpoint.jsonl') for name in os.listdir(data_dir))
+
+
+def test_travel_time_matrix_batches_within_limits():
+    google = FakeGoogle()
+    with patched(maps_client, requests=google, default_limiter=RateLimiter({})):
+        one_origin = maps_client.get_travel_time_matrix(['home'], [f"0,{d}" for d in range(30)], 'key')
+        assert [len(call['destinations'].split('|')) for call in google.calls] == [25, 5]
+        assert [result['duration_minutes'] for result in one_origin[0]] == list(range(30))
+
+        google.calls.clear()
+        origins = [f"origin-{o}" for o in range(6)]
+        matrix = maps_client.get_travel_time_matrix(origins, [f"0,{d}" for d in range(-1, 29)], 'key')
+
+    # 6 origins leave room for 16 destinations per 100-element request
+    sizes = [(len(call['origins'].split('|')), len(call['destinations'].split('|'))) for call in google.calls]
+    assert sizes == [(6, 16), (6, 14)]
+    assert all(row[0] is None for row in matrix)
+    assert all([result['duration_minutes'] for result in row[1:]] == list(range(29)) for row in matrix)
+
+
+def test_geocode_cache_shares_entries_across_spellings():
+    google = FakeGoogle()
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResponseCache(os.path.join(directory, 'cache.sqlite'), table='geocode')
+        with patched(maps_client, requests=google, default_limiter=RateLimiter({}), _geocode_cache=cache):
+            first = maps_client.geocode('Mono Mono,  Bowery, New York, NY', 'key')
+            again = maps_client.geocode(' mono mono , bowery,new york, ny.', 'key')
+            assert again == first and len(google.calls) == 1
+
+            maps_client.geocode('Mono Mono, Bowery, New York, NY', 'key', use_cache=False)
+            assert len(google.calls) == 2
+
+            assert cache.invalidate(maps_client.normalize_geocode_query('MONO MONO, Bowery, New York, NY')) == 1
+            maps_client.geocode('Mono Mono, Bowery, New York, NY', 'key')
+            assert len(google.calls) == 3
+        cache.close()
+
+
+def test_map_layers_share_one_row_per_venue():
+    lists = {
+        'places_to_try_dinner.csv': 'Mono Mono,59569,East Village,Korean,,40.7290012,-73.9891234,20\n'
+                                    'Nowhere,,SoHo,Cafe,,,,\n',
+        'places_we_love_dinner.csv': 'Mono Mono,59569,East Village,Korean,,40.7290012,-73.9891234,20\n'
+                                     'Corner Bar,,LES,Bar,,40.72,-73.99,\n',
+    }
+    with tempfile.TemporaryDirectory() as data_dir:
+        for filename, rows in lists.items():
+            with open(os.path.join(data_dir, filename), 'w', encoding='utf-8') as f:
+                f.write(HEADER + rows)
+
+        data = maps_client.build_map_data(data_dir=data_dir)
+        assert data['fields'] == maps_client.MAP_FIELDS
+        assert data['venues'] == [
+            ['Mono Mono', 'East Village', 'Korean', 40.729, -73.98912, 20, '59569'],
+            ['Corner Bar', 'LES', 'Bar', 40.72, -73.99, None, None],
+        ]
+        assert data['layers'] == {'try/dinner': [0], 'love/dinner': [0, 1]}
+
+        page = os.path.join(data_dir, 'map.html')
+        with patched(restaurant_store, DEFAULT_DATA_DIR=data_dir):
+            assert maps_client.generate_map_layers(page, compress=True)
+        with open(os.path.join(data_dir, 'map.data.json.gz'), 'rb') as f:
+            assert json.loads(gzip.decompress(f.read())) == data
+        with open(page, encoding='utf-8') as f:
+            assert '"map.data.json.gz"' in f.read()
+
+
+if __name__ == "__main__":
+    test_interrupted_update_resumes_without_repeating_lookups()
+    test_travel_time_matrix_batches_within_limits()
+    test_geocode_cache_shares_entries_across_spellings()
+    test_map_layers_share_one_row_per_venue()
+    print("✅ maps client tests passed")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Meeting point branch-and-bound search against brute force, with a fake
+checker and Distance Matrix. Run with pytest or directly.
+"""
+import math
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'restaurants', 'scripts'))
+
+import travel_matrix
+from meeting_point import MeetingPointSearch, combine
+from resy_client import STATUS_AVAILABLE, STATUS_UNAVAILABLE
+from spatial_index import haversine_km
+from travel_matrix import TravelMatrix
+
+DATE = '2099-06-05'
+ORIGINS = {'ana': (40.70, -74.00), 'ben': (40.76, -73.95), 'cy': (40.68, -73.93)}
+
+
+def true_minutes(origin, destination):
+    """Twice as slow as the search's admissible bound, so pruning is safe"""
+    (a_lat, a_lng), (b_lat, b_lng) = (map(float, text.split(',')) for text in (origin, destination))
+    return math.ceil(5 + haversine_km(a_lat, a_lng, b_lat, b_lng) * 3)
+
+
+class FakeChecker:
+    def __init__(self, open_venues):
+        self.open_venues = open_venues
+        self.calls = []
+
+    def check_availability(self, venue_id, date, party_size):
+        self.calls.append(venue_id)
+        if venue_id in self.open_venues:
+            return {'status': STATUS_AVAILABLE, 'available': True,
+                    'slots': [{'time': '19:00', 'type': 'Dining Room', 'token': 'token'}]}
+        return {'status': STATUS_UNAVAILABLE, 'available': False, 'slots': []}
+
+
+def run_search(objective):
+    rng = random.Random(11)
+    restaurants = [
+        {'venue_id': str(v), 'name': f"Venue {v}",
+         'latitude': 40.60 + rng.random() * 0.25, 'longitude': -74.05 + rng.random() * 0.20}
+        for v in range(120)
+    ]
+    open_venues = {r['venue_id'] for r in restaurants if rng.random() < 0.4}
+    requests = []
+
+    def fake_matrix(origins, destinations, api_key, mode):
+        requests.append((len(origins), len(destinations)))
+        return [[{'duration_minutes': true_minutes(o, d)} for d in destinations] for o in origins]
+
+    saved = travel_matrix.get_home_address, travel_matrix.get_travel_time_matrix
+    travel_matrix.get_home_address = lambda: f"{ORIGINS['ana'][0]},{ORIGINS['ana'][1]}"
+    travel_matrix.get_travel_time_matrix = fake_matrix
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            matrix = TravelMatrix(os.path.join(directory, 'travel_matrix'))
+            for name, (lat, lng) in ORIGINS.items():
+                matrix.add_origin(name, f"{lat},{lng}")
+            checker = FakeChecker(open_venues)
+            search = MeetingPointSearch(checker, matrix, list(ORIGINS), list(ORIGINS.values()),
+                                        objective=objective, maps_api_key='key')
+            best = search.search(restaurants, DATE, 3, '23:00', top=3)
+    finally:
+        travel_matrix.get_home_address, travel_matrix.get_travel_time_matrix = saved
+
+    expected = sorted(
+        combine([true_minutes(f"{lat},{lng}", f"{r['latitude']},{r['longitude']}")
+                 for lat, lng in ORIGINS.values()], objective)
+        for r in restaurants if r['venue_id'] in open_venues
+    )[:3]
+    return best, expected, search.stats, checker.calls, requests
+
+
+def test_search_matches_brute_force_and_skips_pruned_venues():
+    for objective in ('minimax', 'sum'):
+        best, expected, stats, calls, requests = run_search(objective)
+        assert [entry['score'] for entry in best] == expected
+        assert not any(entry['estimated'] for entry in best)
+
+        # Pruned venues are never checked for availability
+        assert stats['pruned'] > 0
+        assert len(calls) == len(set(calls)) == stats['checked'] == stats['considered'] - stats['pruned']
+
+
+def test_travel_times_batch_every_origin_together():
+    requests = run_search('minimax')[4]
+    assert requests
+    # One request per batch of open venues, covering all three origins
+    assert all(origins == len(ORIGINS) and destinations * origins <= 100
+               for origins, destinations in requests)
+
+
+if __name__ == "__main__":
+    test_search_matches_brute_force_and_skips_pruned_venues()
+    test_travel_times_batch_every_origin_together()
+    print("✅ meeting point tests passed")
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Rate limiting, circuit breaking and retries around /4/find, with fake
+transports instead of Resy. Run with pytest or directly.
+"""
+import asyncio
+import os
+import sys
+import time
+from email.utils import formatdate
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'restaurants', 'scripts'))
+
+from rate_limiter import MAX_RETRY_AFTER, RateLimiter, TokenBucket, parse_retry_after
+from resilience import CircuitBreaker
+from resy_client import STATUS_AVAILABLE, STATUS_ERROR, AsyncResyChecker, ResyChecker
+
+BASE_URL = 'http://resy.test'
+FIND_BODY = {'results': {'venues': [{'slots': [{
+    'date': {'start': '2099-06-05 19:00:00', 'end': '2099-06-05 21:00:00'},
+    'config': {'type': 'Dining Room', 'token': 'token'},
+}]}]}}
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.headers = {}
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    """Stands in for requests.Session, answering with the given statuses in turn"""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return FakeResponse(status, FIND_BODY if status == 200 else {})
+
+
+def make_checker(statuses, **kwargs):
+    # An empty budget map leaves every host unthrottled, so tests don't sleep
+    checker = ResyChecker(base_url=BASE_URL, limiter=RateLimiter({}), **kwargs)
+    checker.session = FakeSession(statuses)
+    return checker
+
+
+def test_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    # Only one trial call while half-open
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_bucket_pauses_on_429_and_backs_off():
+    bucket = TokenBucket(rate=10.0, min_rate=1.0, max_rate=20.0, burst=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() > 0
+
+    bucket.record(429, retry_after=5.0)
+    assert bucket.rate == 5.0
+    assert bucket.reserve() > 4.0
+
+
+def test_retry_after_header_forms():
+    assert parse_retry_after('7') == 7.0
+    assert 25 <= parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+    assert parse_retry_after(formatdate(time.time() - 30, usegmt=True)) == 0.0
+    assert parse_retry_after('86400') == MAX_RETRY_AFTER
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+def test_limiter_retries_429_after_its_retry_after():
+    class ThrottledSession(FakeSession):
+        def request(self, method, url, **kwargs):
+            response = super().request(method, url, **kwargs)
+            if response.status_code == 429:
+                response.headers = {'Retry-After': '0.05'}
+            return response
+
+    limiter = RateLimiter({'resy.test': {'rate': 10.0, 'min_rate': 1.0, 'max_rate': 20.0, 'burst': 5}})
+    session = ThrottledSession([429, 200])
+    start = time.monotonic()
+    response = limiter.request(session, 'GET', f"{BASE_URL}/4/find")
+
+    assert response.status_code == 200 and session.calls == 2
+    assert time.monotonic() - start >= 0.04
+    assert limiter.bucket_for(BASE_URL).rate == 5.0
+
+
+def test_429_is_retried_by_one_layer_only():
+    checker = make_checker([429], max_retries=1)
+    result = checker.check_availability('1', '2099-06-05', 2)
+    assert result['status'] == STATUS_ERROR
+    assert checker.session.calls == 2
+
+
+def test_retry_then_success():
+    checker = make_checker([503, 200], max_retries=2)
+    result = checker.check_availability('1', '2099-06-05', 2)
+    assert result['status'] == STATUS_AVAILABLE
+    assert result['slots'][0]['time'] == '19:00'
+    assert checker.session.calls == 2
+
+
+def test_client_error_is_not_retried_and_keeps_breaker_closed():
+    checker = make_checker([401], breaker=CircuitBreaker(failure_threshold=1))
+    result = checker.check_availability('1', '2099-06-05', 2)
+    assert result['error'] == 'HTTP 401'
+    assert checker.session.calls == 1
+    assert checker.breaker.allow()
+
+
+def test_async_checker_shares_the_flow():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params['venue_id'])
+        status = 429 if len(calls) == 1 else 200
+        return httpx.Response(status, json=FIND_BODY if status == 200 else {})
+
+    async def run():
+        checker = AsyncResyChecker(base_url=BASE_URL, limiter=RateLimiter({}), max_retries=1)
+        await checker.client.aclose()
+        checker.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with checker:
+            return await checker.check_availability('7', '2099-06-05', 2)
+
+    result = asyncio.run(run())
+    assert result['status'] == STATUS_AVAILABLE
+    assert calls == ['7', '7']
+
+
+def test_async_checks_overlap_on_one_client():
+    state = {'in_flight': 0, 'peak': 0}
+
+    async def handler(request):
+        state['in_flight'] += 1
+        state['peak'] = max(state['peak'], state['in_flight'])
+        await asyncio.sleep(0.01)
+        state['in_flight'] -= 1
+        if request.url.params['venue_id'] == '3':
+            return httpx.Response(200, json={'results': {'venues': []}})
+        return httpx.Response(200, json=FIND_BODY)
+
+    async def run():
+        checker = AsyncResyChecker(base_url=BASE_URL, limiter=RateLimiter({}))
+        await checker.client.aclose()
+        checker.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with checker:
+            return await asyncio.gather(*(
+                checker.check_availability(str(venue), '2099-06-05', 2) for venue in range(8)
+            ))
+
+    results = asyncio.run(run())
+    assert state['peak'] > 1
+    assert [result['available'] for result in results] == [True] * 3 + [False] + [True] * 4
+
+
+if __name__ == "__main__":
+    test_breaker_opens_and_half_opens()
+    test_bucket_pauses_on_429_and_backs_off()
+    test_retry_after_header_forms()
+    test_limiter_retries_429_after_its_retry_after()
+    test_429_is_retried_by_one_layer_only()
+    test_retry_then_success()
+    test_client_error_is_not_retried_and_keeps_breaker_closed()
+    test_async_checker_shares_the_flow()
+    test_async_checks_overlap_on_one_client()
+    print("✅ resilience tests passed")
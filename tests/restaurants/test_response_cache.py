@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+ResponseCache expiry and eviction, on a fake clock. Run with pytest or
+directly.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'restaurants', 'scripts'))
+
+import response_cache
+from response_cache import EVICT_EVERY, ResponseCache
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+def with_clock(test):
+    def run():
+        clock = FakeClock()
+        saved, response_cache.time = response_cache.time, clock
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                test(clock, os.path.join(directory, 'cache.sqlite'))
+        finally:
+            response_cache.time = saved
+    run.__name__ = test.__name__
+    return run
+
+
+@with_clock
+def test_entries_expire_after_ttl_and_max_age_is_capped(clock, path):
+    cache = ResponseCache(path, ttl=60)
+    cache.set('key', {'slots': [1]})
+
+    clock.now += 30
+    assert cache.get('key') == {'slots': [1]}
+    assert cache.get('key', max_age=10) is None
+
+    clock.now += 31
+    assert cache.get('key') is None
+    # Eviction may already have dropped anything past ttl, so a longer max_age can't see it
+    assert cache.get('key', max_age=3600) is None
+    cache.close()
+
+
+@with_clock
+def test_eviction_drops_expired_then_oldest(clock, path):
+    cache = ResponseCache(path, ttl=60, max_entries=3)
+    cache.set('stale', 1)
+    clock.now += 61
+    for index in range(4):
+        clock.now += 1
+        cache.set(f"fresh-{index}", index)
+
+    cache.evict()
+    assert [cache.get(f"fresh-{index}") for index in range(4)] == [None, 1, 2, 3]
+    assert cache.invalidate() == 3
+    cache.close()
+
+
+@with_clock
+def test_writes_trigger_eviction_periodically(clock, path):
+    cache = ResponseCache(path, ttl=60, max_entries=10)
+    for index in range(EVICT_EVERY):
+        cache.set(f"key-{index}", index)
+    assert cache.invalidate() == 10
+    cache.close()
+
+
+if __name__ == "__main__":
+    test_entries_expire_after_ttl_and_max_age_is_capped()
+    test_eviction_drops_expired_then_oldest()
+    test_writes_trigger_eviction_periodically()
+    print("✅ response cache tests passed")
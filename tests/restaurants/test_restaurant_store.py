@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+RestaurantStore CSV sync: re-import on change, atomic export. Run with
+pytest or directly.
+"""
+import os
+import stat
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'restaurants', 'scripts'))
+
+from checkpoint import atomic_write_bytes
+from restaurant_store import RestaurantStore
+
+HEADER = 'name,venue_id,location,cuisine,notes,latitude,longitude,travel_time_minutes\n'
+
+
+def write_csv(data_dir, rows, filename='places_to_try_dinner.csv'):
+    path = os.path.join(data_dir, filename)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(HEADER + ''.join(rows))
+    return path
+
+
+def test_resyncs_when_csv_changes():
+    with tempfile.TemporaryDirectory() as data_dir:
+        path = write_csv(data_dir, ['Lilia,418,Williamsburg,Italian,,,,\n'])
+        store = RestaurantStore(data_dir)
+        assert [r['name'] for r in store.select('try', 'dinner')] == ['Lilia']
+
+        write_csv(data_dir, ['Lilia,418,Williamsburg,Italian,,,,\n', 'Via Carota,,West Village,Italian,,,,\n'])
+        later = time.time() + 5
+        os.utime(path, (later, later))
+        assert [r['name'] for r in store.select('try', 'dinner')] == ['Lilia', 'Via Carota']
+
+        os.remove(path)
+        assert store.select('try', 'dinner') == []
+
+
+def test_export_keeps_file_mode():
+    with tempfile.TemporaryDirectory() as data_dir:
+        path = write_csv(data_dir, ['Lilia,418,Williamsburg,Italian,,,,\n'])
+        os.chmod(path, 0o644)
+        store = RestaurantStore(data_dir)
+        record = store.select('try', 'dinner')[0]
+        store.update_location(record['id'], latitude=40.7175, longitude=-73.9523)
+        store.export_csv('try', 'dinner')
+
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+        with open(path, encoding='utf-8') as f:
+            assert '40.7175' in f.read()
+        assert not [name for name in os.listdir(data_dir) if name.startswith('.tmp-')]
+
+
+def test_new_file_uses_umask_mode():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.json')
+        umask = os.umask(0o022)
+        try:
+            atomic_write_bytes(path, b'{}')
+        finally:
+            os.umask(umask)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+
+if __name__ == "__main__":
+    test_resyncs_when_csv_changes()
+    test_export_keeps_file_mode()
+    test_new_file_uses_umask_mode()
+    print("✅ restaurant store tests passed")
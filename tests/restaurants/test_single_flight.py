@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+SingleFlight / AsyncSingleFlight coalescing of concurrent calls. Run with
+pytest or directly.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'restaurants', 'scripts'))
+
+from single_flight import AsyncSingleFlight, SingleFlight
+
+
+def wait_for_waiters(flights, key, count, timeout=5):
+    """Block until count followers have joined key's call, so none can start its own"""
+    deadline = time.monotonic() + timeout
+    while flights.waiting(key) < count:
+        assert time.monotonic() < deadline, f"only {flights.waiting(key)} of {count} followers joined"
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_result():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'slots': []}
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(flights.do, 'key', slow)
+        started.wait(5)
+        followers = [pool.submit(flights.do, 'key', slow) for _ in range(3)]
+        wait_for_waiters(flights, 'key', 3)
+        release.set()
+        results = [leader.result(5)] + [f.result(5) for f in followers]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    # Once finished the key is forgotten, so the next call runs again
+    flights.do('key', slow)
+    assert len(calls) == 2
+
+
+def test_errors_reach_every_waiter():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError('boom')
+
+    def call():
+        try:
+            flights.do('key', failing)
+        except RuntimeError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(call)
+        started.wait(5)
+        follower = pool.submit(call)
+        wait_for_waiters(flights, 'key', 1)
+        release.set()
+        assert leader.result(5) == 'boom'
+        assert follower.result(5) == 'boom'
+
+
+def test_async_calls_share_one_task_and_survive_cancellation():
+    calls = []
+
+    async def run():
+        flights = AsyncSingleFlight()
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'result'
+
+        first = asyncio.ensure_future(flights.do('key', slow))
+        second = asyncio.ensure_future(flights.do('key', slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == 'result'
+    assert len(calls) == 1
+
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_result()
+    test_errors_reach_every_waiter()
+    test_async_calls_share_one_task_and_survive_cancellation()
+    print("✅ single flight tests passed")
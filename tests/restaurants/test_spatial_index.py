@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+KD-tree radius and nearest-neighbour queries against brute force. Run
+with pytest or directly.
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'restaurants', 'scripts'))
+
+from spatial_index import SpatialIndex, haversine_km, parse_coords
+
+
+def random_points(count, seed=7):
+    rng = random.Random(seed)
+    return [(40.55 + rng.random() * 0.35, -74.10 + rng.random() * 0.40, index)
+            for index in range(count)]
+
+
+def brute_force(points, lat, lng):
+    return sorted((haversine_km(lat, lng, p_lat, p_lng), item) for p_lat, p_lng, item in points)
+
+
+def test_within_matches_brute_force():
+    points = random_points(500)
+    index = SpatialIndex(points)
+    assert len(index) == 500
+    for lat, lng, radius in ((40.73, -73.99, 1.5), (40.60, -74.05, 4.0), (40.85, -73.75, 0.2)):
+        expected = [item for distance, item in brute_force(points, lat, lng) if distance <= radius]
+        assert [item for _, item in index.within(lat, lng, radius)] == expected
+
+
+def test_nearest_matches_brute_force():
+    points = random_points(500)
+    index = SpatialIndex(points)
+    for lat, lng in ((40.73, -73.99), (40.56, -74.09), (41.2, -73.5)):
+        for k in (1, 5, 25):
+            expected = [item for _, item in brute_force(points, lat, lng)[:k]]
+            assert [item for _, item in index.nearest(lat, lng, k)] == expected
+
+
+def test_edge_cases():
+    empty = SpatialIndex([])
+    assert empty.within(40.7, -74.0, 10) == []
+    assert empty.nearest(40.7, -74.0, 3) == []
+
+    records = [{'latitude': 40.7, 'longitude': -74.0, 'name': 'a'},
+               {'latitude': None, 'longitude': None, 'name': 'b'}]
+    index = SpatialIndex.from_records(records)
+    assert len(index) == 1
+    assert index.nearest(40.7, -74.0, 5)[0][1]['name'] == 'a'
+
+
+def test_parse_coords():
+    assert parse_coords(' 40.7265, -73.9815 ') == (40.7265, -73.9815)
+    assert parse_coords('Union Square, NYC') is None
+    try:
+        parse_coords('140,0')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('out-of-range latitude accepted')
+
+
+if __name__ == "__main__":
+    test_within_matches_brute_force()
+    test_nearest_matches_brute_force()
+    test_edge_cases()
+    test_parse_coords()
+    print("✅ spatial index tests passed")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Distance-based travel time estimates and the keep/drop/borderline split,
+on the pure-Python path. Run with pytest or directly.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'restaurants', 'scripts'))
+
+import check_availability
+import travel_estimate
+from spatial_index import haversine_km
+from travel_estimate import TravelModel, haversine_many, prefilter, refine
+
+HOME = (40.70, -74.00)
+
+
+def venue(venue_id, km_north, minutes=None):
+    """A venue km_north kilometres due north of HOME"""
+    return {'venue_id': venue_id, 'name': venue_id, 'latitude': HOME[0] + km_north / 111.195,
+            'longitude': HOME[1], 'travel_time_minutes': minutes}
+
+
+def test_pure_python_distances_match_haversine():
+    saved, travel_estimate.np = travel_estimate.np, None
+    try:
+        lats, lngs = [40.75, 40.60, 40.70], [-73.95, -74.10, -74.00]
+        distances = haversine_many(*HOME, lats, lngs)
+    finally:
+        travel_estimate.np = saved
+    assert distances == [haversine_km(*HOME, lat, lng) for lat, lng in zip(lats, lngs)]
+    assert distances[2] == 0
+
+
+def test_fit_needs_enough_points():
+    model = TravelModel.fit('transit', [1, 2, 3, 4, 5, 6], [12, 14, 16, 18, 20, 22])
+    assert (round(model.intercept, 6), round(model.per_km, 6)) == (10, 2)
+    assert model.margin == 2.0 and model.samples == 6
+
+    fallback = TravelModel.fit('walking', [1, 2], [12, 25])
+    assert (fallback.intercept, fallback.per_km, fallback.samples) == (0.0, 12.5, 0)
+
+
+def test_classify_keeps_the_margin_band_borderline():
+    model = TravelModel('transit', intercept=10, per_km=2, margin=4)
+    # Estimates: 2 km -> 14, 8 km -> 26, 10 km -> 30, 12 km -> 34
+    assert model.classify(2, 20) == 'near'
+    assert model.classify(8, 20) == 'far'
+    assert model.classify(10, 30) == 'borderline'
+    assert model.classify(12, 30) == 'borderline'
+    assert model.classify(13, 30) == 'far'
+
+
+def test_prefilter_splits_without_api_calls():
+    model = TravelModel('transit', intercept=10, per_km=2, margin=4)
+    restaurants = [
+        venue('known-near', 20, minutes=25),
+        venue('known-far', 1, minutes=45),
+        venue('near', 2),
+        venue('far', 15),
+        venue('edge', 10),
+        {'venue_id': 'nowhere', 'name': 'nowhere', 'latitude': None, 'longitude': None,
+         'travel_time_minutes': None},
+    ]
+    keep, far, borderline = prefilter(HOME, restaurants, 30, model)
+
+    assert [r['venue_id'] for r in keep] == ['known-near', 'near', 'nowhere']
+    assert [r['venue_id'] for r in far] == ['known-far', 'far']
+    assert [r['venue_id'] for r in borderline] == ['edge']
+    assert keep[1]['travel_time_minutes'] == 14 and keep[1]['travel_time_estimated']
+    assert 'travel_time_estimated' not in keep[0]
+
+
+def test_refine_and_filter_travel_time():
+    requests = []
+
+    def fake_travel_times(origin, destinations, api_key, mode='transit'):
+        requests.append(destinations)
+        return [{'duration_minutes': 28}, None]
+
+    borderline = [venue('edge', 10, minutes=30), venue('noroute', 11, minutes=32)]
+    saved = travel_estimate.get_travel_times
+    travel_estimate.get_travel_times = fake_travel_times
+    try:
+        keep, far = refine('1 Home St', borderline, 30, 'key')
+    finally:
+        travel_estimate.get_travel_times = saved
+    assert len(requests) == 1 and len(requests[0]) == 2
+    assert [(r['venue_id'], r['travel_time_minutes']) for r in keep] == [('edge', 28)]
+    # No route: the estimate stands
+    assert [(r['venue_id'], r['travel_time_minutes']) for r in far] == [('noroute', 32)]
+
+    # Uncalibrated transit (10 + 3.5/km, +-8): borderline is kept when not refined
+    saved = check_availability.resolve_location
+    check_availability.resolve_location = lambda address: HOME
+    try:
+        restaurants = [venue('far', 12), venue('edge', 5), venue('near', 1), venue('known', 30, minutes=15)]
+        within, too_far = check_availability.filter_travel_time(restaurants, 30, origin_address='home')
+    finally:
+        check_availability.resolve_location = saved
+    assert [r['venue_id'] for r in within] == ['edge', 'near', 'known']
+    assert [r['venue_id'] for r in too_far] == ['far']
+
+
+if __name__ == "__main__":
+    test_pure_python_distances_match_haversine()
+    test_fit_needs_enough_points()
+    test_classify_keeps_the_margin_band_borderline()
+    test_prefilter_splits_without_api_calls()
+    test_refine_and_filter_travel_time()
+    print("✅ travel estimate tests passed")
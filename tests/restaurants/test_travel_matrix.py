@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+TravelMatrix layout, persistence and origin handling, with a fake Distance
+Matrix instead of Google. Run with pytest or directly.
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'restaurants', 'scripts'))
+
+import check_availability
+import travel_matrix
+from travel_matrix import HOME_ORIGIN, TravelMatrix
+
+
+def venues(count, start=0):
+    return [{'venue_id': str(v), 'latitude': 40.7 + v / 1000, 'longitude': -74.0}
+            for v in range(start, start + count)]
+
+
+def fake_matrix(requests):
+    """Minutes = venue number; records each request's origins and destinations"""
+    def fake(origins, destinations, api_key, mode):
+        requests.append((origins, destinations))
+        return [[{'duration_minutes': round((float(d.split(',')[0]) - 40.7) * 1000)}
+                 for d in destinations] for _ in origins]
+    return fake
+
+
+@contextmanager
+def patched(home='1 Home St', maps=None):
+    """A temporary matrix path, a fixed home, a Maps key and a fake Distance Matrix"""
+    def home_address():
+        if home is None:
+            raise ValueError("Missing HOME_ADDRESS in .env file")
+        return home
+
+    saved = (travel_matrix.DEFAULT_MATRIX_PATH, travel_matrix.get_home_address,
+             travel_matrix.get_travel_time_matrix, check_availability.load_maps_credentials)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'travel_matrix')
+        travel_matrix.DEFAULT_MATRIX_PATH = path
+        travel_matrix.get_home_address = home_address
+        travel_matrix.get_travel_time_matrix = maps or fake_matrix([])
+        check_availability.load_maps_credentials = lambda: 'key'
+        try:
+            yield path
+        finally:
+            (travel_matrix.DEFAULT_MATRIX_PATH, travel_matrix.get_home_address,
+             travel_matrix.get_travel_time_matrix, check_availability.load_maps_credentials) = saved
+
+
+def test_resize_keeps_known_cells_and_round_trips():
+    with patched() as path:
+        matrix = TravelMatrix(path)
+        assert matrix.fill(HOME_ORIGIN, venues(3), 'walking', 'key') == 3
+        matrix.add_origin('office', '1 Broadway')
+        matrix.add_venues(['3', '4'])
+        matrix.fill('office', venues(5), 'transit', 'key')
+
+        reloaded = TravelMatrix(path)
+        assert reloaded.origin_names == [HOME_ORIGIN, 'office']
+        assert reloaded.column(HOME_ORIGIN, 'walking') == {'0': 0, '1': 1, '2': 2}
+        assert reloaded.get(HOME_ORIGIN, '4', 'walking') is None
+        assert reloaded.get('office', '4', 'transit') == 4
+        assert reloaded.missing(HOME_ORIGIN, ['1', '3'], 'walking') == ['3']
+
+
+def test_home_is_repointed_when_address_changes():
+    with patched() as path:
+        matrix = TravelMatrix(path)
+        matrix.fill(HOME_ORIGIN, venues(2), 'transit', 'key')
+        assert TravelMatrix(path).get(HOME_ORIGIN, '1') == 1
+
+        travel_matrix.get_home_address = lambda: '2 New Home Ave'
+        moved = TravelMatrix(path)
+        assert moved.origins[HOME_ORIGIN] == '2 New Home Ave'
+        assert moved.get(HOME_ORIGIN, '1') is None
+
+
+def test_fill_saves_each_chunk():
+    calls = []
+
+    def flaky(origins, destinations, api_key, mode):
+        calls.append(len(destinations))
+        if len(calls) > 1:
+            raise ValueError('Distance Matrix failed: OVER_QUERY_LIMIT')
+        return [[{'duration_minutes': 10} for _ in destinations]]
+
+    with patched(maps=flaky) as path:
+        try:
+            TravelMatrix(path).fill(HOME_ORIGIN, venues(30), 'transit', 'key')
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('second chunk should have failed')
+
+        assert calls == [25, 5]
+        assert len(TravelMatrix(path).column(HOME_ORIGIN)) == 25
+
+
+def test_unset_home_is_an_error_not_an_origin():
+    with patched(home=None) as path:
+        restaurants = [{**v, 'travel_time_minutes': None} for v in venues(2)]
+        try:
+            check_availability.apply_travel_matrix(restaurants, HOME_ORIGIN, 'walking')
+        except ValueError as e:
+            assert 'HOME_ADDRESS' in str(e)
+        else:
+            raise AssertionError('unset home accepted')
+        assert HOME_ORIGIN not in TravelMatrix(path).origins
+
+
+def test_unknown_names_are_rejected_and_places_not_saved():
+    requests = []
+    with patched(maps=fake_matrix(requests)) as path:
+        restaurants = [{**v, 'travel_time_minutes': None} for v in venues(2)]
+        try:
+            check_availability.apply_travel_matrix(restaurants, 'ofice', 'walking')
+        except ValueError as e:
+            assert "unknown origin 'ofice'" in str(e)
+        else:
+            raise AssertionError('mistyped origin accepted')
+        assert requests == []
+
+        timed, address = check_availability.apply_travel_matrix(restaurants, '40.75,-73.99', 'walking')
+        assert address == '40.75,-73.99'
+        assert [r['travel_time_minutes'] for r in timed] == [0, 1]
+
+        # Ad-hoc places are used for the run but never written to the matrix
+        reloaded = TravelMatrix(path)
+        assert reloaded.origin_names == [HOME_ORIGIN]
+        assert reloaded.venue_ids == ['0', '1']
+
+
+if __name__ == "__main__":
+    test_resize_keeps_known_cells_and_round_trips()
+    test_home_is_repointed_when_address_changes()
+    test_fill_saves_each_chunk()
+    test_unset_home_is_an_error_not_an_origin()
+    test_unknown_names_are_rejected_and_places_not_saved()
+    print("✅ travel matrix tests passed")
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Watcher diffing and watchlist windows, with a fake checker instead of
+Resy. Run with pytest or directly.
+"""
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'restaurants', 'scripts'))
+
+from release_schedule import FAST_INTERVAL, ReleaseSchedule
+from resy_booking import STATUS_BOOKED
+from watch_availability import WARM_TTL, Watcher, load_watchlist
+
+DATE = '2099-06-05'
+
+
+class FakeChecker:
+    def __init__(self, times):
+        self.times = times
+        self.calls = []
+
+    def check_availability(self, venue_id, date, party_size):
+        self.calls.append((venue_id, date, party_size))
+        slots = [{'time': t, 'type': 'Dining Room', 'token': f"token-{t}"} for t in self.times]
+        return {'status': 'available' if slots else 'unavailable',
+                'available': bool(slots), 'slots': slots}
+
+
+class FakeBooker:
+    def __init__(self):
+        self.booked = []
+        self.warmed = 0
+
+    def warm(self):
+        self.warmed += 1
+
+    def book(self, slot_token, date, party_size):
+        self.booked.append((slot_token, date, party_size))
+        return {'status': STATUS_BOOKED, 'reservation_id': len(self.booked), 'timings': {'total_ms': 1.0}}
+
+
+def write_watchlist(directory, entries):
+    path = os.path.join(directory, 'watchlist.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f)
+    return path
+
+
+def test_windows_are_per_entry():
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_watchlist(directory, [
+            {'venue_id': 1, 'name': 'Lilia', 'date_range': f"{DATE}:{DATE}",
+             'earliest': '11:00', 'latest': '14:00'},
+            {'venue_id': 1, 'name': 'Lilia', 'date_range': f"{DATE}:{DATE}",
+             'earliest': '18:00', 'latest': '21:00'},
+        ])
+        venues = load_watchlist(path)
+        assert len(venues) == 1
+        assert {probe[2:4] for probe in venues[0]['probes']} == {('11:00', '14:00'), ('18:00', '21:00')}
+
+        checker = FakeChecker([])
+        watcher = Watcher(checker, venues, state_path=os.path.join(directory, 'state.json'))
+        assert watcher.poll_venue('1') == []
+
+        checker.times = ['12:30', '19:00', '22:00']
+        events = watcher.poll_venue('1')
+        assert sorted(event['time'] for event in events) == ['12:30', '19:00']
+        assert all(event['event'] == 'opened' for event in events)
+        # Both windows are served by one check per poll
+        assert len(checker.calls) == 2
+
+        with open(os.path.join(directory, 'state.json'), encoding='utf-8') as f:
+            state = json.load(f)
+        assert state[f"1|{DATE}|2|11:00-14:00"] == ['12:30|Dining Room']
+        assert state[f"1|{DATE}|2|18:00-21:00"] == ['19:00|Dining Room']
+
+
+def test_reports_only_changes():
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_watchlist(directory, [{'venue_id': 2, 'date_range': f"{DATE}:{DATE}"}])
+        checker = FakeChecker(['19:00'])
+        watcher = Watcher(checker, load_watchlist(path), state_path=os.path.join(directory, 'state.json'))
+        assert watcher.poll_venue('2') == []
+        assert watcher.poll_venue('2') == []
+
+        checker.times = ['20:00']
+        events = watcher.poll_venue('2')
+        assert [(event['event'], event['time']) for event in events] == [('opened', '20:00'), ('closed', '19:00')]
+
+
+def test_auto_book_is_per_entry():
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_watchlist(directory, [
+            {'venue_id': 3, 'date_range': f"{DATE}:{DATE}", 'party_size': 2,
+             'earliest': '18:00', 'latest': '21:00', 'auto_book': True},
+            {'venue_id': 3, 'date_range': f"{DATE}:{DATE}", 'party_size': 6},
+            {'venue_id': 3, 'date_range': f"{DATE}:{DATE}", 'party_size': 2,
+             'earliest': '11:00', 'latest': '14:00'},
+        ])
+        checker, booker = FakeChecker([]), FakeBooker()
+        watcher = Watcher(checker, load_watchlist(path), state_path=os.path.join(directory, 'state.json'),
+                          booker=booker)
+        watcher.poll_venue('3')
+
+        checker.times = ['12:00', '19:00', '19:30']
+        events = watcher.poll_venue('3')
+        # Only the auto_book entry's party size and window, and only once
+        assert booker.booked == [('token-19:00', DATE, 2)]
+        assert [event['event'] for event in events].count('booked') == 1
+        assert not watcher._finished('3')
+
+        # The booked entry is no longer polled; the others still are
+        checker.calls = []
+        watcher.poll_venue('3')
+        assert sorted(checker.calls) == [('3', DATE, 2), ('3', DATE, 6)]
+        assert booker.booked == [('token-19:00', DATE, 2)]
+
+
+def test_release_window_has_its_own_floor():
+    with tempfile.TemporaryDirectory() as directory:
+        schedule = ReleaseSchedule(os.path.join(directory, 'releases.sqlite'))
+        now = datetime(2099, 6, 1, 9, 0, 30)
+        schedule.next_release = lambda venue_id, now: datetime(2099, 6, 1, 9, 0)
+
+        assert schedule.interval_for('1', 600, now=now) == FAST_INTERVAL
+        assert schedule.interval_for('1', 600, fast_interval=2, now=now) == 2
+        # Outside the window, the next poll lands at the window's start
+        later = now - timedelta(minutes=10)
+        assert schedule.interval_for('1', 600, now=later) == 510
+
+        # The watcher's usual minimum doesn't slow the window down
+        watcher = Watcher(FakeChecker([]), [], state_path=os.path.join(directory, 'state.json'),
+                          min_interval=30, releases=schedule)
+        watcher.intervals['1'] = 30
+        schedule.next_release = lambda venue_id, now: datetime.now()
+        assert watcher.next_interval('1', changed=False) == FAST_INTERVAL
+
+
+def test_booker_is_warmed_once_per_ttl():
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_watchlist(directory, [
+            {'venue_id': 4, 'date_range': f"{DATE}:{DATE}", 'auto_book': True},
+        ])
+        booker = FakeBooker()
+        watcher = Watcher(FakeChecker([]), load_watchlist(path),
+                          state_path=os.path.join(directory, 'state.json'), booker=booker)
+        for _ in range(3):
+            watcher.poll_venue('4')
+        assert booker.warmed == 1
+
+        watcher._warmed_at -= WARM_TTL
+        watcher.poll_venue('4')
+        assert booker.warmed == 2
+
+
+if __name__ == "__main__":
+    test_windows_are_per_entry()
+    test_reports_only_changes()
+    test_auto_book_is_per_entry()
+    test_release_window_has_its_own_floor()
+    test_booker_is_warmed_once_per_ttl()
+    print("✅ watch tests passed")